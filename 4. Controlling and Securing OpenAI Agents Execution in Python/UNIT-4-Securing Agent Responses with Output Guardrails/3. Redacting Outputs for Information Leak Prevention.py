@@ -26,6 +26,19 @@ from agents import (
     output_guardrail,
 )
 
+# This unit's guardrail cascade (guardrail_cascade.py next to this file): a keyword check
+# trips on obvious leaks, and the guardrail agent below only runs for the other outputs
+# (and only once per output)
+from guardrail_cascade import (
+    SENSITIVE_OUTPUT_PHRASES,
+    GuardrailCascade,
+    cached_verdict,
+    keyword_tier,
+    remember_verdict,
+)
+
+PARSE_FALLBACK_REDACTION = "[REDACTED - guardrail parse fallback]"
+
 
 class SensitiveOutputModel(BaseModel):
     has_sensitive_info: bool
@@ -57,24 +70,33 @@ def parse_sensitive_from_text(text: str) -> SensitiveOutputModel:
         # Defensive fallback — consider this a tripwire and redact fully
         return SensitiveOutputModel(
             has_sensitive_info=True,
-            redacted_output="[REDACTED - guardrail parse fallback]",
+            redacted_output=PARSE_FALLBACK_REDACTION,
         )
 
 
-@output_guardrail
-async def sensitive_output_guardrail(ctx: RunContextWrapper, agent: Agent, output: str) -> GuardrailFunctionOutput:
-    print("\n--- Guardrail: analyzing agent output ---")
-    print("Original output:\n", output, "\n")
+async def sensitive_llm_tier(ctx: RunContextWrapper, agent: Agent, output: str) -> GuardrailFunctionOutput:
+    # The same output (ignoring case and spacing) was checked before: reuse its verdict
+    cached = cached_verdict(sensitive_info_guardrail_agent, output)
+    if cached is not None:
+        print("Guardrail verdict from cache:", cached, "\n")
+        return GuardrailFunctionOutput(
+            output_info=cached.redacted_output,
+            tripwire_triggered=cached.has_sensitive_info,
+        )
 
     guardrail_run_result = await Runner.run(starting_agent=sensitive_info_guardrail_agent, input=output)
 
-    # PREFERRED: use final_output (string) first — it's the most reliable across runtimes
+    # PREFERRED: use final_output first — the structured output, or its text on runtimes returning strings
     final_text = getattr(guardrail_run_result, "final_output", None)
     extracted: SensitiveOutputModel | None = None
+    from_agent = True  # False for the defensive redactions, which are never cached
 
-    if isinstance(final_text, str) and final_text.strip():
+    if isinstance(final_text, SensitiveOutputModel):
+        extracted = final_text
+    elif isinstance(final_text, str) and final_text.strip():
         # Try to parse final_output as JSON into the model
         extracted = parse_sensitive_from_text(final_text)
+        from_agent = extracted.redacted_output != PARSE_FALLBACK_REDACTION
     else:
         # FALLBACK: check result.output (could be model instance or dict)
         raw_output = getattr(guardrail_run_result, "output", None)
@@ -85,12 +107,14 @@ async def sensitive_output_guardrail(ctx: RunContextWrapper, agent: Agent, outpu
             try:
                 extracted = SensitiveOutputModel(**raw_output)
             except ValidationError:
+                from_agent = False
                 extracted = SensitiveOutputModel(
                     has_sensitive_info=True,
                     redacted_output="[REDACTED - invalid guardrail dict]",
                 )
         else:
             # Nothing usable found — defensive redaction
+            from_agent = False
             extracted = SensitiveOutputModel(
                 has_sensitive_info=True,
                 redacted_output="[REDACTED - no guardrail output]",
@@ -98,12 +122,30 @@ async def sensitive_output_guardrail(ctx: RunContextWrapper, agent: Agent, outpu
 
     print("Guardrail extracted analysis:", extracted, "\n")
 
+    if from_agent:
+        remember_verdict(sensitive_info_guardrail_agent, output, extracted)
+
     return GuardrailFunctionOutput(
         output_info=extracted.redacted_output,
         tripwire_triggered=extracted.has_sensitive_info,
     )
 
 
+# Cheap keyword tier first; the first tier that decides ends the check
+sensitive_output_cascade = GuardrailCascade("sensitive_output_guardrail", [
+    ("keyword", keyword_tier(SENSITIVE_OUTPUT_PHRASES, "[REDACTED: internal pricing information removed]")),
+    ("llm", sensitive_llm_tier),
+])
+
+
+@output_guardrail
+async def sensitive_output_guardrail(ctx: RunContextWrapper, agent: Agent, output: str) -> GuardrailFunctionOutput:
+    print("\n--- Guardrail: analyzing agent output ---")
+    print("Original output:\n", output, "\n")
+
+    return await sensitive_output_cascade.run(ctx, agent, output)
+
+
 # Travel Genie with guardrail attached
 travel_genie = Agent(
     name="Travel Genie",
@@ -140,6 +182,9 @@ async def main():
                 safe = "[REDACTED - could not extract from exception]"
             print("Redacted response:\n", safe, "\n")
 
+    # How many outputs each tier decided (the guardrail agent only sees the rest)
+    print("Cascade:", sensitive_output_cascade.get_stats())
+
 
 if __name__ == "__main__":
     asyncio.run(main())
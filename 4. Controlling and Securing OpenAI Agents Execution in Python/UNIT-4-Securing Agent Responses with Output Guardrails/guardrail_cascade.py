@@ -0,0 +1,82 @@
+"""
+A small guardrail cascade for the lessons in this unit.
+A cheap keyword check runs first and trips on obvious phrases; the LLM guardrail agent
+only runs for the texts it cannot decide. Guardrail agent verdicts are remembered per
+text, so an output checked before skips the model call.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from agents import Agent, GuardrailFunctionOutput, RunContextWrapper, Runner
+
+# A tier returns a decision, or None when it cannot decide
+Tier = Callable[[RunContextWrapper, Agent, str], Awaitable[Optional[GuardrailFunctionOutput]]]
+
+
+# Phrases that are violations wherever they appear. Single words like "markup" or "drugs"
+# are left to the guardrail agents, since they also appear in harmless texts
+BLOCKED_INPUT_PHRASES = ("buy drugs", "where to find prostitutes", "how to smuggle", "best strip club")
+SENSITIVE_OUTPUT_PHRASES = ("internal markup", "markup on all bookings", "profit margin", "competitors' pricing")
+
+
+def keyword_tier(phrases: Sequence[str], output_info: str) -> Tier:
+    """Trip when the text contains one of the phrases; otherwise leave the decision to the next tier."""
+    async def check(ctx: RunContextWrapper, agent: Agent, text: str) -> Optional[GuardrailFunctionOutput]:
+        lowered = text.lower()
+        for phrase in phrases:
+            if phrase in lowered:
+                return GuardrailFunctionOutput(output_info=output_info, tripwire_triggered=True)
+        return None
+    return check
+
+
+# Guardrail agent verdicts by (agent name, text with case and spacing ignored)
+_verdicts: Dict[Tuple[str, str], Any] = {}
+
+
+def _verdict_key(guardrail_agent: Agent, text: str) -> Tuple[str, str]:
+    return guardrail_agent.name, " ".join(text.lower().split())
+
+
+def cached_verdict(guardrail_agent: Agent, text: str) -> Any:
+    """The guardrail agent's earlier verdict on the same text, or None."""
+    return _verdicts.get(_verdict_key(guardrail_agent, text))
+
+
+def remember_verdict(guardrail_agent: Agent, text: str, verdict: Any):
+    _verdicts[_verdict_key(guardrail_agent, text)] = verdict
+
+
+def llm_tier(guardrail_agent: Agent, decide: Callable[[Any], GuardrailFunctionOutput]) -> Tier:
+    """Ask the guardrail agent (or reuse its verdict on the same text); decide turns the verdict into the result."""
+    async def check(ctx: RunContextWrapper, agent: Agent, text: str) -> GuardrailFunctionOutput:
+        verdict = cached_verdict(guardrail_agent, text)
+        if verdict is None:
+            result = await Runner.run(guardrail_agent, text, context=ctx.context)
+            verdict = result.final_output
+            remember_verdict(guardrail_agent, text, verdict)
+        return decide(verdict)
+    return check
+
+
+class GuardrailCascade:
+    """Runs the tiers in order (cheapest first) and stops at the first one that decides."""
+
+    def __init__(self, name: str, tiers: Sequence[Tuple[str, Tier]]):
+        self.name = name
+        self.tiers = list(tiers)
+        self.requests = 0
+        self.decided = {tier_name: 0 for tier_name, _ in self.tiers}
+
+    async def run(self, ctx: RunContextWrapper, agent: Agent, text: str) -> GuardrailFunctionOutput:
+        self.requests += 1
+        for tier_name, tier in self.tiers:
+            decision = await tier(ctx, agent, text)
+            if decision is not None:
+                self.decided[tier_name] += 1
+                return decision
+        return GuardrailFunctionOutput(output_info="No tier flagged the text", tripwire_triggered=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """How many texts were checked, and how many each tier decided."""
+        return {"requests": self.requests, "decided": dict(self.decided)}
@@ -1,6 +1,5 @@
 import asyncio
 from pydantic import BaseModel
-from guardrails import content_input_guardrail, leakage_output_guardrail
 
 from agents import (
     Agent,
@@ -14,6 +13,16 @@ from agents import (
     OutputGuardrailTripwireTriggered,
 )
 
+# This unit's guardrail cascade (guardrail_cascade.py next to this file): a keyword check
+# trips on obvious phrases, and the guardrail agents below only run for the other texts
+from guardrail_cascade import (
+    BLOCKED_INPUT_PHRASES,
+    SENSITIVE_OUTPUT_PHRASES,
+    GuardrailCascade,
+    keyword_tier,
+    llm_tier,
+)
+
 
 
 # Define the output model for content validation (input guardrail)
@@ -55,20 +64,42 @@ output_guardrail_agent = Agent(
 )
 
 
+def content_decision(verdict: ContentCheckOutput) -> GuardrailFunctionOutput:
+    # Return validation decision based on content analysis
+    return GuardrailFunctionOutput(
+        output_info=verdict.reasoning,
+        tripwire_triggered=verdict.contains_prohibited_content,
+    )
+
+
+def leakage_decision(verdict: LeakageCheckOutput) -> GuardrailFunctionOutput:
+    # Return validation decision based on leakage analysis, and provide redacted output if needed
+    return GuardrailFunctionOutput(
+        output_info=verdict.redacted_output,
+        tripwire_triggered=verdict.contains_sensitive_info
+    )
+
+
+# Cheap keyword tier first; the first tier that decides ends the check. The LLM tier runs
+# the guardrail agent only for texts it has not checked before
+content_input_cascade = GuardrailCascade("content_input_guardrail", [
+    ("keyword", keyword_tier(BLOCKED_INPUT_PHRASES, "Request matches a blocked phrase")),
+    ("llm", llm_tier(input_guardrail_agent, content_decision)),
+])
+
+leakage_output_cascade = GuardrailCascade("leakage_output_guardrail", [
+    ("keyword", keyword_tier(SENSITIVE_OUTPUT_PHRASES, "[REDACTED: internal pricing information removed]")),
+    ("llm", llm_tier(output_guardrail_agent, leakage_decision)),
+])
+
+
 @input_guardrail
 async def content_input_guardrail(
     ctx: RunContextWrapper[None],
     agent: Agent,
     input: str | list[TResponseInputItem]
 ) -> GuardrailFunctionOutput:
-    # Run the input guardrail agent to analyze the user request
-    result = await Runner.run(input_guardrail_agent, str(input), context=ctx.context)
-
-    # Return validation decision based on content analysis
-    return GuardrailFunctionOutput(
-        output_info=result.final_output.reasoning,
-        tripwire_triggered=result.final_output.contains_prohibited_content,
-    )
+    return await content_input_cascade.run(ctx, agent, str(input))
 
 
 @output_guardrail
@@ -77,14 +108,7 @@ async def leakage_output_guardrail(
     agent: Agent,
     output: str
 ) -> GuardrailFunctionOutput:
-    # Run the output guardrail agent to analyze the agent's response
-    result = await Runner.run(output_guardrail_agent, output, context=ctx.context)
-
-    # Return validation decision based on leakage analysis, and provide redacted output if needed
-    return GuardrailFunctionOutput(
-        output_info=result.final_output.redacted_output,
-        tripwire_triggered=result.final_output.contains_sensitive_info
-    )
+    return await leakage_output_cascade.run(ctx, agent, output)
 
 
 # Define the Travel Genie agent with both input and output guardrails
@@ -128,6 +152,10 @@ async def main():
             print("!!! Output guardrail tripped: Information leakage prevented.\n")
             print("[Redacted] Travel Genie response:\n" + redacted, "\n")
 
+    # How many checks each tier decided (the guardrail agents only see the rest)
+    for cascade in (content_input_cascade, leakage_output_cascade):
+        print(cascade.name, cascade.get_stats())
+
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+Shared, immutable activity catalog for suggest_activities.
+This module loads activities once from data/activities.json into an inverted index keyed
+by destination and interest tag, and ranks matches with a top-k heap on a relevance/cost
+score. Results are fresh dicts, so callers never share catalog state.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pricing import PRICING, normalize_destination
+
+
+ACTIVITY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "activities.json")
+
+DEFAULT_INTEREST = "general"
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize an interest tag ("Food " -> "food", "night life" -> "night life")."""
+    return " ".join(tag.casefold().split())
+
+
+class ActivityCatalog:
+    """
+    Read-only activity catalog shared by all tools and runs.
+
+    Activities are stored column-wise (compact arrays and shared strings) and indexed
+    by destination key and tag. A destination key is a normalized city, or a city's
+    pricing region ("Kyoto" and "Japan" both find Kyoto's activities); activities whose
+    destination is the global marker are offered everywhere.
+
+    Ranking: score = interests matched + static score, where the static score (fixed per
+    activity) rewards local activities and rating and penalizes cost. Activities are grouped
+    by (destination key, tag set) and each group is sorted best-first, so a query only
+    heapifies the head of each matching group and pops top_k times: O(groups + k log groups),
+    independent of how many activities match.
+    """
+
+    LOCAL_BONUS = 0.5        # Activities specific to the destination outrank generic ones
+    RATING_WEIGHT = 0.2      # Per rating star
+    COST_WEIGHT = 0.25       # Per $100
+
+    def __init__(self, activities: Iterable[Mapping[str, Any]], global_destination: str = "*"):
+        self.global_destination = global_destination
+        self.names: List[str] = []
+        self.destinations: List[str] = []
+        self.tags: List[Tuple[str, ...]] = []
+        self.durations: List[str] = []
+        self.difficulties: List[str] = []
+        self.costs = array("d")
+        self.ratings = array("d")
+        self._static_scores = array("d")
+
+        groups: Dict[Tuple[str, Tuple[str, ...]], array] = {}  # (destination key, tag set) -> ids
+        shared: Dict[Any, Any] = {}  # Interned repeated values (destinations, tag tuples, durations)
+        normalized_tags: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        destination_keys: Dict[str, Tuple[str, ...]] = {}
+
+        for activity_id, activity in enumerate(activities):
+            destination = shared.setdefault(activity["destination"], activity["destination"])
+            raw_tags = tuple(activity.get("tags", ()))
+            tags = normalized_tags.get(raw_tags)
+            if tags is None:
+                tags = tuple(sorted({normalize_tag(tag) for tag in raw_tags})) or (DEFAULT_INTEREST,)
+                tags = normalized_tags[raw_tags] = shared.setdefault(tags, tags)
+            duration = activity.get("duration", "")
+            difficulty = activity.get("difficulty", "")
+            cost = float(activity.get("cost_usd", 0.0))
+            rating = float(activity.get("rating", 0.0))
+
+            self.names.append(activity["name"])
+            self.destinations.append(destination)
+            self.tags.append(tags)
+            self.durations.append(shared.setdefault(duration, duration))
+            self.difficulties.append(shared.setdefault(difficulty, difficulty))
+            self.costs.append(cost)
+            self.ratings.append(rating)
+
+            local = destination != global_destination
+            self._static_scores.append(
+                (self.LOCAL_BONUS if local else 0.0) + self.RATING_WEIGHT * rating - self.COST_WEIGHT * cost / 100
+            )
+
+            keys = destination_keys.get(destination)
+            if keys is None:
+                keys = destination_keys[destination] = self._index_keys(destination)
+            for key in keys:
+                group = groups.get((key, tags))
+                if group is None:
+                    group = groups[(key, tags)] = array("i")
+                group.append(activity_id)
+
+        # Activities sharing a destination key and tag set match a query equally, so each
+        # group is kept best-first by static score and only its head competes at a time
+        scores = self._static_scores
+        best_first = lambda ids: array("i", sorted(ids, key=lambda i: (-scores[i], i)))
+        groups = {group_key: best_first(ids) for group_key, ids in groups.items()}
+        # Inverted index: (destination key, tag) -> {tag set: (group, its best static score)}
+        # for the groups at that destination carrying the tag
+        self._tag_sets: Dict[Tuple[str, str], Dict[Tuple[str, ...], Tuple[array, float]]] = {}
+        members: Dict[str, List[int]] = {}
+        for (key, tags), ids in groups.items():
+            for tag in tags:
+                self._tag_sets.setdefault((key, tag), {})[tags] = (ids, scores[ids[0]])
+            members.setdefault(key, []).extend(ids)
+        # Per-destination lists best-first, for queries with no matching interest
+        self._by_destination = {key: best_first(ids) for key, ids in members.items()}
+
+    def _index_keys(self, destination: str) -> Tuple[str, ...]:
+        """Keys an activity at a destination is indexed under (city and pricing region)."""
+        if destination == self.global_destination:
+            return (self.global_destination,)
+        city = normalize_destination(destination)
+        region = PRICING.resolve(destination)
+        return (city,) if region in (city, PRICING.default.key) else (city, region)
+
+    @classmethod
+    def from_file(cls, path: str = ACTIVITY_DATA_PATH) -> "ActivityCatalog":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["activities"], data.get("global_destination", "*"))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def destination_key(self, destination: str) -> Optional[str]:
+        """Index key for a free-form destination (None if the catalog has nothing local)."""
+        normalized = normalize_destination(destination)
+        if normalized in self._by_destination:
+            return normalized
+        if "," in normalized:
+            key = next((part for part in normalized.split(", ") if part in self._by_destination), None)
+            if key is not None:
+                return key
+        region = PRICING.resolve(destination)
+        return region if region in self._by_destination else None
+
+    def activity(self, activity_id: int, destination: str) -> Dict[str, Any]:
+        """A new dict describing one activity, for a traveler asking about `destination`."""
+        cost = self.costs[activity_id]
+        return {
+            "name": self.names[activity_id],
+            "duration": self.durations[activity_id],
+            "cost": f"${cost:,.0f}" if cost else "Free",
+            "difficulty": self.difficulties[activity_id],
+            "rating": self.ratings[activity_id],
+            "tags": list(self.tags[activity_id]),
+            "destination": destination
+        }
+
+    def suggest(
+        self,
+        destination: str,
+        interests: Optional[Sequence[str]] = None,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        The top_k activities for a destination, ranked by interests matched and static score.
+        With no interests (or none that match), the destination's best-scored activities.
+        """
+        keys = [key for key in (self.destination_key(destination), self.global_destination) if key]
+        tags = {normalize_tag(tag) for tag in interests or ()} or {DEFAULT_INTEREST}
+
+        # Lazy k-way merge over the matching groups: a heap of each group's best remaining
+        # activity, keyed by (interests matched + static score)
+        scores = self._static_scores
+        heads = []
+        for key in keys:
+            matching: Dict[Tuple[str, ...], Tuple[array, float]] = {}
+            for tag in tags:
+                matching.update(self._tag_sets.get((key, tag), {}))
+            heads += [
+                (-(matched + head_score), group[0], matched, group, 0)
+                for tag_set, (group, head_score) in matching.items()
+                for matched in (len(tags.intersection(tag_set)),)
+            ]
+
+        ids = []
+        if heads:
+            heapq.heapify(heads)
+            while heads and len(ids) < top_k:
+                _, activity_id, matched, group, position = heapq.heappop(heads)
+                ids.append(activity_id)
+                if position + 1 < len(group):
+                    following = group[position + 1]
+                    heapq.heappush(heads, (-(matched + scores[following]), following, matched, group, position + 1))
+        else:
+            ranked = [self._by_destination.get(key, ()) for key in keys]
+            ids = list(islice(heapq.merge(*ranked, key=lambda i: (-scores[i], i)), top_k))
+        return [self.activity(activity_id, destination) for activity_id in ids]
+
+
+# Loaded once per process and shared by every tool call
+ACTIVITIES = ActivityCatalog.from_file()
+
+
+def get_activity_catalog() -> ActivityCatalog:
+    """Get the process-wide activity catalog."""
+    return ACTIVITIES
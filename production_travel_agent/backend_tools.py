@@ -0,0 +1,295 @@
+"""
+Async, connection-pooled backend tools for the Travel Agent system.
+This module provides async versions of the booking and lookup tools that call the
+backend HTTP services through one shared, pooled HTTP client per process, so a slow
+backend call never blocks the event loop (and every other concurrent run with it).
+
+The tools keep the names and schemas of their tools.py counterparts; travel_agents.py
+uses them instead of the in-process mocks when TRAVEL_BACKEND_URL is set.
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+from agents import RunContextWrapper
+
+from models import HotelBookingRequest, UserContext
+from tool_cache import cached_tool, pure_tool
+from tool_execution import fast_function_tool
+
+
+DEFAULT_BACKEND_URL = "http://127.0.0.1:8765"
+
+
+# ============================================================================
+# Pooled Backend Client
+# ============================================================================
+
+class BackendClient:
+    """
+    Shared HTTP client for the backend services.
+
+    - One httpx.AsyncClient (connection pool with keep-alive) per event loop
+    - A per-host concurrency limit, so one slow service cannot take every pooled connection;
+      excess requests queue on the semaphore rather than in httpx's pool, whose
+      per-request bookkeeping grows with the number of open connections
+    - Connect/read timeouts on every request; HTTP errors raise and are reported
+      to the model by the SDK's tool error handling
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 10,
+        timeout: float = 5.0,
+        connect_timeout: float = 2.0
+    ):
+        self.base_url = (base_url or os.getenv("TRAVEL_BACKEND_URL") or DEFAULT_BACKEND_URL).rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=30.0
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.per_host_limit = per_host_limit
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._closing: set = set()  # Tasks closing clients left behind by a closed loop
+        self.stats = {"requests": 0, "errors": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                self._close_stale(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, limits=self.limits, timeout=self.timeout
+            )
+            self._loop = loop
+            self._host_limits = {}
+        return self._client
+
+    def _close_stale(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client opened on another event loop, on that loop while it is still open."""
+        if loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        # The owning loop is closed (e.g. a previous asyncio.run): its connections cannot be
+        # shut down cleanly, but closing the client still drops the pool, and the sockets are
+        # released with their transports
+        task = asyncio.ensure_future(self._aclose_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client: httpx.AsyncClient):
+        with contextlib.suppress(RuntimeError):
+            await client.aclose()
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send a request to a backend service and return its decoded JSON body."""
+        client = self._get_client()
+        host = urlsplit(path).netloc or client.base_url.netloc.decode("ascii")
+        async with self._host_limit(host):
+            self.stats["requests"] += 1
+            try:
+                response = await client.request(method, path, **kwargs)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self.stats["errors"] += 1
+                raise
+        return response.json()
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+_backend_client: Optional[BackendClient] = None
+_backend_client_lock = threading.Lock()
+
+
+def get_backend_client() -> BackendClient:
+    """Get the process-wide backend client."""
+    global _backend_client
+    if _backend_client is None:
+        with _backend_client_lock:
+            if _backend_client is None:
+                _backend_client = BackendClient()
+    return _backend_client
+
+
+def configure_backend_client(**kwargs) -> BackendClient:
+    """Replace the process-wide backend client (e.g. to point at a MockBackendServer)."""
+    global _backend_client
+    with _backend_client_lock:
+        _backend_client = BackendClient(**kwargs)
+    return _backend_client
+
+
+# ============================================================================
+# Booking Tools (with Secure Context)
+# ============================================================================
+# Lookups declare a tool timeout covering the whole call (time queued for the per-host
+# limit included); book_hotel relies on the HTTP timeouts alone, since a cancelled
+# booking request may still have been processed by the backend.
+
+@fast_function_tool(name_override="book_hotel")
+async def book_hotel(
+    wrapper: RunContextWrapper[UserContext],
+    booking: HotelBookingRequest
+) -> Dict[str, Any]:
+    """
+    Book a hotel room using sensitive user data from the secure context wrapper.
+
+    This tool demonstrates secure context injection - sensitive user information
+    is passed through RunContextWrapper to prevent LLM exposure.
+
+    Args:
+        wrapper: RunContextWrapper containing UserContext with sensitive user data
+        booking: HotelBookingRequest with hotel details and dates
+
+    Returns:
+        Booking confirmation dictionary with booking ID and details (status "unavailable"
+        if the hotel has no room for every night, "not_found" for an unknown hotel, or
+        "invalid_request" for dates outside the bookable calendar, with a reason)
+    """
+    user_data = wrapper.context
+    confirmation = await get_backend_client().request(
+        "POST",
+        "/hotels/bookings",
+        json={
+            "booking": booking.model_dump(mode="json"),
+            "guest": {"user_id": user_data.user_id, "name": user_data.name, "email": user_data.email}
+        }
+    )
+    if confirmation["status"] == "confirmed":
+        print(f"[BOOKING] Hotel booking created for {user_data.name} (ID: {user_data.user_id})")
+    return confirmation
+
+
+@fast_function_tool(name_override="check_hotel_availability", timeout=15)
+async def check_hotel_availability(
+    destination: str,
+    check_in: date,
+    check_out: date,
+    guests: int = 1
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Check hotel availability for a given destination and dates.
+
+    Args:
+        destination: Travel destination
+        check_in: Check-in date (YYYY-MM-DD)
+        check_out: Check-out date (YYYY-MM-DD)
+        guests: Number of guests
+
+    Returns:
+        List of available hotels with pricing, cheapest first (or a status
+        "invalid_request" result with a reason for dates outside the calendar)
+    """
+    return await get_backend_client().request(
+        "GET",
+        "/hotels/availability",
+        params={
+            "destination": destination, "check_in": check_in.isoformat(),
+            "check_out": check_out.isoformat(), "guests": guests
+        }
+    )
+
+
+@fast_function_tool(name_override="find_cheapest_stays", timeout=15)
+async def find_cheapest_stays(
+    destination: str,
+    earliest_check_in: date,
+    latest_check_out: date,
+    nights: int,
+    guests: int = 1,
+    top_k: int = 5
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Find the cheapest stays of a given length at a destination across flexible dates.
+
+    Searches every check-in date in the range and every hotel with a room free
+    each night, in one call. Use this instead of checking availability date by date
+    (e.g. "when in March is the cheapest 5-night stay in Lisbon?").
+
+    Args:
+        destination: Travel destination
+        earliest_check_in: First possible check-in date (YYYY-MM-DD)
+        latest_check_out: Last possible check-out date (YYYY-MM-DD)
+        nights: Length of the stay in nights
+        guests: Number of guests
+        top_k: Number of stays to return
+
+    Returns:
+        Cheapest stays (hotel, check-in/check-out dates, pricing), cheapest first (or a
+        status "invalid_request" result with a reason for dates outside the calendar)
+    """
+    return await get_backend_client().request(
+        "GET",
+        "/hotels/cheapest-stays",
+        params={
+            "destination": destination, "earliest_check_in": earliest_check_in.isoformat(),
+            "latest_check_out": latest_check_out.isoformat(), "nights": nights, "guests": guests, "top_k": top_k
+        }
+    )
+
+
+# ============================================================================
+# Destination Information Tools
+# ============================================================================
+
+@fast_function_tool(name_override="get_destination_weather", timeout=15)
+@pure_tool
+@cached_tool(ttl=1800)  # 30 minutes
+async def get_destination_weather(destination: str, month: str = None) -> Dict[str, Any]:
+    """
+    Get weather information for a destination.
+
+    Args:
+        destination: Travel destination
+        month: Month name (optional, defaults to current month)
+
+    Returns:
+        Weather information dictionary
+    """
+    params = {"destination": destination}
+    if month:
+        params["month"] = month
+    return await get_backend_client().request("GET", "/weather", params=params)
+
+
+@fast_function_tool(name_override="get_travel_restrictions", timeout=15)
+@pure_tool
+@cached_tool(ttl=21600)  # 6 hours
+async def get_travel_restrictions(destination: str) -> Dict[str, Any]:
+    """
+    Get travel restrictions and visa requirements for a destination.
+
+    Args:
+        destination: Travel destination
+
+    Returns:
+        Travel restrictions and visa information
+    """
+    return await get_backend_client().request("GET", "/restrictions", params={"destination": destination})
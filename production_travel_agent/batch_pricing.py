@@ -0,0 +1,190 @@
+"""
+Vectorized batch budget quoting.
+This module prices many trip variants at once with NumPy array operations and returns the
+results in columnar form. Every value matches the scalar estimate_budget and
+get_detailed_budget_breakdown tools exactly: the arithmetic is performed in the same
+order, and rounding is done with Python's round() semantics.
+
+Requires NumPy (pip install numpy).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models import TripInfo, BudgetEstimateRequest
+from pricing import BREAKDOWN_CATEGORIES, PRICING, PricingIndex
+
+
+BREAKDOWN_COLUMNS = BREAKDOWN_CATEGORIES + ("flights", "travel_insurance", "miscellaneous", "total")
+
+# Flat per-traveler columns that the scalar breakdown leaves as integers
+_INTEGER_COLUMNS = ("flights", "travel_insurance", "miscellaneous")
+
+
+def round_half_even_2(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals exactly like Python's round(x, 2).
+
+    np.round scales by 100 and rounds, which agrees with Python's correctly rounded
+    result except when x * 100 lies within float error of a .5 tie. Those (rare)
+    elements are recomputed with round().
+    """
+    scaled = values * 100.0
+    rounded = np.rint(scaled) / 100.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(value), 2) for value in values[near_tie]]
+    return rounded
+
+
+@dataclass
+class BudgetQuotes:
+    """
+    Columnar batch of budget quotes.
+
+    columns maps a column name to a NumPy array with one element per row:
+    - inputs: destination, destination_key, days, travelers, accommodation_level, include_flights
+    - estimate: estimate_budget total
+    - accommodation ... total: get_detailed_budget_breakdown values
+    """
+    columns: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.columns["estimate"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def breakdown(self, row: int) -> Dict[str, Any]:
+        """One row's breakdown as the dict get_detailed_budget_breakdown returns."""
+        result = {}
+        for column in BREAKDOWN_COLUMNS:
+            value = float(self.columns[column][row])
+            if column in _INTEGER_COLUMNS and (column != "flights" or self.columns["include_flights"][row]):
+                value = int(value)
+            result[column] = value
+        return result
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Row-oriented view: input fields, estimate and breakdown per row."""
+        records = []
+        for row in range(len(self)):
+            record = {
+                "destination": str(self.columns["destination"][row]),
+                "days": int(self.columns["days"][row]),
+                "travelers": int(self.columns["travelers"][row]),
+                "accommodation_level": str(self.columns["accommodation_level"][row]),
+                "include_flights": bool(self.columns["include_flights"][row]),
+                "estimate": float(self.columns["estimate"][row]),
+            }
+            record.update(self.breakdown(row))
+            records.append(record)
+        return records
+
+
+def _codes(values: np.ndarray, lookup) -> tuple:
+    """Apply a scalar lookup once per distinct value; returns (per-row codes, per-code results)."""
+    uniques, codes = np.unique(values, return_inverse=True)
+    return codes, [lookup(str(value)) for value in uniques]
+
+
+def quote_columns(
+    destinations: Union[str, Sequence[str]],
+    days: Iterable[int],
+    travelers: Iterable[int],
+    accommodation_levels: Union[str, Sequence[str]],
+    include_flights: Union[bool, Iterable[bool]] = True,
+    index: Optional[PricingIndex] = None
+) -> BudgetQuotes:
+    """
+    Quote column-aligned trip variants. Scalars are broadcast against the other columns.
+    Destinations and accommodation levels are resolved once per distinct value.
+    """
+    index = index or PRICING
+    destinations, days, travelers, levels, flights = np.broadcast_arrays(
+        np.asarray(destinations, dtype=object),
+        np.asarray(days, dtype=np.int64),
+        np.asarray(travelers, dtype=np.int64),
+        np.asarray(accommodation_levels, dtype=object),
+        np.asarray(include_flights, dtype=bool)
+    )
+    destinations, days, travelers, levels, flights = (
+        np.ravel(column) for column in (destinations, days, travelers, levels, flights)
+    )
+
+    dest_codes, dest_pricing = _codes(destinations, index.lookup)
+    daily_cost = np.array([p.daily_cost for p in dest_pricing], dtype=np.float64)[dest_codes]
+    flight_cost = np.array([p.flight_cost for p in dest_pricing], dtype=np.float64)[dest_codes]
+    dest_mult = np.array(
+        [index.high_cost_multiplier if p.high_cost else 1.0 for p in dest_pricing], dtype=np.float64
+    )[dest_codes]
+
+    level_codes, level_costs = _codes(levels, index.daily_costs)
+    _, level_mults = _codes(levels, index.accommodation_multiplier)
+    acc_mult = np.array(level_mults, dtype=np.float64)[level_codes]
+
+    # estimate_budget: ((daily * multiplier) * days) * travelers + flight * travelers
+    days_f = days.astype(np.float64)
+    travelers_f = travelers.astype(np.float64)
+    total_cost = daily_cost * acc_mult * days_f * travelers_f
+    estimate = round_half_even_2(total_cost + flight_cost * travelers_f)
+
+    # get_detailed_budget_breakdown: round(((daily * days) * travelers) * dest_mult, 2) per category
+    columns: Dict[str, np.ndarray] = {
+        "destination": destinations,
+        "destination_key": np.array([p.key for p in dest_pricing], dtype=object)[dest_codes],
+        "days": days,
+        "travelers": travelers,
+        "accommodation_level": levels,
+        "include_flights": flights,
+        "estimate": estimate,
+    }
+    for category in BREAKDOWN_CATEGORIES:
+        category_daily = np.array([costs[category] for costs in level_costs], dtype=np.float64)[level_codes]
+        columns[category] = round_half_even_2(category_daily * days_f * travelers_f * dest_mult)
+    columns["flights"] = np.where(flights, float(index.breakdown_flight_cost) * travelers_f, 0.0)
+    columns["travel_insurance"] = float(index.travel_insurance_cost) * travelers_f
+    columns["miscellaneous"] = float(index.miscellaneous_cost) * travelers_f
+
+    # Summed left to right in dict order, like sum(breakdown.values())
+    total = np.zeros(len(days), dtype=np.float64)
+    for column in BREAKDOWN_COLUMNS[:-1]:
+        total = total + columns[column]
+    columns["total"] = total
+    return BudgetQuotes(columns)
+
+
+def quote_batch(
+    rows: Sequence[Union[TripInfo, BudgetEstimateRequest]],
+    index: Optional[PricingIndex] = None
+) -> BudgetQuotes:
+    """Quote many TripInfo / BudgetEstimateRequest rows (TripInfo rows include flights)."""
+    return quote_columns(
+        [row.destination for row in rows],
+        [row.days for row in rows],
+        [row.travelers for row in rows],
+        [row.accommodation_level for row in rows],
+        [getattr(row, "include_flights", True) for row in rows],
+        index=index
+    )
+
+
+def quote_grid(
+    destination: str,
+    days: Iterable[int] = range(3, 22),
+    travelers: Iterable[int] = range(1, 7),
+    accommodation_levels: Sequence[str] = ("budget", "moderate", "luxury"),
+    include_flights: Sequence[bool] = (True, False),
+    index: Optional[PricingIndex] = None
+) -> BudgetQuotes:
+    """Quote the full cartesian grid of trip variants for one destination."""
+    grid = np.meshgrid(
+        np.asarray(list(days), dtype=np.int64),
+        np.asarray(list(travelers), dtype=np.int64),
+        np.asarray(list(accommodation_levels), dtype=object),
+        np.asarray(list(include_flights), dtype=bool),
+        indexing="ij"
+    )
+    return quote_columns(destination, *grid, index=index)
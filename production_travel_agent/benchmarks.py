@@ -0,0 +1,1393 @@
+"""
+Benchmark suites for the Travel Agent system.
+All suites run offline: agent runs use the ScriptedModelProvider, so results measure the
+overhead added by this codebase and the SDK rather than model latency.
+
+Usage:
+    python benchmarks.py --suite orchestration --iterations 200
+    python benchmarks.py --suite pricing
+    python benchmarks.py --suite batch-quotes   # requires numpy
+    python benchmarks.py --suite inventory
+    python benchmarks.py --suite activities
+    python benchmarks.py --suite fanout
+    python benchmarks.py --suite tools
+    python benchmarks.py --suite guardrails
+    python benchmarks.py --suite backend        # requires httpx
+    python benchmarks.py --suite all
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import functools
+import inspect
+import io
+import json
+import os
+import statistics
+import time
+import tracemalloc
+import urllib.parse
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+# Scripted runs never reach the API, but the OpenAI client still expects a key
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+from agents import Agent, RunConfig, RunContextWrapper, Runner, function_tool
+from agents.function_schema import function_schema
+from agents.tool_context import ToolContext
+from agents.usage import Usage
+from agents.lifecycle import RunHooks
+
+from models import BudgetEstimateRequest, HotelBookingRequest, UserContext
+from travel_agents import AgentRegistry
+from hooks import CompositeRunHooks, GlobalMonitoringHooks, MetricsCollectionHooks, ToolFanOutHooks
+from guardrails import simple_content_filter, llm_content_guardrail, policy_compliance_guardrail
+from scripted_model import (
+    DEFAULT_SCRIPTS, STAY_CHECK_IN, STAY_CHECK_OUT, ScriptedModelProvider, call_tools, respond
+)
+from pricing import PRICING_DATA_PATH, PricingIndex, quote_budget, quote_breakdown
+from tool_execution import (
+    DEFAULT_TOOL_WORKERS, configure_tool_executor, fast_function_tool, serialize_tool_result, threaded_tool
+)
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (values need not be sorted)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """p50/p99/mean summary of a list of measurements."""
+    return {
+        "n": len(values),
+        "p50": percentile(values, 50),
+        "p99": percentile(values, 99),
+        "mean": statistics.fmean(values) if values else 0.0
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]], unit: str = "ms", scale: float = 1000.0):
+    """Print a summary table of {label: summarize(...)} rows."""
+    print(f"\n{title}")
+    print("-" * 78)
+    print(f"{'':40} {'n':>6} {'p50':>9} {'p99':>9} {'mean':>9}  ({unit})")
+    for label, stats in rows.items():
+        print(
+            f"{label:40} {stats['n']:>6} {stats['p50'] * scale:>9.3f} "
+            f"{stats['p99'] * scale:>9.3f} {stats['mean'] * scale:>9.3f}"
+        )
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the agent hooks' console output while benchmarking."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ============================================================================
+# Orchestration Overhead Suite
+# ============================================================================
+
+class TimelineHooks(RunHooks):
+    """RunHooks recording a timestamped event timeline for one run."""
+
+    def __init__(self):
+        self.events = []
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items):
+        self.events.append((time.perf_counter(), "llm_start", agent.name))
+
+    async def on_llm_end(self, context, agent, response):
+        self.events.append((time.perf_counter(), "llm_end", agent.name))
+
+    async def on_handoff(self, context, from_agent, to_agent):
+        self.events.append((time.perf_counter(), "handoff", to_agent.name))
+
+    async def on_tool_start(self, context, agent, tool):
+        self.events.append((time.perf_counter(), "tool_start", tool.name))
+
+    async def on_tool_end(self, context, agent, tool, result):
+        self.events.append((time.perf_counter(), "tool_end", tool.name))
+
+
+def analyze_timeline(events, run_start: float, run_end: float) -> Dict[str, Any]:
+    """
+    Split one run's wall time into orchestration overhead buckets:
+    - setup: run start → first model call
+    - turn: between model calls (excluding tool execution wall time)
+    - handoff: between model calls when a handoff happened
+    - finalize: last model call → run end
+    - tools: per-tool start → end durations
+    """
+    result = {"setup": None, "finalize": None, "turn": [], "handoff": [], "tools": {}}
+    llm_starts = [t for t, kind, _ in events if kind == "llm_start"]
+    llm_ends = [t for t, kind, _ in events if kind == "llm_end"]
+    if llm_starts:
+        result["setup"] = llm_starts[0] - run_start
+        result["finalize"] = run_end - llm_ends[-1]
+
+    open_tools = {}
+    for t, kind, name in events:
+        if kind == "tool_start":
+            open_tools.setdefault(name, []).append(t)
+        elif kind == "tool_end" and open_tools.get(name):
+            result["tools"].setdefault(name, []).append(t - open_tools[name].pop(0))
+
+    for previous_end, next_start in zip(llm_ends, llm_starts[1:]):
+        gap_events = [(t, kind) for t, kind, _ in events if previous_end <= t <= next_start]
+        tool_times = [t for t, kind in gap_events if kind in ("tool_start", "tool_end")]
+        tool_wall = (max(tool_times) - min(tool_times)) if tool_times else 0.0
+        overhead = (next_start - previous_end) - tool_wall
+        bucket = "handoff" if any(kind == "handoff" for _, kind in gap_events) else "turn"
+        result[bucket].append(overhead)
+    return result
+
+
+GENIE_ONLY_SCRIPTS = {
+    **DEFAULT_SCRIPTS,
+    "Travel Genie": [
+        DEFAULT_SCRIPTS["Travel Genie"][0],
+        respond("A 7-day moderate trip to Japan for two costs about $5,120 including flights."),
+    ],
+}
+
+ORCHESTRATION_PATHS = {
+    "triage → genie": GENIE_ONLY_SCRIPTS,
+    "triage → genie → booking": DEFAULT_SCRIPTS,
+}
+
+
+def _build_variant(variant: str, timeline: TimelineHooks):
+    """Return (hooks, run_config kwargs) for a benchmark variant."""
+    hooks: RunHooks = timeline
+    config: Dict[str, Any] = {}
+    if variant in ("hooks", "full"):
+        hooks = CompositeRunHooks(
+            timeline, GlobalMonitoringHooks(enable_verbose=False), MetricsCollectionHooks()
+        )
+    if variant in ("guardrails", "full"):
+        config["input_guardrails"] = [
+            simple_content_filter, llm_content_guardrail, policy_compliance_guardrail
+        ]
+    return hooks, config
+
+
+async def bench_orchestration(iterations: int = 200, variants: Optional[List[str]] = None):
+    """Per-turn, per-handoff and per-tool overhead of the triage paths, plus allocations."""
+    variants = variants or ["bare", "hooks", "guardrails", "full"]
+    registry = AgentRegistry()
+    triage = registry["triage"]
+    context = UserContext(user_id="bench_user", name="Bench User", email="bench@example.com")
+
+    print("\n" + "=" * 78)
+    print("ORCHESTRATION OVERHEAD (scripted model, zero model latency)")
+    print("=" * 78)
+
+    for path_name, scripts in ORCHESTRATION_PATHS.items():
+        provider = ScriptedModelProvider(scripts=scripts, agents=registry)
+        for variant in variants:
+            buckets: Dict[str, List[float]] = {"run total": [], "setup": [], "turn": [],
+                                               "handoff": [], "finalize": []}
+            tool_buckets: Dict[str, List[float]] = {}
+            allocations: List[float] = []
+
+            async def run_once():
+                timeline = TimelineHooks()
+                hooks, config = _build_variant(variant, timeline)
+                run_config = RunConfig(model_provider=provider, tracing_disabled=True, **config)
+                start = time.perf_counter()
+                with quiet():
+                    await Runner.run(
+                        triage, "Plan a week in Japan and book a hotel in Tokyo",
+                        context=context, hooks=hooks, run_config=run_config
+                    )
+                return timeline, start, time.perf_counter()
+
+            # Warm up imports, schema generation and caches
+            for _ in range(5):
+                await run_once()
+
+            for _ in range(iterations):
+                timeline, start, end = await run_once()
+                analysis = analyze_timeline(timeline.events, start, end)
+                buckets["run total"].append(end - start)
+                for key in ("setup", "finalize"):
+                    if analysis[key] is not None:
+                        buckets[key].append(analysis[key])
+                buckets["turn"].extend(analysis["turn"])
+                buckets["handoff"].extend(analysis["handoff"])
+                for tool_name, durations in analysis["tools"].items():
+                    tool_buckets.setdefault(tool_name, []).extend(durations)
+
+            # Allocation pass (separate, since tracemalloc distorts timings)
+            tracemalloc.start()
+            for _ in range(max(10, iterations // 10)):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                await run_once()
+                allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+            tracemalloc.stop()
+
+            rows = {name: summarize(values) for name, values in buckets.items() if values}
+            rows.update({f"tool: {name}": summarize(values) for name, values in tool_buckets.items()})
+            print_table(f"[{path_name}] variant={variant}", rows)
+            print_table(f"[{path_name}] variant={variant} peak allocation per run",
+                        {"peak allocated": summarize(allocations)}, unit="KiB", scale=1 / 1024)
+
+
+# ============================================================================
+# Pricing Index Suite
+# ============================================================================
+
+def _synthetic_pricing_data(destinations: int) -> Dict[str, Any]:
+    """Pricing data with the real tables plus N synthetic destinations (two aliases each)."""
+    with open(PRICING_DATA_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    for i in range(destinations):
+        key = f"destination {i:05d}"
+        data["destinations"][key] = {
+            "daily_cost": 80.0 + i % 200, "flight_cost": 600 + i % 900, "high_cost": i % 7 == 0
+        }
+        data["aliases"][f"city {i:05d}"] = key
+        data["aliases"][f"Région {i:05d}, Province"] = key
+    return data
+
+
+def _legacy_estimate_budget(destination: str, days: int, travelers: int, acc_level: str) -> float:
+    """The pre-index estimate_budget body: rebuilds its tables on every call."""
+    destination = destination.lower()
+    acc_level = acc_level.lower()
+    destination_multipliers = {
+        "switzerland": 250.0, "norway": 220.0, "japan": 180.0,
+        "iceland": 200.0, "singapore": 160.0, "default": 120.0
+    }
+    base_cost = destination_multipliers.get(destination, destination_multipliers["default"])
+    acc_multipliers = {"budget": 0.7, "moderate": 1.0, "luxury": 2.5}
+    multiplier = acc_multipliers.get(acc_level, 1.0)
+    total_cost = base_cost * multiplier * days * travelers
+    flight_costs = {
+        "switzerland": 1200, "norway": 1100, "japan": 1300,
+        "iceland": 900, "singapore": 1400, "default": 800
+    }
+    flight_cost = flight_costs.get(destination, flight_costs["default"]) * travelers
+    return round(total_cost + flight_cost, 2)
+
+
+def _time_per_call(func: Callable[[], Any], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+async def bench_pricing(iterations: int = 200, destinations: int = 20000):
+    """Pricing index build cost, memory footprint and lookup latency at 10k+ destinations."""
+    print("\n" + "=" * 78)
+    print(f"PRICING INDEX ({destinations:,} synthetic destinations, {2 * destinations:,} aliases)")
+    print("=" * 78)
+
+    data = _synthetic_pricing_data(destinations)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    index = PricingIndex(data)
+    build_time = time.perf_counter() - start
+    footprint = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"\nBuild: {build_time * 1000:.1f} ms, footprint: {footprint / 1024 / 1024:.2f} MiB "
+          f"({footprint / len(index):.0f} bytes per destination)")
+
+    calls = 1000
+    lookups = {
+        "resolve (uncached): direct key": lambda: index._resolve("Destination 12345"),
+        "resolve (uncached): accented alias": lambda: index._resolve("Région 12345, Province"),
+        "resolve: direct key": lambda: index.resolve("Destination 12345"),
+        "resolve: alias": lambda: index.resolve("City 12345"),
+        "resolve: accented alias": lambda: index.resolve("Région 12345, Province"),
+        "resolve: compound (city, country)": lambda: index.resolve("Kyoto, Japan"),
+        "resolve: miss -> default": lambda: index.resolve("Atlantis"),
+        "estimate: legacy per-call tables": lambda: _legacy_estimate_budget("japan", 7, 2, "moderate"),
+        "estimate: shared index": lambda: quote_budget("japan", 7, 2, "moderate", index=index),
+        "breakdown: shared index": lambda: quote_breakdown("Zurich", 7, 2, "luxury", index=index),
+    }
+    rows = {
+        label: summarize([_time_per_call(func, calls) for _ in range(iterations)])
+        for label, func in lookups.items()
+    }
+    print_table(f"Per-call latency (mean of {calls} calls per sample)", rows, unit="µs", scale=1e6)
+
+
+# ============================================================================
+# Batch Quote Suite
+# ============================================================================
+
+async def bench_batch_quotes(iterations: int = 200):
+    """Throughput of vectorized grid quoting vs per-call estimate + breakdown."""
+    from batch_pricing import quote_batch, quote_grid  # Requires NumPy
+
+    destinations = ["Switzerland", "Tokyo", "Reykjavik", "Singapore", "Oslo", "Lisbon"]
+    rows = [
+        BudgetEstimateRequest(
+            destination=destination, days=days, travelers=travelers,
+            accommodation_level=level, include_flights=include_flights
+        )
+        for destination in destinations
+        for days in range(3, 22)
+        for travelers in range(1, 7)
+        for level in ("budget", "moderate", "luxury")
+        for include_flights in (True, False)
+    ]
+
+    print("\n" + "=" * 78)
+    print(f"BATCH QUOTES ({len(rows):,} trip variants across {len(destinations)} destinations)")
+    print("=" * 78)
+
+    def per_call():
+        return [
+            (
+                quote_budget(r.destination, r.days, r.travelers, r.accommodation_level),
+                quote_breakdown(r.destination, r.days, r.travelers, r.accommodation_level, r.include_flights)
+            )
+            for r in rows
+        ]
+
+    def grid():
+        return [quote_grid(destination) for destination in destinations]
+
+    # The vectorized results must match the scalar tools exactly
+    scalar = per_call()
+    quotes = quote_batch(rows)
+    mismatches = sum(
+        estimate != quotes["estimate"][i] or breakdown != quotes.breakdown(i)
+        for i, (estimate, breakdown) in enumerate(scalar)
+    )
+    print(f"\nExact match against scalar tools: {len(rows) - mismatches:,}/{len(rows):,} rows")
+
+    variants = {
+        "per-call estimate + breakdown": per_call,
+        "quote_batch (model rows)": lambda: quote_batch(rows),
+        "quote_grid (per destination)": grid,
+    }
+    samples = max(5, iterations // 10)
+    rows_timed = {}
+    for label, func in variants.items():
+        durations = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+        rows_timed[label] = summarize(durations)
+    print_table("Time per full sweep", rows_timed)
+    for label, stats in rows_timed.items():
+        print(f"  {label:38} {len(rows) / stats['p50']:>12,.0f} quotes/s")
+
+    # Converting every breakdown into another currency: one vectorized step vs per value
+    from currency import CONVERTER
+
+    breakdowns = [breakdown for _, breakdown in scalar]
+
+    def convert_per_value(breakdown):
+        converted = {key: CONVERTER.convert(value, "USD", "JPY") for key, value in breakdown.items() if key != "total"}
+        return {**converted, "total": float(sum(converted.values())), "currency": "JPY"}
+
+    per_value = lambda: [convert_per_value(breakdown) for breakdown in breakdowns]
+    print(f"\nCurrency conversion matches per-value convert: "
+          f"{CONVERTER.convert_breakdowns(breakdowns, 'JPY') == per_value()}")
+    conversions = {}
+    for label, func in {
+        "convert_breakdowns (one batch)": lambda: CONVERTER.convert_breakdowns(breakdowns, "JPY"),
+        "convert per value": per_value,
+    }.items():
+        durations = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+        conversions[label] = summarize(durations)
+    print_table(f"Convert {len(breakdowns):,} breakdowns USD -> JPY", conversions)
+
+
+# ============================================================================
+# Activity Catalog Suite
+# ============================================================================
+
+ACTIVITY_TAGS = (
+    "general", "hiking", "culture", "food", "history", "nature", "adventure",
+    "photography", "nightlife", "shopping", "wellness", "family"
+)
+
+
+def _synthetic_activities(activities: int, destinations: int, seed: int = 0):
+    """N synthetic activities over M destinations (1 in 50 global), 1-3 tags each."""
+    import random
+
+    rng = random.Random(seed)
+    for activity in range(activities):
+        yield {
+            "name": f"Activity {activity:07d}",
+            "destination": "*" if activity % 50 == 0 else f"City {rng.randrange(destinations):05d}",
+            "tags": rng.sample(ACTIVITY_TAGS, rng.randint(1, 3)),
+            "duration": rng.choice(("2 hours", "3-4 hours", "Half day", "Full day")),
+            "cost_usd": rng.choice((0, 15, 25, 40, 60, 80, 120, 200)),
+            "difficulty": rng.choice(("Easy", "Moderate", "Challenging")),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+        }
+
+
+def _scan_suggest(catalog, destination: str, interests: List[str], top_k: int = 5) -> List[str]:
+    """Full scan of the catalog, scoring every activity (the pre-index approach)."""
+    city = destination.casefold()
+    tags = set(interests)
+    scored = []
+    for activity_id in range(len(catalog)):
+        activity_destination = catalog.destinations[activity_id]
+        if activity_destination != "*" and activity_destination.casefold() != city:
+            continue
+        matched = len(tags.intersection(catalog.tags[activity_id]))
+        if matched:
+            scored.append((-(matched + catalog._static_scores[activity_id]), activity_id))
+    return [catalog.names[activity_id] for _, activity_id in sorted(scored)[:top_k]]
+
+
+async def bench_activities(iterations: int = 200, activities: int = 1_000_000, destinations: int = 2_000):
+    """Activity catalog build cost and query latency at 1M activities, vs a full scan."""
+    import random
+    from activities import ActivityCatalog
+
+    print("\n" + "=" * 78)
+    print(f"ACTIVITY CATALOG ({activities:,} activities, {destinations:,} destinations)")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    catalog = ActivityCatalog(_synthetic_activities(activities, destinations))
+    print(f"\nGenerated and indexed in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(1)
+    queries = [
+        (f"City {rng.randrange(destinations):05d}", rng.sample(ACTIVITY_TAGS, rng.randint(1, 3)))
+        for _ in range(max(iterations, 100) * 10)
+    ]
+    latencies = []
+    for destination, interests in queries:
+        t0 = time.perf_counter()
+        catalog.suggest(destination, interests)
+        latencies.append(time.perf_counter() - t0)
+
+    scans, mismatches = [], 0
+    for destination, interests in queries[:5]:
+        t0 = time.perf_counter()
+        expected = _scan_suggest(catalog, destination, interests)
+        scans.append(time.perf_counter() - t0)
+        mismatches += [activity["name"] for activity in catalog.suggest(destination, interests)] != expected
+    print(f"Matches full scan: {5 - mismatches}/5 queries")
+    print_table("suggest (top 5, 1-3 interests)", {
+        "inverted index + top-k heap": summarize(latencies),
+        "full catalog scan": summarize(scans),
+    }, unit="us", scale=1e6)
+
+
+# ============================================================================
+# Hotel Inventory Suite
+# ============================================================================
+
+def _synthetic_inventory(hotels: int, nights: int, destinations: int, seed: int = 0):
+    """Inventory of N hotels spread evenly over M synthetic destinations, random rooms and prices."""
+    import numpy as np
+    from inventory import HotelInventory
+
+    rng = np.random.default_rng(seed)
+    return HotelInventory(
+        names=[f"Hotel {hotel:06d}" for hotel in range(hotels)],
+        cities=[f"City {hotel % destinations:05d}" for hotel in range(hotels)],
+        ratings=rng.uniform(3.0, 5.0, hotels).round(1),
+        amenities=[("WiFi", "Breakfast")] * hotels,
+        rooms=rng.integers(0, 12, size=(hotels, nights), dtype=np.int16),
+        prices=rng.integers(6_000, 60_000, size=(hotels, nights), dtype=np.int32),
+        start_date=datetime.date.today()
+    )
+
+
+def _per_night_availability(calendar, hotels, start: int, end: int, limit: int = 10) -> list:
+    """Availability with Python loops over each hotel's nights (list-based calendar)."""
+    matches = []
+    for hotel in hotels:
+        rooms, prices = calendar[hotel]
+        available, total = rooms[start], 0
+        for night in range(start, end):
+            available = min(available, rooms[night])
+            total += prices[night]
+        if available >= 1:
+            matches.append((total, hotel))
+    matches.sort()
+    return [hotel for _, hotel in matches[:limit]]
+
+
+async def bench_inventory(iterations: int = 200, hotels: int = 100_000, nights: int = 365, destinations: int = 1_000):
+    """Availability latency and concurrent reservation safety at 100k hotels x 365 nights."""
+    import numpy as np
+
+    print("\n" + "=" * 78)
+    print(f"HOTEL INVENTORY ({hotels:,} hotels x {nights} nights, {destinations:,} destinations)")
+    print("=" * 78)
+
+    start = time.perf_counter()
+    inventory = _synthetic_inventory(hotels, nights, destinations)
+    build = time.perf_counter() - start
+    stats = inventory.get_stats()
+    print(f"\nBuilt in {build:.2f}s: {stats['calendar_mb']} MB of nightly calendars, "
+          f"{stats['destinations']:,} indexed destinations")
+
+    # Random stays of 1-14 nights at random destinations
+    rng = np.random.default_rng(1)
+    queries = []
+    for _ in range(max(iterations, 50) * 5):
+        stay = int(rng.integers(1, 15))
+        first = int(rng.integers(0, nights - stay))
+        check_in = inventory.start_date + datetime.timedelta(days=first)
+        queries.append((
+            f"City {int(rng.integers(destinations)):05d}",
+            check_in.isoformat(),
+            (check_in + datetime.timedelta(days=stay)).isoformat()
+        ))
+
+    # Per-night loop baseline over Python lists, for the hotels the queries touch
+    calendar = {}
+    for destination, _, _ in queries:
+        for hotel in inventory.hotels_in(destination).tolist():
+            calendar.setdefault(hotel, (inventory.rooms[hotel].tolist(), inventory.prices[hotel].tolist()))
+
+    vectorized, per_night, mismatches = [], [], 0
+    for destination, check_in, check_out in queries:
+        t0 = time.perf_counter()
+        result = inventory.availability(destination, check_in, check_out)
+        t1 = time.perf_counter()
+        first, last = inventory.night_range(check_in, check_out)
+        expected = _per_night_availability(calendar, inventory.hotels_in(destination).tolist(), first, last)
+        t2 = time.perf_counter()
+        vectorized.append(t1 - t0)
+        per_night.append(t2 - t1)
+        mismatches += [inventory.hotel_id(hotel["name"]) for hotel in result] != expected
+    print(f"Matches per-night loop: {len(queries) - mismatches:,}/{len(queries):,} queries")
+    print_table(f"Availability query ({hotels // destinations} hotels per destination, 1-14 nights)", {
+        "vectorized range-min (inventory)": summarize(vectorized),
+        "per-night Python loops": summarize(per_night),
+    }, unit="us", scale=1e6)
+
+    # Flexible dates: cheapest 5-night stay within a month, in one search vs one
+    # availability query per possible check-in date
+    def date_after(day: str, days: int) -> str:
+        return (datetime.date.fromisoformat(day) + datetime.timedelta(days=days)).isoformat()
+
+    calendar_end = (inventory.start_date + datetime.timedelta(days=nights)).isoformat()
+    searches = [
+        (destination, check_in, min(date_after(check_in, 31), calendar_end))
+        for destination, check_in, _ in queries[:max(iterations, 50)]
+        if date_after(check_in, 5) <= calendar_end
+    ]
+
+    def per_date(destination, earliest, latest):
+        stays = []
+        check_in = earliest
+        while date_after(check_in, 5) <= latest:
+            found = inventory.availability(destination, check_in, date_after(check_in, 5), limit=1)
+            stays += [(hotel["total_cost"], check_in) for hotel in found]
+            check_in = date_after(check_in, 1)
+        return min(stays, default=None)
+
+    windowed, looped, mismatches = [], [], 0
+    for destination, earliest, latest in searches:
+        t0 = time.perf_counter()
+        best = inventory.cheapest_windows(destination, earliest, latest, 5, top_k=1)
+        t1 = time.perf_counter()
+        expected = per_date(destination, earliest, latest)
+        t2 = time.perf_counter()
+        windowed.append(t1 - t0)
+        looped.append(t2 - t1)
+        mismatches += (best[0]["total_cost"], best[0]["check_in"]) != expected if best else expected is not None
+    print(f"\nCheapest-window search matches per-date queries: {len(searches) - mismatches:,}/{len(searches):,}")
+    print_table("Cheapest 5-night stay within a month", {
+        "sliding-window sums (one call)": summarize(windowed),
+        "one availability query per date": summarize(looped),
+    }, unit="us", scale=1e6)
+
+    # Concurrent bookings against a few hot hotels: no night may be oversold
+    from concurrent.futures import ThreadPoolExecutor
+
+    hot_hotels = [inventory.names[hotel] for hotel in range(200)]
+    initial = inventory.rooms[:200].copy()
+    attempts = [
+        (hot_hotels[int(rng.integers(200))], *queries[int(rng.integers(len(queries)))][1:])
+        for _ in range(20_000)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        reservations = list(pool.map(lambda attempt: inventory.reserve(*attempt), attempts))
+    wall = time.perf_counter() - start
+
+    booked = np.zeros_like(initial, dtype=np.int64)
+    for reservation in filter(None, reservations):
+        booked[reservation.hotel_id, reservation.start_night:reservation.end_night] += reservation.rooms
+    consistent = np.array_equal(initial - inventory.rooms[:200], booked)
+    oversold = int((inventory.rooms[:200] < 0).sum())
+    confirmed = sum(reservation is not None for reservation in reservations)
+    print(f"\nConcurrent reservations (32 threads, {len(attempts):,} attempts on 200 hotels): "
+          f"{len(attempts) / wall:,.0f} attempts/s, {confirmed:,} confirmed")
+    print(f"  Oversold nights: {oversold}, ledger consistent: {consistent}")
+
+
+# ============================================================================
+# Tool Fan-out Suite
+# ============================================================================
+
+def _blocking_tools(latency: float, slow_latency: float, slow_timeout: float) -> list:
+    """Three sync lookups blocking for `latency` (a stand-in for blocking I/O), plus one that overruns its timeout."""
+
+    @function_tool(timeout=10)
+    @threaded_tool
+    def get_destination_weather(destination: str) -> str:
+        """Get weather information for a destination."""
+        time.sleep(latency)
+        return f"Mild in {destination}"
+
+    @function_tool(timeout=10)
+    @threaded_tool
+    def get_travel_restrictions(destination: str) -> str:
+        """Get travel restrictions for a destination."""
+        time.sleep(latency)
+        return f"No visa needed for {destination}"
+
+    @function_tool(timeout=10)
+    @threaded_tool
+    def get_local_currency_info(destination: str) -> str:
+        """Get local currency information for a destination."""
+        time.sleep(latency)
+        return f"Local currency of {destination}"
+
+    @function_tool(timeout=slow_timeout)
+    @threaded_tool
+    def get_events(destination: str) -> str:
+        """Get upcoming events at a destination."""
+        time.sleep(slow_latency)
+        return f"Festivals in {destination}"
+
+    return [get_destination_weather, get_travel_restrictions, get_local_currency_info, get_events]
+
+
+FANOUT_LOOKUPS = (
+    ("get_destination_weather", {"destination": "Japan"}),
+    ("get_travel_restrictions", {"destination": "Japan"}),
+    ("get_local_currency_info", {"destination": "Japan"}),
+)
+
+FANOUT_SCRIPTS = {
+    "three lookups": {
+        "Fan-out Tester": [call_tools(*FANOUT_LOOKUPS), respond("Japan is mild, visa-free and uses yen.")],
+    },
+    "three lookups + one timing out": {
+        "Fan-out Tester": [
+            call_tools(*FANOUT_LOOKUPS, ("get_events", {"destination": "Japan"})),
+            respond("Japan is mild, visa-free and uses yen; events are unavailable."),
+        ],
+    },
+}
+
+
+async def bench_tool_fanout(iterations: int = 200, tool_latency: float = 0.05):
+    """Per-turn tool latency for one turn of parallel blocking tool calls: wall vs serial sum."""
+    iterations = min(iterations, 50)  # Every run sleeps in its tools
+    slow_timeout = 2 * tool_latency
+
+    print("\n" + "=" * 78)
+    print(f"TOOL FAN-OUT (sync tools blocking {tool_latency * 1000:.0f} ms each; "
+          f"a slow tool times out after {slow_timeout * 1000:.0f} ms)")
+    print("=" * 78)
+
+    agent = Agent(
+        name="Fan-out Tester",
+        instructions="You are Fan-out Tester, a test agent that calls lookup tools.",
+        tools=_blocking_tools(tool_latency, slow_latency=10 * tool_latency, slow_timeout=slow_timeout),
+        model="gpt-4o"
+    )
+    variants = {
+        "1 worker": (1, "three lookups"),
+        f"{DEFAULT_TOOL_WORKERS} workers": (DEFAULT_TOOL_WORKERS, "three lookups"),
+        f"{DEFAULT_TOOL_WORKERS} workers, timeout": (DEFAULT_TOOL_WORKERS, "three lookups + one timing out"),
+    }
+    for label, (workers, script) in variants.items():
+        configure_tool_executor(max_workers=workers)
+        run_config = RunConfig(
+            model_provider=ScriptedModelProvider(scripts=FANOUT_SCRIPTS[script]), tracing_disabled=True
+        )
+        turns: List[Dict[str, Any]] = []
+        await Runner.run(agent, "Tell me about Japan", hooks=ToolFanOutHooks(), run_config=run_config)
+        for _ in range(iterations):
+            await Runner.run(agent, "Tell me about Japan", hooks=ToolFanOutHooks(turns), run_config=run_config)
+
+        print_table(f"[{label}] {script}", {
+            "turn tool latency (wall)": summarize([turn["wall"] for turn in turns]),
+            "slowest single tool": summarize([turn["slowest"] for turn in turns]),
+            "sum of tool latencies (serial)": summarize([turn["serial"] for turn in turns]),
+        })
+        print(f"  speedup vs serial: {statistics.fmean(turn['speedup'] for turn in turns):.2f}x")
+    configure_tool_executor()
+
+
+# ============================================================================
+# Tool Invocation Suite
+# ============================================================================
+
+TRIP = {"destination": "Japan", "days": 7, "travelers": 2, "accommodation_level": "moderate"}
+
+# Arguments per tools.py tool (book_hotel gets a different night per call, see below)
+TOOL_INVOCATIONS = {
+    "estimate_budget": {"trip": TRIP},
+    "get_detailed_budget_breakdown": {"request": {**TRIP, "include_flights": True}},
+    "get_budget_breakdown_in_currency": {"request": {**TRIP, "include_flights": True}, "currency": "EUR"},
+    "check_hotel_availability": {
+        "destination": "Tokyo", "check_in": STAY_CHECK_IN, "check_out": STAY_CHECK_OUT, "guests": 2
+    },
+    "find_cheapest_stays": {
+        "destination": "Tokyo", "earliest_check_in": STAY_CHECK_IN, "latest_check_out": STAY_CHECK_OUT,
+        "nights": 3, "guests": 2, "top_k": 5
+    },
+    "book_hotel": {"booking": {"hotel_name": "Tokyo Central Inn", "guests": 2, "room_type": "deluxe"}},
+    "get_destination_weather": {"destination": "Japan", "month": "April"},
+    "get_local_currency_info": {"destination": "Japan"},
+    "convert_currency": {"amount": 1250.0, "from_currency": "USD", "to_currency": "JPY"},
+    "get_travel_restrictions": {"destination": "Japan"},
+    "suggest_activities": {"destination": "Kyoto", "interests": ["culture", "food"]},
+}
+
+
+def _tool_arguments(tool_name: str, call: int) -> str:
+    """JSON arguments for one call; bookings take a one-night stay on a different night each call."""
+    arguments = TOOL_INVOCATIONS[tool_name]
+    if tool_name == "book_hotel":
+        check_in = datetime.date.today() + datetime.timedelta(days=1 + call % 360)
+        arguments = {"booking": {
+            **arguments["booking"],
+            "check_in": check_in.isoformat(),
+            "check_out": (check_in + datetime.timedelta(days=1)).isoformat()
+        }}
+    return json.dumps(arguments)
+
+
+async def bench_tool_invocation(iterations: int = 200):
+    """Per-call overhead of the tool wrappers (argument parsing, validation, result text) vs the tool body."""
+    import tools
+
+    context = UserContext(user_id="bench_user", name="Bench User", email="bench@example.com")
+
+    print("\n" + "=" * 78)
+    print("TOOL INVOCATION OVERHEAD (per call; overhead = wrapper path - tool body)")
+    print("=" * 78)
+
+    def tool_context(tool_name: str, arguments: str) -> ToolContext:
+        return ToolContext(context=context, usage=Usage(), tool_name=tool_name,
+                           tool_call_id="bench", tool_arguments=arguments)
+
+    factors = {}
+    for tool_name in TOOL_INVOCATIONS:
+        # The undecorated body (no worker pool, memo or result cache), called with
+        # already-validated arguments
+        body = inspect.unwrap(getattr(tools, tool_name).on_invoke_tool)
+        schema = function_schema(body)
+
+        @functools.wraps(body)
+        async def async_body(*args, **kwargs):
+            return body(*args, **kwargs)
+
+        sdk_tool = function_tool(async_body)
+        fast_tool = fast_function_tool(async_body)
+
+        def body_call(call: int) -> Callable[[], Any]:
+            args, kwargs = schema.to_call_args(
+                schema.params_pydantic_model(**json.loads(_tool_arguments(tool_name, call)))
+            )
+            if schema.takes_context:
+                args = [tool_context(tool_name, ""), *args]
+            return lambda: body(*args, **kwargs)
+
+        async def sdk_call(arguments: str, ctx: ToolContext):
+            return str(await sdk_tool.on_invoke_tool(ctx, arguments))  # The SDK sends str(result)
+
+        async def fast_call(arguments: str, ctx: ToolContext):
+            return await fast_tool.on_invoke_tool(ctx, arguments)
+
+        samples: Dict[str, List[float]] = {"body": [], "function_tool": [], "fast_function_tool": []}
+        with quiet():  # book_hotel logs every booking
+            for call in range(iterations + 20):  # The first 20 calls warm up
+                func = body_call(call)
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+                if call >= 20:
+                    samples["body"].append(elapsed)
+                for label, invoke in (("function_tool", sdk_call), ("fast_function_tool", fast_call)):
+                    arguments = _tool_arguments(tool_name, call)
+                    ctx = tool_context(tool_name, arguments)
+                    start = time.perf_counter()
+                    await invoke(arguments, ctx)
+                    elapsed = time.perf_counter() - start
+                    if call >= 20:
+                        samples[label].append(elapsed)
+
+        body_p50 = percentile(samples["body"], 50)
+        overheads = {
+            label: [max(0.0, sample - body_p50) for sample in samples[label]]
+            for label in ("function_tool", "fast_function_tool")
+        }
+        print_table(f"[{tool_name}]", {
+            "tool body": summarize(samples["body"]),
+            "function_tool: overhead": summarize(overheads["function_tool"]),
+            "fast_function_tool: overhead": summarize(overheads["fast_function_tool"]),
+        }, unit="µs", scale=1e6)
+        fast_p50 = percentile(overheads["fast_function_tool"], 50)
+        factors[tool_name] = percentile(overheads["function_tool"], 50) / fast_p50 if fast_p50 else float("inf")
+
+    print("\nOverhead reduction (p50 function_tool overhead / p50 fast_function_tool overhead)")
+    print("-" * 78)
+    for tool_name, factor in factors.items():
+        print(f"{tool_name:40} {factor:>8.1f}x")
+
+    # The two costs called out in profiles, in isolation
+    result = tools.mock_hotel_availability("Tokyo", STAY_CHECK_IN, STAY_CHECK_OUT, 2)
+    calls = 1000
+    print_table(f"Date parsing and result text (mean of {calls} calls per sample)", {
+        "datetime.strptime(YYYY-MM-DD)": summarize([_time_per_call(
+            lambda: datetime.datetime.strptime(STAY_CHECK_IN, "%Y-%m-%d").date(), calls
+        ) for _ in range(iterations)]),
+        "date.fromisoformat": summarize([_time_per_call(
+            lambda: datetime.date.fromisoformat(STAY_CHECK_IN), calls
+        ) for _ in range(iterations)]),
+        "str(result) (availability)": summarize([_time_per_call(lambda: str(result), calls)
+                                                 for _ in range(iterations)]),
+        "serialize_tool_result (availability)": summarize([_time_per_call(
+            lambda: serialize_tool_result(result), calls
+        ) for _ in range(iterations)]),
+    }, unit="µs", scale=1e6)
+
+
+# ============================================================================
+# Guardrail Phrase Matching Suite
+# ============================================================================
+
+def _synthetic_phrase_lists(phrases: int, lists: int = 5, seed: int = 0) -> Dict[str, List[str]]:
+    """N synthetic 1-3 word phrases spread over several named lists."""
+    import random
+
+    rng = random.Random(seed)
+    syllables = ("ka", "lo", "mi", "zu", "re", "ta", "vo", "ne", "shi", "ra", "po", "qu")
+    vocabulary = ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(phrases)]
+    return {
+        f"list_{index}": [
+            " ".join(rng.sample(vocabulary, rng.randint(1, 3))) for _ in range(phrases // lists)
+        ]
+        for index in range(lists)
+    }
+
+
+def _synthetic_text(size: int, phrases: List[str], hits: int, seed: int = 0) -> str:
+    """About `size` characters of travel prose with `hits` phrases spliced in at random."""
+    import random
+
+    rng = random.Random(seed)
+    words = (
+        "plan", "a", "week", "in", "tokyo", "with", "two", "travelers", "moderate", "hotel",
+        "near", "the", "station", "budget", "flights", "museum", "food", "tour", "beach", "day"
+    )
+    text = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word) + 1
+    for _ in range(hits):
+        text.insert(rng.randrange(len(text)), rng.choice(phrases))
+    return " ".join(text)
+
+
+def _naive_matches(phrase_lists: Dict[str, List[str]], text: str) -> Dict[str, set]:
+    """`phrase in text.lower()` per phrase per list (the pre-matcher approach)."""
+    lowered = text.lower()
+    matched = {}
+    for list_name, phrases in phrase_lists.items():
+        for phrase in phrases:
+            if phrase in lowered:
+                matched.setdefault(list_name, set()).add(phrase)
+    return matched
+
+
+async def bench_guardrail_matching(iterations: int = 200, phrases: int = 5_000, text_size: int = 50_000):
+    """Compiled phrase matcher vs per-phrase substring scans, at real and synthetic list sizes."""
+    from guardrail_cascade import GUARDRAIL_MATCHER, GUARDRAIL_PHRASES
+    from phrase_matcher import PhraseMatcher
+
+    print("\n" + "=" * 78)
+    print(f"GUARDRAIL PHRASE MATCHING ({phrases:,} synthetic phrases, {text_size // 1000} KB inputs)")
+    print("=" * 78)
+
+    phrase_lists = _synthetic_phrase_lists(phrases)
+    all_phrases = [phrase for phrases_in_list in phrase_lists.values() for phrase in phrases_in_list]
+    start = time.perf_counter()
+    matcher = PhraseMatcher(phrase_lists, cache_size=0)  # Every scan below is a cold scan
+    print(f"\nPatterns compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    real_matcher = PhraseMatcher(GUARDRAIL_PHRASES, cache_size=0)
+    real_phrases = [phrase for phrases_in_list in GUARDRAIL_PHRASES.values() for phrase in phrases_in_list]
+    short_request = "Plan a 7-day trip to Japan for 2 travelers with a moderate budget and museum visits"
+    cases = {
+        f"{len(real_phrases)} guardrail phrases, short request": (GUARDRAIL_PHRASES, real_matcher, short_request),
+        f"{len(real_phrases)} guardrail phrases, {text_size // 1000} KB": (
+            GUARDRAIL_PHRASES, real_matcher, _synthetic_text(text_size, real_phrases, hits=5)
+        ),
+        f"{phrases:,} phrases, {text_size // 1000} KB, no matches": (
+            phrase_lists, matcher, _synthetic_text(text_size, all_phrases, hits=0)
+        ),
+        f"{phrases:,} phrases, {text_size // 1000} KB, 50 matches": (
+            phrase_lists, matcher, _synthetic_text(text_size, all_phrases, hits=50, seed=1)
+        ),
+    }
+
+    samples = max(10, iterations // 10)
+    for label, (lists, case_matcher, text) in cases.items():
+        expected = _naive_matches(lists, text)
+        found = {list_name: set(matched) for list_name, matched in case_matcher.matches(text).items()}
+        print(f"\n{label}: {sum(map(len, expected.values()))} distinct phrases matched, "
+              f"{'same as' if found == expected else 'DIFFERENT FROM'} substring scan")
+        calls = 1 if len(text) > 1000 else 200
+        print_table(f"[{label}] (mean of {calls} call(s) per sample)", {
+            "per-phrase `in` scans": summarize([
+                _time_per_call(lambda: _naive_matches(lists, text), calls) for _ in range(samples)
+            ]),
+            "PhraseMatcher.find_all (compiled re)": summarize([
+                _time_per_call(lambda: case_matcher.find_all(text), calls) for _ in range(samples)
+            ]),
+        })
+
+    # All three input guardrails on one request share a single scan through the matcher's cache
+    shared = [
+        _time_per_call(lambda: [GUARDRAIL_MATCHER.first(short_request, list_name) for list_name in (
+            "blocked_keywords", "suspicious_patterns", "inappropriate_travel_patterns", "policy_violations"
+        )], 200)
+        for _ in range(samples)
+    ]
+    print_table("Four input-list checks on one request (mean of 200 calls per sample)", {
+        "GUARDRAIL_MATCHER.first x4 (shared scan)": summarize(shared),
+    }, unit="us", scale=1e6)
+
+    # The three input guardrails on every turn of a growing conversation: the per-guardrail
+    # join + lower + scan of the whole history, vs the run's shared GuardrailInput, which
+    # scans only messages not passed on earlier turns of the conversation
+    from guardrails import use_guardrail_memory
+
+    input_guardrails = (simple_content_filter, llm_content_guardrail, policy_compliance_guardrail)
+    legacy_lists = ("blocked_keywords", "suspicious_patterns", "inappropriate_travel_patterns", "policy_violations")
+
+    def legacy_input_guardrails(input_list):
+        for list_names in (legacy_lists[:1], legacy_lists[1:3], legacy_lists[3:]):
+            lowered = " ".join(item.get("content", "") for item in input_list).lower()
+            any(phrase in lowered for list_name in list_names for phrase in GUARDRAIL_PHRASES[list_name])
+
+    turns = 50
+    conversation: List[Dict[str, str]] = []
+    guardrail_memory: Dict[str, set] = {}  # The conversation's (ConversationHistory.guardrail_memory)
+    legacy_latencies, shared_latencies = [], []
+    for turn in range(turns):
+        message = _synthetic_text(400, [], hits=0, seed=turn)
+        input_list = conversation + [{"role": "user", "content": message}]
+        start = time.perf_counter()
+        legacy_input_guardrails(input_list)
+        legacy_latencies.append(time.perf_counter() - start)
+        ctx = RunContextWrapper(context=None)
+        start = time.perf_counter()
+        with use_guardrail_memory(guardrail_memory):
+            for guardrail in input_guardrails:
+                await guardrail.guardrail_function(ctx, None, input_list)
+        shared_latencies.append(time.perf_counter() - start)
+        conversation += [{"role": "user", "content": message},
+                         {"role": "assistant", "content": _synthetic_text(1500, [], hits=0, seed=-turn)}]
+    last = slice(turns - 10, turns)
+    print_table(f"Three input guardrails per turn, turns {turns - 9}-{turns} (~95 KB of history)", {
+        "join + lower + scan per guardrail": summarize(legacy_latencies[last]),
+        "shared GuardrailInput (new message only)": summarize(shared_latencies[last]),
+    }, unit="us", scale=1e6)
+
+    await _bench_guardrail_cascade(iterations)
+    await _bench_verdict_cache(iterations)
+    _bench_streaming_output_guard(iterations)
+
+
+# Request mix for the cascade benchmark: (share, requests)
+CASCADE_WORKLOAD = (
+    (0.5, ["Plan a 7-day trip to Japan for 2 travelers", "What should I pack for Iceland in March?",
+           "Find me a moderate hotel in Lisbon", "Compare budgets for Paris and Rome"]),
+    (0.2, ["Plan a honeymoon in Santorini for next June", "Which neighborhoods in Kyoto are quiet at night?"]),
+    (0.2, ["What is the nightlife like in Berlin?", "Which casino in Macau has the best shows?",
+           "What can I bring through customs in Australia?"]),
+    (0.1, ["Where to buy drugs in Amsterdam", "How to smuggle cash across the border"]),
+)
+
+
+async def _bench_guardrail_cascade(iterations: int, llm_latency: float = 0.05):
+    """Keyword-then-LLM cascade vs an LLM guardrail on every request (scripted LLM tier)."""
+    import random
+    from guardrail_cascade import GuardrailCascade, GuardrailTier, keyword_input_tier, llm_guardrail_tier
+    from guardrails import input_guardrail_agent
+
+    verdict = {"is_violation": False, "reasoning": "Ordinary travel question"}
+    run_config = RunConfig(model_provider=ScriptedModelProvider(
+        scripts={input_guardrail_agent.name: [respond(verdict)]},
+        agents={"input_guardrail": input_guardrail_agent},
+        latency=llm_latency
+    ), tracing_disabled=True)
+    llm_tier = GuardrailTier("llm", llm_guardrail_tier(input_guardrail_agent, run_config, use_cache=False))
+    cascades = {
+        "LLM guardrail on every request": GuardrailCascade("llm_only", [llm_tier]),
+        "keyword tier, then LLM if inconclusive": GuardrailCascade("cascade", [
+            GuardrailTier("keyword", keyword_input_tier), llm_tier
+        ]),
+    }
+
+    rng = random.Random(0)
+    requests = [rng.choice(rng.choices([texts for _, texts in CASCADE_WORKLOAD],
+                                       weights=[share for share, _ in CASCADE_WORKLOAD])[0])
+                for _ in range(iterations)]
+    rows = {}
+    for label, cascade in cascades.items():
+        latencies = []
+        for text in requests:
+            start = time.perf_counter()
+            await cascade.run(RunContextWrapper(context=None), None, text)
+            latencies.append(time.perf_counter() - start)
+        rows[label] = summarize(latencies)
+
+    print_table(f"Content guardrail cascade ({iterations} requests: 50% approved, 20% other clean, "
+                f"20% gray-zone, 10% blocked; LLM tier {llm_latency * 1000:.0f} ms)", rows)
+    stats = cascades["keyword tier, then LLM if inconclusive"].get_stats()
+    for tier, tier_stats in stats["tiers"].items():
+        print(f"  {tier:8} reached {tier_stats['reached_fraction']:.0%} of requests, "
+              f"decided {tier_stats['decided']}, tripped {tier_stats['tripped']}, "
+              f"mean {tier_stats['mean_latency_ms']} ms")
+    print(f"  Latency saved: {stats['latency_saved_s']:.2f}s over {stats['requests']} requests")
+
+
+# Canned suggestions and common phrasings that reach the LLM guardrail all day
+REPEATED_GUARDRAIL_TEXTS = (
+    "What is the nightlife like in Berlin?", "Which casino in Macau has the best shows?",
+    "What can I bring through customs in Australia?", "Is cannabis legal in Amsterdam?",
+    "Can I visit Bali without a visa?", "Where can I get a massage in Bangkok?",
+)
+
+
+async def _bench_verdict_cache(iterations: int, llm_latency: float = 0.05):
+    """LLM guardrail tier with and without the verdict cache on repeated phrasings, and lookup cost."""
+    import random
+    import tempfile
+    from guardrail_cascade import llm_guardrail_tier
+    from guardrails import input_guardrail_agent
+    from models import GuardrailVerdict
+    from verdict_cache import VerdictCache, configure_verdict_cache, verdict_key
+
+    verdict = {"is_violation": False, "reasoning": "Ordinary travel question"}
+    provider = ScriptedModelProvider(
+        scripts={input_guardrail_agent.name: [respond(verdict)]},
+        agents={"input_guardrail": input_guardrail_agent},
+        latency=llm_latency
+    )
+    run_config = RunConfig(model_provider=provider, tracing_disabled=True)
+
+    # Variants differ only in case, spacing and trailing punctuation
+    rng = random.Random(0)
+    texts = []
+    for _ in range(iterations):
+        text = rng.choice(REPEATED_GUARDRAIL_TEXTS)
+        texts.append(rng.choice((text, text.upper(), text.rstrip("?"), text.replace(" ", "  "))))
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "verdicts.db")
+        cache = configure_verdict_cache(db_path=db_path)
+        rows = {}
+        for label, use_cache in (("no cache", False), ("verdict cache", True)):
+            check = llm_guardrail_tier(input_guardrail_agent, run_config, use_cache=use_cache)
+            calls_before = provider.model.calls
+            latencies = []
+            for text in texts:
+                start = time.perf_counter()
+                await check(RunContextWrapper(context=None), None, text)
+                latencies.append(time.perf_counter() - start)
+            rows[f"{label} ({provider.model.calls - calls_before} model calls)"] = summarize(latencies)
+        print_table(f"LLM guardrail tier on {iterations} repeated phrasings "
+                    f"({len(REPEATED_GUARDRAIL_TEXTS)} texts x case/spacing/punctuation variants)", rows)
+
+        # Another worker process opening the same file starts with an empty memory tier
+        key = verdict_key(input_guardrail_agent, "what is the nightlife like in berlin")
+        other_worker = VerdictCache(db_path=db_path)
+        disk_latencies, memory_latencies = [], []
+        for _ in range(iterations):
+            other_worker._entries.clear()
+            start = time.perf_counter()
+            assert other_worker.get(key, GuardrailVerdict) is not None
+            disk_latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            other_worker.get(key, GuardrailVerdict)
+            memory_latencies.append(time.perf_counter() - start)
+        print_table("Verdict lookup", {
+            "memory hit": summarize(memory_latencies),
+            "shared file hit (other worker)": summarize(disk_latencies),
+        }, unit="us", scale=1e6)
+        print(f"  Stats: {cache.get_stats()}")
+        other_worker.close()
+        configure_verdict_cache()
+
+
+def _bench_streaming_output_guard(iterations: int, response_size: int = 20_000):
+    """Per-delta cost of the streaming output guard vs re-scanning the accumulated output."""
+    from guardrail_cascade import GUARDRAIL_MATCHER, normalize_guardrail_text
+    from guardrails import StreamingOutputGuard
+
+    response = _synthetic_text(response_size, [], hits=0)
+    rows = {}
+    for chunk_size in (4, 16, 64):
+        chunks = [response[i:i + chunk_size] for i in range(0, len(response), chunk_size)]
+        guard = StreamingOutputGuard()
+        latencies = []
+        shown = []
+        for chunk in chunks:
+            start = time.perf_counter()
+            guard.feed(chunk)
+            shown.append(guard.release())
+            latencies.append(time.perf_counter() - start)
+        shown.append(guard.flush())
+        assert "".join(shown) == response
+        rows[f"guard.feed + release, {chunk_size}-char deltas"] = summarize(latencies)
+
+    # Checking the whole output so far on every delta grows with the response
+    chunks = [response[i:i + 16] for i in range(0, len(response), 16)]
+    latencies = []
+    streamed = ""
+    for chunk in chunks[:max(iterations, 200)]:
+        streamed += chunk
+        start = time.perf_counter()
+        GUARDRAIL_MATCHER.find_all(normalize_guardrail_text(streamed), use_cache=False)
+        latencies.append(time.perf_counter() - start)
+    rows[f"re-scan output so far ({len(latencies)} deltas)"] = summarize(latencies)
+    print_table(f"Streaming output guard ({response_size // 1000} KB clean response)", rows, unit="us", scale=1e6)
+
+    # A leak midway through: how much of the response is never generated or shown
+    leaked = response[:response_size // 2] + " your credit card number: 4111 1111 1111 1111 " + response[response_size // 2:]
+    guard = StreamingOutputGuard()
+    scanned = 0
+    shown = ""
+    for i in range(0, len(leaked), 16):
+        scanned += 16
+        if guard.feed(leaked[i:i + 16]):
+            break
+        shown += guard.release()
+    assert "credit card" not in shown
+    print(f"  Leak at {response_size // 2:,} chars: stream cut after {scanned:,} of {len(leaked):,} chars "
+          f"({1 - scanned / len(leaked):.0%} of the response never generated or shown); "
+          f"{len(shown):,} chars shown, held back {guard.boundary} normalized chars per delta")
+
+
+# ============================================================================
+# Backend Tools Load Suite
+# ============================================================================
+
+class LoopLagMonitor:
+    """Measures event-loop responsiveness: how late a periodic timer fires."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+
+def _blocking_backend_tools(fetch) -> list:
+    """
+    Baselines for the backend_tools.py tools: the same four calls (names and schemas)
+    made through an async fetch(method, path, params, body) wrapping a blocking client.
+    """
+
+    @function_tool(name_override="check_hotel_availability")
+    async def availability(destination: str, check_in: str, check_out: str, guests: int = 1) -> list:
+        """Check hotel availability for a given destination and dates."""
+        return await fetch("GET", "/hotels/availability", {
+            "destination": destination, "check_in": check_in, "check_out": check_out, "guests": guests
+        }, None)
+
+    @function_tool(name_override="get_destination_weather")
+    async def weather(destination: str, month: Optional[str] = None) -> dict:
+        """Get weather information for a destination."""
+        return await fetch("GET", "/weather", {"destination": destination, "month": month or "April"}, None)
+
+    @function_tool(name_override="get_travel_restrictions")
+    async def restrictions(destination: str) -> dict:
+        """Get travel restrictions and visa requirements for a destination."""
+        return await fetch("GET", "/restrictions", {"destination": destination}, None)
+
+    @function_tool(name_override="book_hotel")
+    async def booking(wrapper: RunContextWrapper[UserContext], booking: HotelBookingRequest) -> dict:
+        """Book a hotel room using user data from the secure context."""
+        guest = {"name": wrapper.context.name, "email": wrapper.context.email}
+        return await fetch("POST", "/hotels/bookings", None, {"booking": booking.model_dump(mode="json"), "guest": guest})
+
+    return [availability, weather, restrictions, booking]
+
+
+def _urllib_fetch(base_url: str):
+    """Blocking, unpooled fetch (a new connection per call) with urllib."""
+    def fetch(method, path, params, body):
+        url = base_url + path + ("?" + urllib.parse.urlencode(params) if params else "")
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(url, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+    return fetch
+
+
+BACKEND_LOAD_SCRIPT = {
+    "Backend Load Tester": [
+        call_tools(
+            ("check_hotel_availability", {
+                "destination": "Tokyo", "check_in": STAY_CHECK_IN, "check_out": STAY_CHECK_OUT, "guests": 2
+            }),
+            ("get_destination_weather", {"destination": "Japan", "month": "April"}),
+            ("get_travel_restrictions", {"destination": "Japan"}),
+            ("book_hotel", {"booking": {
+                "hotel_name": "Tokyo Grand Hotel", "check_in": STAY_CHECK_IN, "check_out": STAY_CHECK_OUT,
+                "guests": 2, "room_type": "deluxe"
+            }}),
+        ),
+        respond("Checked availability, weather and restrictions, and booked the hotel."),
+    ],
+}
+
+
+async def bench_backend_tools(iterations: int = 200, concurrency: int = 200, backend_latency: float = 0.02):
+    """
+    Event-loop responsiveness and throughput with 200 concurrent runs calling the
+    backend_tools.py tools, against blocking-client baselines.
+    """
+    import backend_tools
+    from mock_backend import MockBackendServer
+    from tool_cache import clear_tool_caches
+
+    print("\n" + "=" * 78)
+    print(f"BACKEND TOOLS LOAD TEST ({concurrency} concurrent runs x 4 backend calls, "
+          f"{backend_latency * 1000:.0f} ms backend latency)")
+    print("=" * 78)
+
+    provider = ScriptedModelProvider(scripts=BACKEND_LOAD_SCRIPT)
+    run_config = RunConfig(model_provider=provider, tracing_disabled=True)
+    context = UserContext(user_id="load_user", name="Load User", email="load@example.com")
+
+    with MockBackendServer(latency=backend_latency) as server:
+        client = backend_tools.configure_backend_client(base_url=server.url)
+        blocking_fetch = _urllib_fetch(server.url)
+
+        async def fetch_on_loop(method, path, params, body):
+            return blocking_fetch(method, path, params, body)  # Blocks the event loop
+
+        async def fetch_in_thread(method, path, params, body):
+            return await asyncio.to_thread(blocking_fetch, method, path, params, body)
+
+        variants = {
+            "backend_tools.py (async pooled client)": [
+                backend_tools.check_hotel_availability, backend_tools.get_destination_weather,
+                backend_tools.get_travel_restrictions, backend_tools.book_hotel,
+            ],
+            "sync tools in worker threads": _blocking_backend_tools(fetch_in_thread),
+            "blocking calls on the event loop": _blocking_backend_tools(fetch_on_loop),
+        }
+        for label, tools in variants.items():
+            agent = Agent(
+                name="Backend Load Tester",
+                instructions="You are Backend Load Tester, a test agent that calls backend tools.",
+                tools=tools,
+                model="gpt-4o"
+            )
+
+            async def run_once():
+                start = time.perf_counter()
+                await Runner.run(agent, "Book Tokyo", context=context, run_config=run_config)
+                return time.perf_counter() - start
+
+            # quiet() swaps sys.stdout, so enter it once around all concurrent runs
+            with quiet():
+                await run_once()  # Warm up connections and schemas
+                clear_tool_caches()  # Weather and restrictions lookups go to the backend again
+                monitor = LoopLagMonitor()
+                monitor.start()
+                start = time.perf_counter()
+                run_times = await asyncio.gather(*(run_once() for _ in range(concurrency)))
+                wall = time.perf_counter() - start
+                await monitor.stop()
+
+            print_table(f"[{label}] wall {wall:.2f}s, {concurrency / wall:,.0f} runs/s", {
+                "run latency": summarize(list(run_times)),
+                "event-loop lag": summarize(monitor.lags),
+                "event-loop lag (max)": summarize([max(monitor.lags, default=0.0)]),
+            })
+        await client.aclose()
+        print(f"\nBackend served {server.request_count:,} requests "
+              f"({client.stats['requests']:,} from backend_tools.py, {client.stats['errors']} errors)")
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+SUITES: Dict[str, Callable[..., Any]] = {
+    "orchestration": bench_orchestration,
+    "pricing": bench_pricing,
+    "batch-quotes": bench_batch_quotes,
+    "inventory": bench_inventory,
+    "activities": bench_activities,
+    "fanout": bench_tool_fanout,
+    "tools": bench_tool_invocation,
+    "guardrails": bench_guardrail_matching,
+    "backend": bench_backend_tools,
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Travel Agent System benchmarks")
+    parser.add_argument("--suite", choices=sorted(SUITES) + ["all"], default="all")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    suites = SUITES.values() if args.suite == "all" else [SUITES[args.suite]]
+    for suite in suites:
+        await suite(iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,191 @@
+"""
+Currency conversion engine for the budget tools.
+This module loads exchange rates from data/currency_rates.json into an immutable snapshot
+with a precomputed cross-rate matrix, and converts budget breakdowns (one or a batch) into
+any currency with one vectorized multiply. Refreshes build a new snapshot and swap it in
+atomically, so a conversion never sees a half-updated table.
+
+Requires NumPy (pip install numpy).
+"""
+
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from pricing import PRICING, normalize_destination
+
+
+CURRENCY_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "currency_rates.json")
+
+TOTAL_KEY = "total"  # Breakdown entry that sums the others
+
+
+def round_amounts(amounts: Any, decimals: int) -> np.ndarray:
+    """
+    Round amounts (a scalar or an array) to a currency's decimals, half to even. Every
+    conversion rounds through here, so one amount converts the same alone or in a batch.
+    """
+    return np.round(amounts, decimals)
+
+
+class RateTable:
+    """
+    Immutable exchange-rate snapshot.
+
+    - rates[i, j]: units of currency j per unit of currency i, precomputed for every pair
+      from each currency's USD rate (read-only array)
+    - destinations: normalized destination name -> currency code
+    """
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.version = data.get("version", 1)
+        self.as_of = data.get("as_of")
+        currencies = {code.upper(): entry for code, entry in data["currencies"].items()}
+        self.base_currency = data.get("base_currency", "USD").upper()
+        if self.base_currency not in currencies:
+            raise ValueError(f"Rates have no entry for base currency '{self.base_currency}'")
+
+        self.codes = tuple(currencies)
+        self.index: Mapping[str, int] = MappingProxyType({code: i for i, code in enumerate(self.codes)})
+        self.usd_rates = np.array([currencies[code]["usd_rate"] for code in self.codes], dtype=np.float64)
+        if not (self.usd_rates > 0).all():
+            raise ValueError("Every currency needs a positive usd_rate")
+        self.rates = self.usd_rates[:, None] / self.usd_rates[None, :]
+        self.usd_rates.flags.writeable = False
+        self.rates.flags.writeable = False
+        self.symbols: Mapping[str, str] = MappingProxyType(
+            {code: currencies[code].get("symbol", code) for code in self.codes}
+        )
+        self.decimals: Mapping[str, int] = MappingProxyType(
+            {code: currencies[code].get("decimals", 2) for code in self.codes}
+        )
+
+        destinations = {}
+        for destination, code in data.get("destinations", {}).items():
+            if code.upper() not in self.index:
+                raise ValueError(f"Destination '{destination}' uses unknown currency '{code}'")
+            destinations[normalize_destination(destination)] = code.upper()
+        self.destinations: Mapping[str, str] = MappingProxyType(destinations)
+
+    def currency_index(self, code: str) -> int:
+        """Row/column of a currency in the rate matrix."""
+        index = self.index.get(code.strip().upper())
+        if index is None:
+            raise ValueError(f"Unknown currency '{code}'")
+        return index
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Units of to_currency per unit of from_currency."""
+        return float(self.rates[self.currency_index(from_currency), self.currency_index(to_currency)])
+
+    def currency_for(self, destination: str) -> Optional[str]:
+        """Local currency of a free-form destination (None if unknown)."""
+        normalized = normalize_destination(destination)
+        code = self.destinations.get(normalized)
+        if code is None and "," in normalized:
+            code = next((self.destinations[part] for part in normalized.split(", ") if part in self.destinations), None)
+        if code is None:
+            code = self.destinations.get(PRICING.resolve(destination))
+        return code
+
+
+class CurrencyConverter:
+    """
+    Converts amounts and budget breakdowns using the current RateTable.
+
+    Every conversion reads the table reference once and uses that snapshot throughout.
+    refresh() builds the replacement table completely before publishing it with a
+    single reference assignment, so concurrent conversions see either the old rates
+    or the new ones, never a mix; refreshes themselves are serialized.
+    """
+
+    def __init__(self, table: RateTable, path: Optional[str] = None):
+        self._table = table
+        self._path = path
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str = CURRENCY_RATES_PATH) -> "CurrencyConverter":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(RateTable(json.load(f)), path)
+
+    @property
+    def table(self) -> RateTable:
+        return self._table
+
+    def refresh(self, data: Optional[Mapping[str, Any]] = None) -> RateTable:
+        """Swap in new rates (from data, or re-read from the rates file)."""
+        with self._refresh_lock:
+            if data is None:
+                if self._path is None:
+                    raise ValueError("No rates file to refresh from")
+                with open(self._path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            table = RateTable(data)
+            self._table = table
+        return table
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        """Convert one amount, rounded to the target currency's decimals."""
+        table = self._table
+        to_code = table.codes[table.currency_index(to_currency)]
+        return float(round_amounts(amount * table.rate(from_currency, to_code), table.decimals[to_code]))
+
+    def convert_breakdowns(
+        self,
+        breakdowns: Sequence[Mapping[str, float]],
+        to_currency: str,
+        from_currency: str = "USD"
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert a batch of budget breakdowns (e.g. from get_detailed_budget_breakdown) in one
+        vectorized step. Each result has the same keys, converted and rounded to the target
+        currency's decimals, plus "currency". A "total" entry is recomputed as the sum of the
+        rounded parts rather than converted on its own, so the parts always add up to it.
+        """
+        table = self._table
+        to_code = table.codes[table.currency_index(to_currency)]
+        rate = table.rates[table.currency_index(from_currency), table.index[to_code]]
+        if not breakdowns:
+            return []
+
+        # One row per breakdown over the union of their keys (NaN where a key is missing)
+        columns = list(dict.fromkeys(key for breakdown in breakdowns for key in breakdown))
+        values = np.array(
+            [[breakdown.get(key, np.nan) for key in columns] for breakdown in breakdowns], dtype=np.float64
+        )
+        decimals = table.decimals[to_code]
+        converted = round_amounts(values * rate, decimals)
+        if TOTAL_KEY in columns:
+            total = columns.index(TOTAL_KEY)
+            parts = np.nansum(np.delete(converted, total, axis=1), axis=1)
+            has_total = ~np.isnan(converted[:, total])
+            converted[has_total, total] = round_amounts(parts[has_total], decimals)  # Re-round float noise
+        converted = converted.tolist()
+
+        return [
+            {**{key: value for key, value in zip(columns, row) if value == value}, "currency": to_code}  # Skip NaN
+            for row in converted
+        ]
+
+    def convert_breakdown(
+        self,
+        breakdown: Mapping[str, float],
+        to_currency: str,
+        from_currency: str = "USD"
+    ) -> Dict[str, Any]:
+        """Convert one budget breakdown (see convert_breakdowns)."""
+        return self.convert_breakdowns([breakdown], to_currency, from_currency)[0]
+
+
+# Loaded once per process; refresh with CONVERTER.refresh()
+CONVERTER = CurrencyConverter.from_file()
+
+
+def get_currency_converter() -> CurrencyConverter:
+    """Get the process-wide currency converter."""
+    return CONVERTER
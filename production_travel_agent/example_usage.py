@@ -4,6 +4,7 @@ These examples can be run independently to understand specific features.
 """
 
 import asyncio
+from datetime import date, timedelta
 from agents import Runner
 
 # Import agents (adjust import path as needed)
@@ -145,10 +146,17 @@ async def example_secure_context():
         preferences={"accommodation": "luxury", "room_type": "suite"}
     )
     
+    # A seeded hotel (data/hotels.json), with dates inside the inventory's calendar
+    check_in = date.today() + timedelta(days=45)
+    check_out = check_in + timedelta(days=3)
+    
     print("\nMaking booking with secure context...")
     result = await Runner.run(
         starting_agent=booking_agent,
-        input="Book a hotel room at the Grand Plaza from 2024-06-15 to 2024-06-18 for 2 guests, deluxe room",
+        input=(
+            f"Book a hotel room at the Lisbon Grand Hotel from {check_in.isoformat()} to "
+            f"{check_out.isoformat()} for 2 guests, deluxe room"
+        ),
         context=user_context
     )
     
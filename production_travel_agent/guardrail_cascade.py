@@ -0,0 +1,298 @@
+"""
+Guardrail cascade: cheap deterministic checks first, an LLM guardrail agent only when needed.
+This module holds the named guardrail phrase lists and their compiled matcher, the keyword
+tiers built on them, and the cascade executor that runs tiers in order and stops at the
+first decision. guardrails.py builds the production guardrails on it; any other guardrail
+(e.g. one calling its own LLM agent) can put the same keyword tier in front of its model.
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import threading
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Sequence
+from agents import (
+    GuardrailFunctionOutput,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    Agent
+)
+from pydantic import BaseModel
+
+from models import GuardrailVerdict
+from phrase_matcher import PhraseMatcher
+from verdict_cache import get_verdict_cache, verdict_key
+
+# ============================================================================
+# Guardrail Phrase Lists
+# ============================================================================
+
+# Every keyword check matches against these lists through one compiled matcher,
+# so a text is scanned once however many lists (or phrases) there are
+GUARDRAIL_PHRASES = {
+    # Blocking lists hold phrases that carry their own intent: single words such as "scam",
+    # "drug" or "secret" also appear in ordinary travel questions ("how do I avoid tourist
+    # scams in Rome?") and belong in the review lists instead
+    "blocked_keywords": [
+        "buy drugs", "sell drugs", "buy a gun", "buy weapons", "illegal firearm",
+        "cyber attack", "hack into", "run a scam"
+    ],
+    "suspicious_patterns": [
+        "find drugs", "where to buy drugs", "where to buy weapons", "illegal activities",
+        "adult entertainment", "questionable services"
+    ],
+    # Travel-specific inappropriate requests
+    "inappropriate_travel_patterns": [
+        "best strip club", "where to find prostitutes",
+        "illegal activities in", "how to smuggle"
+    ],
+    "policy_violations": [
+        "cancel my booking and refund",  # Must go through proper channels
+        "change my passport number",     # Sensitive data modification
+        "access another user's account"   # Privacy violation
+    ],
+    # Leaks in a response: internal business terms, and personal data as a labelled value
+    # ("passport number: ..."), not a mention ("have your passport number ready")
+    "sensitive_patterns": [
+        "internal markup",
+        "profit margin",
+        "trade secret",
+        "strictly confidential",
+        "passport number:",
+        "credit card number:",
+        "card number:",
+        "cvv:",
+        "ssn:",
+        "social security number:",
+        "api key:",
+        "password:"
+    ],
+    # Decide how a leaking response is redacted
+    "pricing_terms": ["markup", "profit"],
+    "personal_terms": ["passport", "card number", "cvv", "ssn", "social security"],
+    # Gray-zone terms: not a violation by themselves, but a request with one is never
+    # approved by the keyword tier of a guardrail cascade (the LLM tier decides)
+    "input_review_terms": [
+        "drug", "illegal", "weapon", "firearm", "gambling", "hack", "scam",
+        "red light district", "prostitution", "where to buy",
+        "nightlife", "casino", "cannabis", "marijuana", "escort", "massage",
+        "border crossing", "customs", "without a visa", "visa overstay",
+        "fake", "bribe", "untraceable", "cash only"
+    ]
+}
+
+GUARDRAIL_MATCHER = PhraseMatcher(GUARDRAIL_PHRASES)
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_guardrail_text(text: str) -> str:
+    """
+    Normalize text for phrase matching: Unicode-folded (NFKC, case-folded) with whitespace
+    collapsed. Cached, so messages resent with the history are normalized once.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+# ============================================================================
+# Guardrail Cascade (cheap deterministic checks first, LLM only when needed)
+# ============================================================================
+
+# A tier check returns a decision (tripped or passed), or None when it cannot decide
+GuardrailCheck = Callable[[RunContextWrapper, Agent, str], Awaitable[Optional[GuardrailFunctionOutput]]]
+
+
+class GuardrailTier(NamedTuple):
+    """One tier of a guardrail cascade, ordered from cheapest to most expensive."""
+    name: str
+    check: GuardrailCheck
+
+
+class GuardrailCascade:
+    """
+    Runs a guardrail's tiers in order and stops at the first one that decides.
+
+    Records per tier how many requests reached it, were decided by it (and tripped) and
+    its mean latency. Requests decided before reaching a tier saved that tier's mean
+    latency, which get_stats() reports as latency saved.
+    """
+
+    def __init__(self, name: str, tiers: Sequence[GuardrailTier]):
+        self.name = name
+        self.tiers = tuple(tiers)
+        self.requests = 0
+        self.undecided = 0
+        self.tier_stats = {tier.name: {"reached": 0, "decided": 0, "tripped": 0, "time": 0.0} for tier in self.tiers}
+        self._lock = threading.Lock()
+
+    async def run(self, ctx: RunContextWrapper, agent: Agent, text: str) -> GuardrailFunctionOutput:
+        with self._lock:
+            self.requests += 1
+        for tier in self.tiers:
+            start_time = time.perf_counter()
+            decision = await tier.check(ctx, agent, text)
+            elapsed = time.perf_counter() - start_time
+            with self._lock:
+                stats = self.tier_stats[tier.name]
+                stats["reached"] += 1
+                stats["time"] += elapsed
+                if decision is not None:
+                    stats["decided"] += 1
+                    stats["tripped"] += decision.tripwire_triggered
+            if decision is not None:
+                return decision
+
+        # No tier could decide (only possible without a final, always-deciding tier)
+        with self._lock:
+            self.undecided += 1
+        return GuardrailFunctionOutput(
+            tripwire_triggered=False,
+            output_info=f"No {self.name} tier flagged the content"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier reach, decisions, trips and latency, plus estimated latency saved."""
+        with self._lock:
+            requests = self.requests
+            tiers = {}
+            latency_saved = 0.0
+            for name, stats in self.tier_stats.items():
+                mean_latency = stats["time"] / stats["reached"] if stats["reached"] else None
+                if mean_latency is not None:
+                    latency_saved += (requests - stats["reached"]) * mean_latency
+                tiers[name] = {
+                    "reached": stats["reached"],
+                    "reached_fraction": round(stats["reached"] / requests, 4) if requests else 0.0,
+                    "decided": stats["decided"],
+                    "tripped": stats["tripped"],
+                    "mean_latency_ms": round(mean_latency * 1000, 3) if mean_latency is not None else None
+                }
+            return {
+                "requests": requests,
+                "undecided": self.undecided,
+                "tiers": tiers,
+                "latency_saved_s": round(latency_saved, 3)
+            }
+
+
+# Keyword lists that trip an input cascade outright
+BLOCKING_INPUT_LISTS = ("blocked_keywords", "suspicious_patterns", "inappropriate_travel_patterns", "policy_violations")
+
+
+def _canonical_request(text: str) -> str:
+    """Normalized text with trailing punctuation dropped (how approvals and cached verdicts are keyed)."""
+    return normalize_guardrail_text(text).rstrip(" .!?")
+
+
+# Requests the keyword tier approves on its own: frequent travel questions whose verdict
+# does not depend on anything else in the text. Matched whole (normalized, trailing
+# punctuation ignored), so a request passes only if it is exactly one of these
+APPROVED_INPUT_REQUESTS = frozenset(
+    _canonical_request(request) for request in (
+        "Plan a 7-day trip to Japan for 2 travelers",
+        "What should I pack for Iceland in March?",
+        "Find me a moderate hotel in Lisbon",
+        "Compare budgets for Paris and Rome",
+        "What's the weather like in Tokyo in April?",
+        "Do I need a visa for Japan?",
+        "Suggest things to do in Barcelona",
+        "Convert 500 USD to EUR",
+    )
+)
+
+
+async def keyword_input_tier(ctx: RunContextWrapper, agent: Agent, text: str) -> Optional[GuardrailFunctionOutput]:
+    """Trip on blocking phrases, pass approved requests, defer everything else to the next tier."""
+    matched = GUARDRAIL_MATCHER.matches(normalize_guardrail_text(text))
+    for list_name in BLOCKING_INPUT_LISTS:
+        if list_name in matched:
+            return GuardrailFunctionOutput(
+                tripwire_triggered=True,
+                output_info=f"Content blocked: Request matches '{matched[list_name][0]}' ({list_name})"
+            )
+    if "input_review_terms" not in matched and _canonical_request(text) in APPROVED_INPUT_REQUESTS:
+        return GuardrailFunctionOutput(
+            tripwire_triggered=False,
+            output_info="Content approved by keyword tier (approved request)"
+        )
+    return None
+
+
+async def keyword_output_tier(ctx: RunContextWrapper, agent: Agent, text: str) -> Optional[GuardrailFunctionOutput]:
+    """Trip on sensitive phrases and defer everything else to the next tier (responses are never pre-approved)."""
+    matched = GUARDRAIL_MATCHER.matches(normalize_guardrail_text(text))
+    if "sensitive_patterns" in matched:
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=f"[REDACTED: Sensitive information removed ('{matched['sensitive_patterns'][0]}')]"
+        )
+    return None
+
+
+def guardrail_verdict_key(guardrail_agent: Agent, text: str) -> str:
+    """Verdict cache key of a text checked by a guardrail agent (case, spacing and trailing punctuation ignored)."""
+    return verdict_key(guardrail_agent, _canonical_request(text))
+
+
+def _decide_guardrail_verdict(verdict: GuardrailVerdict) -> GuardrailFunctionOutput:
+    return GuardrailFunctionOutput(tripwire_triggered=verdict.is_violation, output_info=verdict)
+
+
+# Configuration for guardrail agent runs started by the agent run in progress (see use_guardrail_run_config)
+_GUARDRAIL_RUN_CONFIG: contextvars.ContextVar[Optional[RunConfig]] = contextvars.ContextVar(
+    "guardrail_run_config", default=None
+)
+
+
+@contextlib.contextmanager
+def use_guardrail_run_config(run_config: Optional[RunConfig]):
+    """
+    Run the LLM guardrail agents of runs started in this block (task-local) with the outer
+    run's configuration (model provider, model settings, tracing), so a run on a scripted
+    provider also checks its guardrails offline. The outer run's own guardrails are left
+    out of it. Tiers built with an explicit run_config keep theirs.
+    """
+    if run_config is not None:
+        run_config = dataclasses.replace(run_config, input_guardrails=None, output_guardrails=None)
+    token = _GUARDRAIL_RUN_CONFIG.set(run_config)
+    try:
+        yield
+    finally:
+        _GUARDRAIL_RUN_CONFIG.reset(token)
+
+
+def llm_guardrail_tier(
+    guardrail_agent: Agent,
+    run_config: Optional[RunConfig] = None,
+    use_cache: bool = True,
+    decide: Callable[[BaseModel], GuardrailFunctionOutput] = _decide_guardrail_verdict
+) -> GuardrailCheck:
+    """
+    A final cascade tier that asks an LLM guardrail agent (always decides). The agent runs
+    with run_config, or else the configuration of the outer run (use_guardrail_run_config).
+    Verdicts are reused from the process-wide verdict cache for the same agent and
+    normalized text, unless the request bypasses it (see verdict_cache.bypass_verdict_cache).
+
+    decide turns the agent's structured output into the guardrail decision; the default
+    reads a GuardrailVerdict, agents with another output_type pass their own.
+    """
+    async def check(ctx: RunContextWrapper, agent: Agent, text: str) -> GuardrailFunctionOutput:
+        cache = get_verdict_cache() if use_cache else None
+        key = guardrail_verdict_key(guardrail_agent, text) if cache is not None else None
+        verdict: Optional[BaseModel] = cache.get(key, guardrail_agent.output_type) if key else None
+        if verdict is None:
+            result = await Runner.run(
+                guardrail_agent,
+                text,
+                context=ctx.context if ctx is not None else None,
+                run_config=run_config if run_config is not None else _GUARDRAIL_RUN_CONFIG.get()
+            )
+            verdict = result.final_output
+            if key:
+                cache.put(key, verdict)
+        return decide(verdict)
+
+    return check
@@ -3,18 +3,140 @@ Input and output guardrails for securing agent interactions.
 This module demonstrates protecting agents from inappropriate inputs and preventing information leakage.
 """
 
-from typing import Any, Union
+import contextlib
+import contextvars
+import re
+import time
+import unicodedata
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple, Union
 from agents import (
     GuardrailFunctionOutput,
     InputGuardrailResult,
     OutputGuardrailResult,
     RunContextWrapper,
+    Runner,
     Agent,
     TResponseInputItem,
     input_guardrail,
     output_guardrail
 )
 
+from guardrail_cascade import (
+    GUARDRAIL_MATCHER,
+    GuardrailCascade,
+    GuardrailTier,
+    keyword_input_tier,
+    keyword_output_tier,
+    llm_guardrail_tier,
+    normalize_guardrail_text
+)
+from models import GuardrailVerdict
+from phrase_matcher import PhraseMatch, PhraseMatcher
+from tool_cache import run_state
+
+
+# ============================================================================
+# Guardrail Input Text
+# ============================================================================
+
+def _message_text(item: Any) -> Optional[str]:
+    """Text of a user-authored input item (None for assistant, system and tool items)."""
+    if not isinstance(item, dict):
+        return str(item)
+    if item.get("role", "user") != "user":
+        return None
+    content = item.get("content", "")
+    if isinstance(content, list):  # Content parts
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+# Guardrail memory of the conversation whose runs are in progress (see use_guardrail_memory)
+_GUARDRAIL_MEMORY: contextvars.ContextVar[Optional[Dict[str, Set[str]]]] = contextvars.ContextVar(
+    "guardrail_memory", default=None
+)
+
+
+@contextlib.contextmanager
+def use_guardrail_memory(memory: Optional[Dict[str, Set[str]]]):
+    """
+    Let the keyword input guardrails of runs started in this block (task-local) skip user
+    messages they passed on earlier turns of the same conversation. memory is the
+    conversation's own record, e.g. ConversationHistory.guardrail_memory.
+    """
+    token = _GUARDRAIL_MEMORY.set(memory)
+    try:
+        yield
+    finally:
+        _GUARDRAIL_MEMORY.reset(token)
+
+
+class GuardrailInput:
+    """
+    A run's input as normalized user messages, built once and shared by the run's input
+    guardrails.
+
+    With a conversation's guardrail memory (guardrail name -> normalized messages it
+    passed), a deterministic keyword guardrail checks only the messages it has not passed
+    on earlier turns, so on a turn with history only the newest user message is scanned.
+    """
+
+    def __init__(
+        self,
+        input: Union[str, list[TResponseInputItem]],
+        memory: Optional[Dict[str, Set[str]]] = None
+    ):
+        items = input if isinstance(input, list) else [input]
+        self.messages: List[str] = [
+            normalize_guardrail_text(text) for text in map(_message_text, items) if text
+        ]
+        self.memory = memory
+
+    @property
+    def text(self) -> str:
+        """All user messages, normalized."""
+        return " ".join(self.messages)
+
+    def unchecked(self, guardrail: str) -> str:
+        """
+        The normalized user messages a guardrail has not passed yet. Each follows the tail
+        of the message before it (longest phrase - 1 characters) when that one was passed,
+        so a phrase spanning the two is still found.
+        """
+        passed = self.memory.get(guardrail, ()) if self.memory is not None else ()
+        overlap = GUARDRAIL_MATCHER.max_phrase_length - 1
+        parts = []
+        for index, message in enumerate(self.messages):
+            if message in passed:
+                continue
+            if index and overlap > 0 and self.messages[index - 1] in passed:
+                parts.append(self.messages[index - 1][-overlap:])
+            parts.append(message)
+        return " ".join(parts)
+
+    def mark_passed(self, guardrail: str):
+        """
+        Record in the conversation's memory that a guardrail passed every message of this
+        input (messages no longer resent with the history are forgotten).
+        """
+        if self.memory is not None:
+            self.memory[guardrail] = set(self.messages)
+
+
+def get_guardrail_input(
+    ctx: Optional[RunContextWrapper],
+    input: Union[str, list[TResponseInputItem]]
+) -> GuardrailInput:
+    """The normalized input of the run a guardrail context belongs to (built on first use)."""
+    if ctx is None:
+        return GuardrailInput(input, _GUARDRAIL_MEMORY.get())
+    state = run_state(ctx)
+    guardrail_input = state.get("guardrail_input")
+    if guardrail_input is None:
+        guardrail_input = state.setdefault("guardrail_input", GuardrailInput(input, _GUARDRAIL_MEMORY.get()))
+    return guardrail_input
+
 
 # ============================================================================
 # Input Guardrails (Protect against inappropriate requests)
@@ -30,29 +152,16 @@ async def simple_content_filter(
     Simple keyword-based content filter for fast, first-line defense.
     Catches obviously inappropriate requests quickly.
     """
-    # Handle both string and list inputs
-    if isinstance(input, list):
-        input_str = " ".join([item.get("content", "") if isinstance(item, dict) else str(item) for item in input])
-    else:
-        input_str = str(input)
-    
-    # List of blocked keywords/phrases
-    blocked_keywords = [
-        "drug", "illegal", "weapon", "firearm",
-        "red light district", "prostitution", "gambling",
-        "hack", "cyber attack", "scam"
-    ]
-    
-    user_input_lower = input_str.lower()
-    
-    for keyword in blocked_keywords:
-        if keyword in user_input_lower:
-            return GuardrailFunctionOutput(
-                tripwire_triggered=True,
-                output_info=f"Content blocked: Request contains inappropriate keyword '{keyword}'"
-            )
+    guardrail_input = get_guardrail_input(ctx, input)
+    match = GUARDRAIL_MATCHER.first(guardrail_input.unchecked("simple_content_filter"), "blocked_keywords")
+    if match:
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=f"Content blocked: Request contains inappropriate keyword '{match.phrase}'"
+        )
     
     # Allow the request
+    guardrail_input.mark_passed("simple_content_filter")
     return GuardrailFunctionOutput(
         tripwire_triggered=False,
         output_info="Content approved by keyword filter"
@@ -72,40 +181,23 @@ async def llm_content_guardrail(
     Note: In production, this would use an LLM to analyze the input.
     For demonstration, we use rule-based logic.
     """
-    # Handle both string and list inputs
-    if isinstance(input, list):
-        input_str = " ".join([item.get("content", "") if isinstance(item, dict) else str(item) for item in input])
-    else:
-        input_str = str(input)
+    guardrail_input = get_guardrail_input(ctx, input)
+    input_str = guardrail_input.unchecked("llm_content_guardrail")
     
     # More sophisticated analysis (in production, use LLM)
-    suspicious_patterns = [
-        "find drugs", "where to buy", "illegal activities",
-        "adult entertainment", "questionable services"
-    ]
-    
-    user_input_lower = input_str.lower()
-    
-    for pattern in suspicious_patterns:
-        if pattern in user_input_lower:
-            return GuardrailFunctionOutput(
-                tripwire_triggered=True,
-                output_info=f"Content blocked by intelligent filter: Request appears to seek inappropriate content"
-            )
-    
-    # Additional checks for travel-specific inappropriate requests
-    inappropriate_travel_patterns = [
-        "best strip club", "where to find prostitutes",
-        "illegal activities in", "how to smuggle"
-    ]
+    if GUARDRAIL_MATCHER.first(input_str, "suspicious_patterns"):
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=f"Content blocked by intelligent filter: Request appears to seek inappropriate content"
+        )
     
-    for pattern in inappropriate_travel_patterns:
-        if pattern in user_input_lower:
-            return GuardrailFunctionOutput(
-                tripwire_triggered=True,
-                output_info=f"Content blocked: Inappropriate travel-related request detected"
-            )
+    if GUARDRAIL_MATCHER.first(input_str, "inappropriate_travel_patterns"):
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=f"Content blocked: Inappropriate travel-related request detected"
+        )
     
+    guardrail_input.mark_passed("llm_content_guardrail")
     return GuardrailFunctionOutput(
         tripwire_triggered=False,
         output_info="Content approved by LLM-based guardrail"
@@ -121,28 +213,14 @@ async def policy_compliance_guardrail(
     """
     Policy compliance guardrail to ensure requests align with company policies.
     """
-    # Handle both string and list inputs
-    if isinstance(input, list):
-        input_str = " ".join([item.get("content", "") if isinstance(item, dict) else str(item) for item in input])
-    else:
-        input_str = str(input)
-    
-    # Policy violations
-    policy_violations = [
-        "cancel my booking and refund",  # Must go through proper channels
-        "change my passport number",     # Sensitive data modification
-        "access another user's account"   # Privacy violation
-    ]
-    
-    user_input_lower = input_str.lower()
-    
-    for violation in policy_violations:
-        if violation in user_input_lower:
-            return GuardrailFunctionOutput(
-                tripwire_triggered=True,
-                output_info=f"Request blocked: Policy violation detected. Please contact customer support for this request."
-            )
+    guardrail_input = get_guardrail_input(ctx, input)
+    if GUARDRAIL_MATCHER.first(guardrail_input.unchecked("policy_compliance_guardrail"), "policy_violations"):
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=f"Request blocked: Policy violation detected. Please contact customer support for this request."
+        )
     
+    guardrail_input.mark_passed("policy_compliance_guardrail")
     return GuardrailFunctionOutput(
         tripwire_triggered=False,
         output_info="Policy compliance verified"
@@ -163,41 +241,26 @@ async def leakage_output_guardrail(
     Output guardrail to prevent sensitive information leakage.
     Redacts or blocks responses that might contain sensitive data.
     """
-    # Sensitive patterns to detect
-    sensitive_patterns = [
-        "internal markup",
-        "profit margin",
-        "confidential",
-        "trade secret",
-        "passport number",
-        "credit card",
-        "ssn",
-        "social security",
-        "api key",
-        "password",
-        "secret"
-    ]
-    
-    output_lower = agent_output.lower()
+    output_str = str(output)
+    matched = GUARDRAIL_MATCHER.matches(normalize_guardrail_text(output_str))
     
-    for pattern in sensitive_patterns:
-        if pattern in output_lower:
-            # Redact the sensitive information
-            redacted_output = agent_output
-            # Simple redaction (in production, use more sophisticated methods)
-            if "markup" in output_lower or "profit" in output_lower:
-                redacted_output = "[REDACTED: Internal pricing information removed]"
-            elif any(p in output_lower for p in ["passport", "credit card", "ssn"]):
-                redacted_output = "[REDACTED: Personal information removed for security]"
-            
-            return GuardrailFunctionOutput(
-                tripwire_triggered=True,
-                output_info=redacted_output
-            )
+    if "sensitive_patterns" in matched:
+        # Redact the sensitive information
+        redacted_output = output_str
+        # Simple redaction (in production, use more sophisticated methods)
+        if "pricing_terms" in matched:
+            redacted_output = "[REDACTED: Internal pricing information removed]"
+        elif "personal_terms" in matched:
+            redacted_output = "[REDACTED: Personal information removed for security]"
+        
+        return GuardrailFunctionOutput(
+            tripwire_triggered=True,
+            output_info=redacted_output
+        )
     
     return GuardrailFunctionOutput(
         tripwire_triggered=False,
-        output_info=agent_output
+        output_info=output
     )
 
 
@@ -259,6 +322,188 @@ async def format_validation_guardrail(
     )
 
 
+# ============================================================================
+# Streaming Output Guardrail
+# ============================================================================
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+class StreamingOutputGuard:
+    """
+    Incremental leakage check over streamed text deltas (ResponseTextDeltaEvent.delta).
+
+    Each delta is normalized like normalize_guardrail_text and scanned together with a
+    rolling buffer of the previous `boundary` normalized characters (the longest checked
+    phrase - 1), so a phrase split across deltas is caught on the delta that completes it.
+    Per-delta cost depends on the delta and the buffer only, not on how much has streamed.
+
+    Deltas are held back until at least `boundary` normalized characters follow them, so
+    release() only returns text that can no longer be part of a match; flush() returns
+    the rest once the stream has ended. On a match the caller should cancel the run:
+    held-back text is dropped, so no part of the phrase has been shown.
+    """
+
+    def __init__(
+        self,
+        list_names: Sequence[str] = ("sensitive_patterns",),
+        matcher: Optional[PhraseMatcher] = None
+    ):
+        self.list_names = tuple(list_names)
+        self.matcher = matcher or GUARDRAIL_MATCHER
+        self.boundary = max(0, max(
+            (len(phrase) for name in self.list_names for phrase in self.matcher.phrase_lists.get(name, ())),
+            default=0
+        ) - 1)
+        self._buffer = ""
+        # Held-back deltas: (raw text, normalized length)
+        self._pending: Deque[Tuple[str, int]] = deque()
+        self._pending_characters = 0
+        self.match: Optional[PhraseMatch] = None
+        self.deltas = 0
+        self.characters = 0
+        self.scan_time = 0.0
+        self.max_scan_time = 0.0
+
+    @property
+    def tripped(self) -> bool:
+        return self.match is not None
+
+    def feed(self, delta: str) -> Optional[PhraseMatch]:
+        """Scan the next delta; returns the first match it completes (None if clean)."""
+        if self.match is not None:
+            return self.match
+        start_time = time.perf_counter()
+        chunk = _WHITESPACE_RUN.sub(" ", unicodedata.normalize("NFKC", delta).casefold())
+        if chunk.startswith(" ") and (not self._buffer or self._buffer.endswith(" ")):
+            chunk = chunk[1:]  # Whitespace runs split across deltas collapse to one space
+
+        window = self._buffer + chunk
+        for match in self.matcher.find_all(window, use_cache=False):
+            # Matches ending inside the buffer were already checked with the previous delta
+            if match.end > len(self._buffer) and match.list_name in self.list_names:
+                self.match = match._replace(
+                    start=self.characters - len(self._buffer) + match.start,
+                    end=self.characters - len(self._buffer) + match.end
+                )
+                break
+        self._buffer = window[-self.boundary:] if self.boundary else ""
+        self.characters += len(chunk)
+        self.deltas += 1
+        if self.match is None:
+            self._pending.append((delta, len(chunk)))
+            self._pending_characters += len(chunk)
+        else:
+            self._pending.clear()  # Never shown
+            self._pending_characters = 0
+
+        elapsed = time.perf_counter() - start_time
+        self.scan_time += elapsed
+        self.max_scan_time = max(self.max_scan_time, elapsed)
+        return self.match
+
+    def release(self) -> str:
+        """Held-back text that can no longer be part of a match, to render now."""
+        released = []
+        while self._pending and self._pending_characters - self._pending[0][1] >= self.boundary:
+            text, length = self._pending.popleft()
+            self._pending_characters -= length
+            released.append(text)
+        return "".join(released)
+
+    def flush(self) -> str:
+        """All held-back text, once the stream has ended (nothing after a match)."""
+        released = "".join(text for text, _ in self._pending)
+        self._pending.clear()
+        self._pending_characters = 0
+        return released
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Deltas scanned, per-delta scan latency and the match (if any)."""
+        return {
+            "deltas": self.deltas,
+            "characters": self.characters,
+            "mean_delta_latency_us": round(self.scan_time / self.deltas * 1e6, 2) if self.deltas else 0.0,
+            "max_delta_latency_us": round(self.max_scan_time * 1e6, 2),
+            "match": self.match._asdict() if self.match else None
+        }
+
+
+# ============================================================================
+# Guardrail Cascades (cheap deterministic checks first, LLM only when needed)
+# ============================================================================
+
+input_guardrail_agent = Agent(
+    name="Input Guardrail",
+    instructions=(
+        "You review requests sent to a travel assistant. "
+        "Flag a request as a violation if it seeks illegal goods or services, sexual services, "
+        "ways to evade border, customs or visa controls, fraud, or anything harmful to others. "
+        "Ordinary travel questions about nightlife, casinos, spas, customs rules or visas are not violations. "
+        "Explain your verdict in one sentence."
+    ),
+    model="gpt-4.1",
+    output_type=GuardrailVerdict
+)
+
+sensitive_info_guardrail_agent = Agent(
+    name="Sensitive Info Guardrail",
+    instructions=(
+        "You review responses written by a travel assistant before they reach the user. "
+        "Flag a response as a violation if it discloses personal data (passport, card, account or "
+        "identity numbers, dates of birth, home addresses, phone numbers), credentials, or internal "
+        "pricing and business information. General advice such as reminding travelers to bring a "
+        "passport is not a violation. Explain your verdict in one sentence."
+    ),
+    model="gpt-4.1",
+    output_type=GuardrailVerdict
+)
+
+CONTENT_INPUT_CASCADE = GuardrailCascade("content_input_guardrail", [
+    GuardrailTier("keyword", keyword_input_tier),
+    GuardrailTier("llm", llm_guardrail_tier(input_guardrail_agent)),
+])
+
+SENSITIVE_OUTPUT_CASCADE = GuardrailCascade("sensitive_output_guardrail", [
+    GuardrailTier("keyword", keyword_output_tier),
+    GuardrailTier("llm", llm_guardrail_tier(sensitive_info_guardrail_agent)),
+])
+
+
+@input_guardrail
+async def content_input_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input: Union[str, list[TResponseInputItem]]
+) -> GuardrailFunctionOutput:
+    """
+    Content guardrail backed by an LLM guardrail agent, which is only consulted when the
+    keyword tier cannot decide (see CONTENT_INPUT_CASCADE).
+    """
+    # The whole conversation, every turn: the LLM tier's verdict depends on context, so
+    # passes are not remembered (repeated texts are answered by the verdict cache instead)
+    return await CONTENT_INPUT_CASCADE.run(ctx, agent, get_guardrail_input(ctx, input).text)
+
+
+@output_guardrail
+async def sensitive_output_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    output: Any
+) -> GuardrailFunctionOutput:
+    """
+    Sensitive information guardrail backed by an LLM guardrail agent, which is only
+    consulted when the keyword tier cannot decide (see SENSITIVE_OUTPUT_CASCADE).
+    """
+    output_str = output.model_dump_json() if hasattr(output, "model_dump_json") else str(output)
+    return await SENSITIVE_OUTPUT_CASCADE.run(ctx, agent, output_str)
+
+
+def get_guardrail_cascade_stats() -> Dict[str, Dict[str, Any]]:
+    """Tier statistics of the built-in guardrail cascades."""
+    return {cascade.name: cascade.get_stats() for cascade in (CONTENT_INPUT_CASCADE, SENSITIVE_OUTPUT_CASCADE)}
+
+
 # ============================================================================
 # Combined Guardrail Functions
 # ============================================================================
@@ -0,0 +1,221 @@
+"""
+Token-budgeted conversation history for multi-turn conversations.
+This module keeps recent turns verbatim and folds older turns into a rolling summary,
+so the input resent on every turn stays bounded instead of growing with the session.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """
+    Cheap token estimate for budgeting purposes.
+    Uses the common ~4 characters per token approximation for English text.
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / chars_per_token)
+
+
+def _output_to_text(output: Any) -> str:
+    """Convert an agent final output (plain text or Pydantic model) to message text."""
+    if hasattr(output, "model_dump_json"):
+        return output.model_dump_json()
+    return str(output)
+
+
+def _condense(text: str, max_chars: int) -> str:
+    """Collapse whitespace and truncate text for inclusion in the summary."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 3].rstrip() + "..."
+
+
+class ConversationHistory:
+    """
+    Conversation history manager with a configurable token budget.
+
+    The most recent turns are kept verbatim. When the history exceeds the budget,
+    the oldest verbatim turns are folded into a rolling summary one at a time; the
+    summary is extended incrementally and never rebuilt from the full history.
+    A turn whose summary line would not be shorter than the turn itself (short
+    messages) is never summarized: it stays verbatim, and is dropped once it is the
+    oldest turn and the history is over budget.
+    Token counts are tracked incrementally so each turn costs O(1) bookkeeping.
+    """
+
+    SUMMARY_HEADER = "Summary of earlier conversation:"
+
+    def __init__(
+        self,
+        token_budget: int = 3000,
+        min_recent_turns: int = 2,
+        summary_token_budget: Optional[int] = None,
+        summary_chars_per_message: int = 200
+    ):
+        self.token_budget = token_budget
+        self.min_recent_turns = min_recent_turns
+        self.summary_token_budget = summary_token_budget or max(1, token_budget // 4)
+        self.summary_chars_per_message = summary_chars_per_message
+
+        # Verbatim turns: (user_text, assistant_text, tokens)
+        self.recent_turns: Deque[Tuple[str, str, int]] = deque()
+        self.recent_tokens = 0
+
+        # Rolling summary: one condensed line per folded turn
+        self.summary_lines: Deque[Tuple[str, int]] = deque()
+        self.summary_tokens = 0
+
+        # Bookkeeping for savings reports
+        self.total_turns = 0
+        self.full_history_tokens = 0  # What resending the entire history would cost
+        self.folded_turns = 0
+        self.dropped_turns = 0
+        self.last_turn_stats: Dict[str, int] = {}
+
+        # Guardrail name -> normalized user messages it passed (see guardrails.use_guardrail_memory).
+        # Not serialized: it resets when the session is spilled to disk and reloaded, so the
+        # next turn's keyword guardrails scan the whole conversation once (against the phrase
+        # lists of the process reloading it) and start remembering again
+        self.guardrail_memory: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return self.total_turns
+
+    def __bool__(self) -> bool:
+        return self.total_turns > 0
+
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """Verbatim messages currently kept in the history."""
+        messages = []
+        for user_text, assistant_text, _ in self.recent_turns:
+            messages.append({"role": "user", "content": user_text})
+            messages.append({"role": "assistant", "content": assistant_text})
+        return messages
+
+    @property
+    def summary(self) -> str:
+        """Current rolling summary text (empty if nothing has been folded yet)."""
+        if not self.summary_lines:
+            return ""
+        return "\n".join([self.SUMMARY_HEADER] + [line for line, _ in self.summary_lines])
+
+    @property
+    def history_tokens(self) -> int:
+        """Estimated tokens of the history that would be sent with the next turn."""
+        return self.recent_tokens + self.summary_tokens
+
+    def add_turn(self, user_input: str, assistant_output: Any):
+        """Record a completed turn and fold older turns if the budget is exceeded."""
+        assistant_text = _output_to_text(assistant_output)
+        tokens = estimate_tokens(user_input) + estimate_tokens(assistant_text)
+
+        self.recent_turns.append((user_input, assistant_text, tokens))
+        self.recent_tokens += tokens
+        self.total_turns += 1
+        self.full_history_tokens += tokens
+
+        while (self.history_tokens > self.token_budget
+               and len(self.recent_turns) > self.min_recent_turns):
+            self._fold_oldest_turn()
+
+    def _fold_oldest_turn(self):
+        """Move the oldest verbatim turn into the rolling summary (or drop it, see class docstring)."""
+        user_text, assistant_text, tokens = self.recent_turns.popleft()
+        self.recent_tokens -= tokens
+
+        line = (
+            f"- User: {_condense(user_text, self.summary_chars_per_message)} "
+            f"| Assistant: {_condense(assistant_text, self.summary_chars_per_message)}"
+        )
+        line_tokens = estimate_tokens(line)
+        if line_tokens >= tokens:
+            # Summarizing would not save anything; the turn ages out like an old summary line
+            self.dropped_turns += 1
+            return
+
+        self.folded_turns += 1
+        self.summary_lines.append((line, line_tokens))
+        self.summary_tokens += line_tokens
+
+        # Oldest summary lines age out once the summary itself exceeds its budget
+        while self.summary_tokens > self.summary_token_budget and len(self.summary_lines) > 1:
+            _, dropped_tokens = self.summary_lines.popleft()
+            self.summary_tokens -= dropped_tokens
+
+    def build_input(self, user_input: str) -> Union[str, List[Dict[str, str]]]:
+        """
+        Build the agent input for a new turn.
+        Returns the bare user input when there is no history yet, otherwise an input
+        list of [summary] + recent verbatim turns + the new user message.
+        """
+        user_tokens = estimate_tokens(user_input)
+        self.last_turn_stats = {
+            "full_tokens": self.full_history_tokens + user_tokens,
+            "sent_tokens": self.history_tokens + user_tokens,
+            "saved_tokens": max(0, self.full_history_tokens - self.history_tokens),
+            "verbatim_turns": len(self.recent_turns),
+            "folded_turns": self.folded_turns,
+            "dropped_turns": self.dropped_turns
+        }
+
+        if not self:
+            return user_input
+
+        input_list: List[Dict[str, str]] = []
+        if self.summary_lines:
+            input_list.append({"role": "system", "content": self.summary})
+        input_list.extend(self.messages)
+        input_list.append({"role": "user", "content": user_input})
+        return input_list
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the history (settings, verbatim turns and summary) to plain data; the guardrail memory is left out."""
+        return {
+            "token_budget": self.token_budget,
+            "min_recent_turns": self.min_recent_turns,
+            "summary_token_budget": self.summary_token_budget,
+            "summary_chars_per_message": self.summary_chars_per_message,
+            "recent_turns": [list(turn) for turn in self.recent_turns],
+            "summary_lines": [list(line) for line in self.summary_lines],
+            "total_turns": self.total_turns,
+            "full_history_tokens": self.full_history_tokens,
+            "folded_turns": self.folded_turns,
+            "dropped_turns": self.dropped_turns
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationHistory":
+        """Restore a history previously serialized with to_dict()."""
+        history = cls(
+            token_budget=data["token_budget"],
+            min_recent_turns=data["min_recent_turns"],
+            summary_token_budget=data["summary_token_budget"],
+            summary_chars_per_message=data["summary_chars_per_message"]
+        )
+        history.recent_turns = deque(tuple(turn) for turn in data["recent_turns"])
+        history.recent_tokens = sum(turn[2] for turn in history.recent_turns)
+        history.summary_lines = deque(tuple(line) for line in data["summary_lines"])
+        history.summary_tokens = sum(line[1] for line in history.summary_lines)
+        history.total_turns = data["total_turns"]
+        history.full_history_tokens = data["full_history_tokens"]
+        history.folded_turns = data["folded_turns"]
+        history.dropped_turns = data.get("dropped_turns", 0)
+        return history
+
+    def clear(self):
+        """Drop all history, including the summary."""
+        self.recent_turns.clear()
+        self.summary_lines.clear()
+        self.recent_tokens = 0
+        self.summary_tokens = 0
+        self.total_turns = 0
+        self.full_history_tokens = 0
+        self.folded_turns = 0
+        self.dropped_turns = 0
+        self.last_turn_stats = {}
+        self.guardrail_memory = {}
@@ -3,10 +3,13 @@ Hooks for monitoring and controlling agent execution.
 This module demonstrates RunHooks and AgentHooks for workflow monitoring and dynamic context injection.
 """
 
+import asyncio
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from agents.lifecycle import RunHooks, AgentHooks
+from agents.logger import logger
 from models import UserContext
+from tool_cache import is_duplicate_tool_call
 
 
 # ============================================================================
@@ -206,6 +209,7 @@ class MetricsCollectionHooks(RunHooks):
             "agents": [],
             "handoffs": [],
             "tools_used": [],
+            "duplicate_tool_calls": [],
             "errors": []
         }
     
@@ -252,12 +256,18 @@ class MetricsCollectionHooks(RunHooks):
         })
     
     async def on_tool_end(self, context, agent, tool, result):
-        """Track tool usage."""
+        """Track tool usage (and repeated calls answered from the run's memo)."""
         self.metrics["tools_used"].append({
             "agent": agent.name,
             "tool": tool.name,
             "timestamp": time.time()
         })
+        if is_duplicate_tool_call(context):
+            self.metrics["duplicate_tool_calls"].append({
+                "agent": agent.name,
+                "tool": tool.name,
+                "timestamp": time.time()
+            })
     
     async def on_error(self, context, error):
         """Track errors."""
@@ -272,3 +282,181 @@ class MetricsCollectionHooks(RunHooks):
         return self.metrics.copy()
 
 
+
+
+# ============================================================================
+# Tool Fan-out Timing
+# ============================================================================
+
+class ToolFanOutHooks(RunHooks):
+    """
+    Times the tool calls of each model turn in one run.
+    
+    Tool calls from one model response run concurrently, so a turn's tool latency
+    (wall) should track its slowest tool rather than the sum of all of them (serial).
+    Each turn that called tools is appended to `turns` (pass a shared deque to
+    aggregate across runs) as:
+    
+    - agent, tools (names in call order)
+    - wall: first tool start → last tool end, in seconds
+    - serial: sum of the individual tool durations
+    - slowest: longest single tool duration
+    - speedup: serial / wall
+    """
+    
+    def __init__(self, turns: Optional[Any] = None, enable_verbose: bool = False):
+        self.turns = turns if turns is not None else []
+        self.enable_verbose = enable_verbose
+        self._agent_name = None
+        self._calls = {}  # tool_call_id -> [tool name, start, end]
+    
+    @staticmethod
+    def _call_id(context, tool) -> str:
+        return getattr(context, "tool_call_id", None) or tool.name
+    
+    def _finish_turn(self):
+        """Record the tool calls since the last model response as one turn."""
+        calls = [call for call in self._calls.values() if call[2] is not None]
+        self._calls = {}
+        if not calls:
+            return
+        durations = [end - start for _, start, end in calls]
+        wall = max(end for _, _, end in calls) - min(start for _, start, _ in calls)
+        serial = sum(durations)
+        turn = {
+            "agent": self._agent_name,
+            "tools": [name for name, _, _ in calls],
+            "wall": wall,
+            "serial": serial,
+            "slowest": max(durations),
+            "speedup": serial / wall if wall > 0 else 1.0
+        }
+        self.turns.append(turn)
+        if self.enable_verbose:
+            print(f"[FANOUT] {turn['agent']}: {len(calls)} tool(s) in {wall * 1000:.1f} ms "
+                  f"(serial {serial * 1000:.1f} ms, {turn['speedup']:.1f}x)")
+    
+    async def on_llm_start(self, context, agent, system_prompt, input_items):
+        self._finish_turn()
+        self._agent_name = agent.name
+    
+    async def on_agent_end(self, context, agent, output):
+        self._finish_turn()
+    
+    async def on_tool_start(self, context, agent, tool):
+        self._calls[self._call_id(context, tool)] = [tool.name, time.perf_counter(), None]
+    
+    async def on_tool_end(self, context, agent, tool, result):
+        call = self._calls.get(self._call_id(context, tool))
+        if call is not None:
+            call[2] = time.perf_counter()
+
+
+def summarize_tool_fanout(turns) -> Dict[str, Any]:
+    """Aggregate ToolFanOutHooks turns: tool calls, wall vs serial time, and overall speedup."""
+    turns = list(turns)
+    wall = sum(turn["wall"] for turn in turns)
+    serial = sum(turn["serial"] for turn in turns)
+    return {
+        "turns": len(turns),
+        "parallel_turns": sum(1 for turn in turns if len(turn["tools"]) > 1),
+        "tool_calls": sum(len(turn["tools"]) for turn in turns),
+        "wall_seconds": wall,
+        "serial_seconds": serial,
+        "speedup": serial / wall if wall > 0 else 1.0
+    }
+
+
+# ============================================================================
+# Composite Hooks (Fan-out to multiple RunHooks)
+# ============================================================================
+
+class CompositeRunHooks(RunHooks):
+    """
+    RunHooks that dispatches every lifecycle event to any number of child hooks.
+    
+    - Children handling the same event run concurrently; a child that exceeds
+      child_timeout is cancelled so it cannot hold up the run or the other children
+    - A failing child is recorded in `errors` and logged (agents SDK logger), and never
+      breaks the run
+    - Children that are None or have `enabled = False` are dropped up front, and
+      children that don't override an event are skipped for it, so an event with
+      no interested children costs a single dict lookup
+    """
+    
+    EVENTS = (
+        "on_llm_start",
+        "on_llm_end",
+        "on_agent_start",
+        "on_agent_end",
+        "on_handoff",
+        "on_tool_start",
+        "on_tool_end",
+    )
+    
+    def __init__(self, *children: Optional[RunHooks], child_timeout: Optional[float] = 5.0):
+        self.children = [
+            child for child in children
+            if child is not None and getattr(child, "enabled", True)
+        ]
+        self.child_timeout = child_timeout
+        self.errors = []
+        
+        # Pre-resolve bound handlers per event, skipping inherited no-op implementations
+        self._handlers = {
+            event: [
+                getattr(child, event) for child in self.children
+                if getattr(type(child), event, None) is not getattr(RunHooks, event)
+            ]
+            for event in self.EVENTS
+        }
+    
+    async def _run_child(self, event: str, handler, *args):
+        try:
+            if self.child_timeout is None:
+                await handler(*args)
+            else:
+                await asyncio.wait_for(handler(*args), timeout=self.child_timeout)
+        except Exception as e:
+            hook_name = type(handler.__self__).__name__
+            self.errors.append({
+                "hook": hook_name,
+                "event": event,
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                "timestamp": time.time()
+            })
+            if isinstance(e, asyncio.TimeoutError):
+                logger.warning("Hook %s.%s timed out after %ss", hook_name, event, self.child_timeout)
+            else:
+                logger.error("Hook %s.%s failed: %s", hook_name, event, e, exc_info=e)
+    
+    async def _dispatch(self, event: str, *args):
+        handlers = self._handlers[event]
+        if not handlers:
+            return
+        if len(handlers) == 1:
+            await self._run_child(event, handlers[0], *args)
+            return
+        await asyncio.gather(*(self._run_child(event, handler, *args) for handler in handlers))
+    
+    async def on_llm_start(self, context, agent, system_prompt, input_items):
+        await self._dispatch("on_llm_start", context, agent, system_prompt, input_items)
+    
+    async def on_llm_end(self, context, agent, response):
+        await self._dispatch("on_llm_end", context, agent, response)
+    
+    async def on_agent_start(self, context, agent):
+        await self._dispatch("on_agent_start", context, agent)
+    
+    async def on_agent_end(self, context, agent, output):
+        await self._dispatch("on_agent_end", context, agent, output)
+    
+    async def on_handoff(self, context, from_agent, to_agent):
+        await self._dispatch("on_handoff", context, from_agent, to_agent)
+    
+    async def on_tool_start(self, context, agent, tool):
+        await self._dispatch("on_tool_start", context, agent, tool)
+    
+    async def on_tool_end(self, context, agent, tool, result):
+        await self._dispatch("on_tool_end", context, agent, tool, result)
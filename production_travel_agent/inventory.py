@@ -0,0 +1,498 @@
+"""
+In-memory hotel inventory engine for the booking tools.
+This module stores nightly room counts and prices for every hotel in compact hotel x night
+NumPy arrays, indexes hotels by destination, answers availability for any stay with
+vectorized range-minimum checks, and reserves rooms atomically across concurrent bookings.
+
+Requires NumPy (pip install numpy).
+"""
+
+import json
+import os
+import threading
+import uuid
+import zlib
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pricing import PRICING, normalize_destination
+
+
+INVENTORY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hotels.json")
+
+ROOMS_DTYPE = np.int16   # Rooms left per hotel per night
+PRICE_DTYPE = np.int32   # Nightly price per hotel in cents (exact totals, half the size of float64)
+
+DateLike = Union[date, str]  # A date, or a YYYY-MM-DD string
+
+
+def as_date(value: DateLike) -> date:
+    """A date from a date or a YYYY-MM-DD string."""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class Reservation(NamedTuple):
+    """Rooms held at one hotel for nights [start_night, end_night) of the calendar."""
+    reservation_id: str
+    hotel_id: int
+    hotel_name: str
+    check_in: str   # YYYY-MM-DD
+    check_out: str
+    start_night: int
+    end_night: int
+    rooms: int
+    total_price: float  # Sum of the nightly prices for one room, in USD
+
+    @property
+    def nights(self) -> int:
+        return self.end_night - self.start_night
+
+
+class HotelInventory:
+    """
+    Nightly room and price calendar for a fixed set of hotels.
+
+    - rooms[h, n] / prices[h, n]: rooms left and price (cents) of hotel h on night n,
+      where night 0 is start_date
+    - Hotels are indexed by normalized city and by the city's pricing region
+      ("Tokyo" and "Japan" both find Tokyo's hotels)
+    - Availability reads a stay's nights as one slice per query and takes the minimum
+      over it, for all of a destination's hotels at once
+    - Reservations check and decrement a stay's nights under the hotel's lock stripe,
+      so concurrent bookings can never oversell a night
+    - With hotel_data (the data an inventory is built from), a destination without hotels
+      is stocked from the hotel templates the first time it is searched
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        cities: Sequence[str],
+        ratings: Sequence[float],
+        amenities: Sequence[Sequence[str]],
+        rooms: np.ndarray,
+        prices: np.ndarray,
+        start_date: date,
+        room_type_multipliers: Optional[Mapping[str, float]] = None,
+        hotel_data: Optional[Mapping[str, Any]] = None
+    ):
+        self.rooms = np.ascontiguousarray(rooms, dtype=ROOMS_DTYPE)
+        self.prices = np.ascontiguousarray(prices, dtype=PRICE_DTYPE)
+        if self.rooms.ndim != 2 or self.rooms.shape != self.prices.shape:
+            raise ValueError("rooms and prices must be hotel x night arrays of the same shape")
+        hotel_count, self.nights = self.rooms.shape
+        if not len(names) == len(cities) == len(ratings) == len(amenities) == hotel_count:
+            raise ValueError("Hotel attributes must have one entry per row of rooms/prices")
+
+        self.start_date = start_date
+        self.names: List[str] = list(names)
+        self.cities: List[str] = list(cities)
+        self.ratings = np.asarray(ratings, dtype=np.float32)
+        self.amenities: List[Tuple[str, ...]] = [tuple(items) for items in amenities]
+        self.room_type_multipliers: Dict[str, float] = dict(room_type_multipliers or {"standard": 1.0})
+        self.hotel_data = hotel_data
+
+        self._by_name = {normalize_destination(name): hotel for hotel, name in enumerate(self.names)}
+        if len(self._by_name) != hotel_count:
+            raise ValueError("Hotel names must be unique")
+        self._by_destination = self._build_destination_index(self.cities)
+
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._reservations: Dict[str, Reservation] = {}
+        self._reservations_lock = threading.Lock()
+        self._stock_lock = threading.Lock()
+
+    @staticmethod
+    def _build_destination_index(cities: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Map normalized city and pricing-region names to sorted arrays of hotel ids."""
+        unique_cities, codes = np.unique(np.asarray(cities, dtype=object), return_inverse=True)
+        order = np.argsort(codes, kind="stable").astype(np.int32)
+        groups = np.split(order, np.cumsum(np.bincount(codes, minlength=len(unique_cities)))[:-1])
+
+        members: Dict[str, List[np.ndarray]] = {}
+        for city, hotels in zip(unique_cities, groups):
+            members.setdefault(normalize_destination(city), []).append(hotels)
+            region = PRICING.resolve(city)
+            if region != PRICING.default.key and region != normalize_destination(city):
+                members.setdefault(region, []).append(hotels)
+        return {key: np.sort(np.concatenate(parts)) for key, parts in members.items()}
+
+    @classmethod
+    def from_file(cls, path: str = INVENTORY_DATA_PATH, start_date: Optional[date] = None) -> "HotelInventory":
+        with open(path, "r", encoding="utf-8") as f:
+            return build_inventory(json.load(f), start_date)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the nightly calendars."""
+        return self.rooms.nbytes + self.prices.nbytes
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def hotels_in(self, destination: str) -> np.ndarray:
+        """Ids of the hotels at a destination (city, region, or "City, Country")."""
+        normalized = normalize_destination(destination)
+        hotels = self._by_destination.get(normalized)
+        if hotels is None and "," in normalized:
+            hotels = next(
+                (match for match in map(self._by_destination.get, normalized.split(", ")) if match is not None),
+                None
+            )
+        if hotels is None:
+            hotels = self._by_destination.get(PRICING.resolve(destination))
+        return hotels if hotels is not None else np.empty(0, dtype=np.int32)
+
+    def stocked_hotels_in(self, destination: str) -> np.ndarray:
+        """
+        Ids of the hotels at a destination, first stocking it from the hotel templates if it
+        has none and the inventory has hotel_data. The new hotels' prices are jittered with a
+        seed derived from the city, so a destination is stocked the same way in every process.
+        """
+        hotels = self.hotels_in(destination)
+        city = destination.split(",")[0].strip().title()
+        if len(hotels) or self.hotel_data is None or not normalize_destination(city):
+            return hotels
+        with self._stock_lock:
+            hotels = self.hotels_in(destination)  # Stocked by another thread meanwhile
+            if not len(hotels):
+                seed = [self.hotel_data.get("seed", 0), zlib.crc32(normalize_destination(city).encode("utf-8"))]
+                self.add_hotels(*hotel_rows(
+                    self.hotel_data, [city], self.start_date, self.nights, np.random.default_rng(seed)
+                ))
+                hotels = self.hotels_in(destination)
+        return hotels
+
+    def hotel_id(self, hotel_name: str) -> Optional[int]:
+        """Id of a hotel by (case- and punctuation-insensitive) name."""
+        return self._by_name.get(normalize_destination(hotel_name))
+
+    def night_range(self, check_in: DateLike, check_out: DateLike) -> Tuple[int, int]:
+        """Calendar nights [start, end) of a stay (dates, or YYYY-MM-DD strings)."""
+        start = (as_date(check_in) - self.start_date).days
+        end = (as_date(check_out) - self.start_date).days
+        if end <= start:
+            raise ValueError("Check-out must be after check-in")
+        if start < 0 or end > self.nights:
+            last = self.start_date + timedelta(days=self.nights)
+            raise ValueError(
+                f"Dates must fall between {self.start_date.isoformat()} and {last.isoformat()}"
+            )
+        return start, end
+
+    def room_type_multiplier(self, room_type: str) -> float:
+        """Price multiplier for a room type (1.0 if unknown)."""
+        return self.room_type_multipliers.get(room_type.lower(), 1.0)
+
+    # ------------------------------------------------------------------------
+    # Availability
+    # ------------------------------------------------------------------------
+
+    def availability(
+        self,
+        destination: str,
+        check_in: DateLike,
+        check_out: DateLike,
+        guests: int = 1,
+        rooms: int = 1,
+        limit: Optional[int] = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Hotels at a destination with at least `rooms` rooms left on every night of the stay,
+        cheapest first (at most `limit`). Prices are per guest, as in the booking tool.
+        """
+        start, end = self.night_range(check_in, check_out)
+        hotels = self.stocked_hotels_in(destination)
+        if not len(hotels):
+            return []
+
+        # Range minimum over the stay for every candidate hotel in one pass
+        min_rooms = self.rooms[hotels, start:end].min(axis=1)
+        open_hotels = min_rooms >= rooms
+        hotels, min_rooms = hotels[open_hotels], min_rooms[open_hotels]
+        totals = self.prices[hotels, start:end].sum(axis=1, dtype=np.int64)
+
+        order = np.argsort(totals, kind="stable")[:limit]  # Ties keep hotel id order
+
+        nights = end - start
+        return [
+            {
+                "name": self.names[hotel],
+                "rating": float(self.ratings[hotel]),
+                "price_per_night": round(int(total) / nights / 100, 2),
+                "available_rooms": int(available),
+                "amenities": list(self.amenities[hotel]),
+                "total_cost": round(int(total) * guests / 100, 2),
+                "nights": nights
+            }
+            for hotel, available, total in zip(hotels[order].tolist(), min_rooms[order], totals[order])
+        ]
+
+    def cheapest_windows(
+        self,
+        destination: str,
+        earliest_check_in: DateLike,
+        latest_check_out: DateLike,
+        nights: int,
+        guests: int = 1,
+        rooms: int = 1,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        The top_k cheapest stays of `nights` nights at a destination, across every check-in
+        date between earliest_check_in and latest_check_out - nights and every hotel with
+        `rooms` rooms left each night. Cheapest first; ties go to the earlier check-in.
+
+        Window totals are sliding-window sums over each hotel's nightly prices (a cumulative
+        sum differenced `nights` apart); a window is open when the sliding count of
+        sold-out nights in it is zero.
+        """
+        if nights < 1:
+            raise ValueError("A stay must be at least one night")
+        first, last = self.night_range(earliest_check_in, latest_check_out)
+        if last - first < nights:
+            raise ValueError(f"The date range is shorter than {nights} nights")
+        hotels = self.stocked_hotels_in(destination)
+        if not len(hotels) or top_k < 1:
+            return []
+
+        def window_sums(values: np.ndarray) -> np.ndarray:
+            cumulative = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int64)
+            np.cumsum(values, axis=1, out=cumulative[:, 1:])
+            return cumulative[:, nights:] - cumulative[:, :-nights]
+
+        totals = window_sums(self.prices[hotels, first:last])          # hotel x check-in night
+        sold_out = window_sums(self.rooms[hotels, first:last] < rooms)
+        totals[sold_out > 0] = np.iinfo(np.int64).max
+        open_windows = int((sold_out == 0).sum())
+        if not open_windows:
+            return []
+
+        # Candidates: every window up to the k-th cheapest total (ties included), then
+        # ordered by total, check-in, hotel
+        flat = totals.T.ravel()  # Check-in major, so a stable sort breaks ties by date then hotel
+        k = min(top_k, open_windows)
+        threshold = np.partition(flat, k - 1)[k - 1]
+        candidates = np.flatnonzero(flat <= threshold)
+        best = candidates[np.argsort(flat[candidates], kind="stable")][:k]
+        starts, rows = np.divmod(best, len(hotels))
+
+        results = []
+        for start, row in zip(starts.tolist(), rows.tolist()):
+            hotel = int(hotels[row])
+            total = int(totals[row, start])
+            check_in = self.start_date + timedelta(days=first + start)
+            results.append({
+                "name": self.names[hotel],
+                "rating": float(self.ratings[hotel]),
+                "check_in": check_in.isoformat(),
+                "check_out": (check_in + timedelta(days=nights)).isoformat(),
+                "nights": nights,
+                "price_per_night": round(total / nights / 100, 2),
+                "available_rooms": int(self.rooms[hotel, first + start:first + start + nights].min()),
+                "amenities": list(self.amenities[hotel]),
+                "total_cost": round(total * guests / 100, 2)
+            })
+        return results
+
+    # ------------------------------------------------------------------------
+    # Adding Hotels
+    # ------------------------------------------------------------------------
+
+    def add_hotels(
+        self,
+        names: Sequence[str],
+        cities: Sequence[str],
+        ratings: Sequence[float],
+        amenities: Sequence[Sequence[str]],
+        rooms: np.ndarray,
+        prices: np.ndarray
+    ) -> np.ndarray:
+        """
+        Append hotels with calendars over the same nights and return their ids. The arrays
+        are replaced with every lock stripe held, so no concurrent reservation is lost.
+        """
+        rooms = np.asarray(rooms, dtype=ROOMS_DTYPE)
+        prices = np.asarray(prices, dtype=PRICE_DTYPE)
+        if rooms.ndim != 2 or rooms.shape != prices.shape or rooms.shape[1] != self.nights:
+            raise ValueError("rooms and prices must be hotel x night arrays over the inventory's nights")
+        if not len(names) == len(cities) == len(ratings) == len(amenities) == rooms.shape[0]:
+            raise ValueError("Hotel attributes must have one entry per row of rooms/prices")
+
+        first = len(self)
+        by_name = dict(self._by_name)
+        for hotel, name in enumerate(names, start=first):
+            key = normalize_destination(name)
+            if key in by_name:
+                raise ValueError("Hotel names must be unique")
+            by_name[key] = hotel
+        cities = self.cities + list(cities)
+        by_destination = self._build_destination_index(cities)
+
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self.rooms = np.concatenate([self.rooms, rooms])
+            self.prices = np.concatenate([self.prices, prices])
+            self.ratings = np.concatenate([self.ratings, np.asarray(ratings, dtype=np.float32)])
+            self.amenities = self.amenities + [tuple(items) for items in amenities]
+            self.cities = cities
+            self.names = self.names + list(names)
+            self._by_name = by_name
+            self._by_destination = by_destination
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+        return np.arange(first, len(self), dtype=np.int32)
+
+    # ------------------------------------------------------------------------
+    # Reservations
+    # ------------------------------------------------------------------------
+
+    def reserve(self, hotel_name: str, check_in: DateLike, check_out: DateLike, rooms: int = 1) -> Optional[Reservation]:
+        """
+        Atomically hold `rooms` rooms at a hotel for every night of a stay.
+        Returns None if any night has fewer rooms left; raises ValueError for an
+        unknown hotel or invalid dates.
+        """
+        hotel = self.hotel_id(hotel_name)
+        if hotel is None:
+            raise ValueError(f"Unknown hotel '{hotel_name}'")
+        if rooms < 1:
+            raise ValueError("At least one room must be reserved")
+        start, end = self.night_range(check_in, check_out)
+
+        with self._locks[hotel % self.LOCK_STRIPES]:
+            nights = self.rooms[hotel, start:end]  # View: decremented in place
+            if nights.min() < rooms:
+                return None
+            nights -= rooms
+
+        reservation = Reservation(
+            reservation_id=f"HTL-{uuid.uuid4().hex[:8].upper()}",
+            hotel_id=hotel,
+            hotel_name=self.names[hotel],
+            check_in=as_date(check_in).isoformat(),
+            check_out=as_date(check_out).isoformat(),
+            start_night=start,
+            end_night=end,
+            rooms=rooms,
+            total_price=int(self.prices[hotel, start:end].sum(dtype=np.int64)) / 100
+        )
+        with self._reservations_lock:
+            self._reservations[reservation.reservation_id] = reservation
+        return reservation
+
+    def cancel(self, reservation_id: str) -> bool:
+        """Release a reservation's rooms. Returns False if it does not exist."""
+        with self._reservations_lock:
+            reservation = self._reservations.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        with self._locks[reservation.hotel_id % self.LOCK_STRIPES]:
+            self.rooms[reservation.hotel_id, reservation.start_night:reservation.end_night] += reservation.rooms
+        return True
+
+    def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
+        with self._reservations_lock:
+            return self._reservations.get(reservation_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._reservations_lock:
+            reservations = len(self._reservations)
+        return {
+            "hotels": len(self),
+            "nights": self.nights,
+            "destinations": len(self._by_destination),
+            "reservations": reservations,
+            "calendar_mb": round(self.nbytes / 1e6, 1)
+        }
+
+
+# ============================================================================
+# Building Inventories
+# ============================================================================
+
+def nightly_price_multipliers(data: Mapping[str, Any], start_date: date, nights: int) -> np.ndarray:
+    """Seasonal x weekend price multiplier for each calendar night."""
+    seasonal = data.get("seasonal_multipliers", {})
+    weekend = data.get("weekend_multiplier", 1.0)
+    multipliers = np.empty(nights, dtype=np.float64)
+    for night in range(nights):
+        day = start_date + timedelta(days=night)
+        multipliers[night] = seasonal.get(str(day.month), 1.0) * (weekend if day.weekday() >= 4 else 1.0)
+    return multipliers
+
+
+def hotel_rows(
+    data: Mapping[str, Any],
+    cities: Sequence[str],
+    start_date: date,
+    nights: int,
+    rng: np.random.Generator
+) -> Tuple[List[str], List[str], List[float], List[Any], np.ndarray, np.ndarray]:
+    """
+    Hotel attributes and nightly calendars (rooms, prices in cents) from instantiating every
+    template in hotel_templates for every city. Prices vary by season, weekday and rng jitter.
+    """
+    templates = data["hotel_templates"]
+    names, hotel_cities, ratings, amenities, base_prices, base_rooms = [], [], [], [], [], []
+    for city in cities:
+        for template in templates:
+            names.append(template["name"].format(city=city))
+            hotel_cities.append(city)
+            ratings.append(template["rating"])
+            amenities.append(template["amenities"])
+            base_prices.append(template["price_per_night"])
+            base_rooms.append(template["rooms"])
+
+    jitter = data.get("daily_price_jitter", 0.0)
+    prices = (
+        np.asarray(base_prices, dtype=np.float64)[:, None]
+        * nightly_price_multipliers(data, start_date, nights)[None, :]
+        * rng.uniform(1.0 - jitter, 1.0 + jitter, size=(len(names), nights))
+    )
+    rooms = np.repeat(np.asarray(base_rooms, dtype=ROOMS_DTYPE)[:, None], nights, axis=1)
+    return names, hotel_cities, ratings, amenities, rooms, np.rint(prices * 100)
+
+
+def build_inventory(data: Mapping[str, Any], start_date: Optional[date] = None) -> HotelInventory:
+    """
+    Build an inventory from hotel data: every template in hotel_templates is instantiated
+    for every city, over a calendar of calendar_nights nights starting at start_date (today
+    by default). Other destinations are stocked from the same templates when first searched.
+    """
+    start_date = start_date or date.today()
+    nights = data.get("calendar_nights", 365)
+    rows = hotel_rows(data, data["cities"], start_date, nights, np.random.default_rng(data.get("seed", 0)))
+    return HotelInventory(*rows, start_date, data.get("room_type_multipliers"), hotel_data=data)
+
+
+_inventory: Optional[HotelInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> HotelInventory:
+    """Get the process-wide inventory (built from data/hotels.json on first use)."""
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                _inventory = HotelInventory.from_file()
+    return _inventory
+
+
+def configure_inventory(inventory: HotelInventory) -> HotelInventory:
+    """Replace the process-wide inventory (e.g. with a larger or preloaded one)."""
+    global _inventory
+    with _inventory_lock:
+        _inventory = inventory
+    return _inventory
@@ -23,8 +23,10 @@ import asyncio
 import json
 import sys
 import os
+import time
+from collections import deque
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Load environment variables from .env file
 try:
@@ -33,17 +35,39 @@ try:
 except ImportError:
     pass  # python-dotenv not installed, will rely on environment variables
 
-from agents import Agent, Runner, InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered
+from agents import Agent, Runner, RunConfig, InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered
+from openai.types.responses import ResponseTextDeltaEvent
 
 try:
     from .models import UserContext
     from .travel_agents import create_agent_system
-    from .hooks import GlobalMonitoringHooks, MetricsCollectionHooks
+    from .hooks import (
+        GlobalMonitoringHooks, MetricsCollectionHooks, CompositeRunHooks, ToolFanOutHooks, summarize_tool_fanout
+    )
+    from .history import ConversationHistory
+    from .session_store import SessionStore
+    from .response_cache import ResponseCache, request_key
+    from .singleflight import SingleFlight
+    from .tool_cache import get_tool_cache_stats, get_run_memo_stats
+    from .tool_execution import configure_tool_executor
+    from .guardrails import StreamingOutputGuard, get_guardrail_cascade_stats, use_guardrail_memory
+    from .guardrail_cascade import use_guardrail_run_config
+    from .verdict_cache import configure_verdict_cache, get_verdict_cache
 except ImportError:
     from models import UserContext
     from travel_agents import create_agent_system
-    from hooks import GlobalMonitoringHooks, MetricsCollectionHooks
-# Note: Guardrails are applied via decorators on agents when configured
+    from hooks import (
+        GlobalMonitoringHooks, MetricsCollectionHooks, CompositeRunHooks, ToolFanOutHooks, summarize_tool_fanout
+    )
+    from history import ConversationHistory
+    from session_store import SessionStore
+    from response_cache import ResponseCache, request_key
+    from singleflight import SingleFlight
+    from tool_cache import get_tool_cache_stats, get_run_memo_stats
+    from tool_execution import configure_tool_executor
+    from guardrails import StreamingOutputGuard, get_guardrail_cascade_stats, use_guardrail_memory
+    from guardrail_cascade import use_guardrail_run_config
+    from verdict_cache import configure_verdict_cache, get_verdict_cache
 
 
 # ============================================================================
@@ -53,9 +77,39 @@ except ImportError:
 class Config:
     """Application configuration."""
     ENABLE_HOOKS = True
-    ENABLE_GUARDRAILS = True
+    ENABLE_GUARDRAILS = False        # Guardrail cascades on the entry and final-output agents
     ENABLE_METRICS = True
     VERBOSE_OUTPUT = True
+    BATCH_CONCURRENCY = 8
+    STREAM_RESPONSES = False         # Interactive mode: render responses as they stream
+    HISTORY_TOKEN_BUDGET = 3000      # Estimated tokens of history resent per turn
+    HISTORY_MIN_RECENT_TURNS = 2     # Turns always kept verbatim
+    SESSION_DB_PATH = "sessions.db"  # Where cold sessions are spilled
+    MAX_SESSIONS_IN_MEMORY = 1000    # LRU limit for hot sessions
+    DEFAULT_SESSION_ID = "default"
+    ENABLE_RESPONSE_CACHE = False    # Reuse final outputs for repeated stateless requests
+    RESPONSE_CACHE_TTL = 3600        # Seconds a cached response stays valid
+    RESPONSE_CACHE_MAX_ENTRIES = 1000
+    ENABLE_REQUEST_COALESCING = True
+    COALESCED_AGENTS = ("safety_expert", "researcher")  # Agents that take no user context
+    TOOL_THREAD_POOL_SIZE = 16       # Worker threads shared by all synchronous tool calls
+    GUARDRAIL_VERDICT_TTL = 3600     # Seconds a cached LLM guardrail verdict stays valid
+    GUARDRAIL_VERDICT_MAX_ENTRIES = 10000
+    # Shared verdict file for all worker processes on the host (memory-only when unset)
+    GUARDRAIL_VERDICT_DB_PATH = os.getenv("GUARDRAIL_VERDICT_DB")
+
+
+def configure_runtime(config: Config):
+    """
+    Set up the process-wide resources shared by every TravelAgentSystem (tool thread pool,
+    guardrail verdict cache); call once at startup.
+    """
+    configure_tool_executor(max_workers=config.TOOL_THREAD_POOL_SIZE)
+    configure_verdict_cache(
+        ttl=config.GUARDRAIL_VERDICT_TTL,
+        max_entries=config.GUARDRAIL_VERDICT_MAX_ENTRIES,
+        db_path=config.GUARDRAIL_VERDICT_DB_PATH
+    )
 
 
 # ============================================================================
@@ -67,11 +121,48 @@ class TravelAgentSystem:
     Main application class that orchestrates the comprehensive travel agent system.
     """
     
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, run_config: Optional[RunConfig] = None):
         self.config = config or Config()
-        self.agents = create_agent_system(enable_hooks=self.config.ENABLE_HOOKS)
-        self.conversation_history = []
+        self.run_config = run_config  # e.g. RunConfig(model_provider=ScriptedModelProvider()) for offline runs
+        self.agents = create_agent_system(enable_guardrails=self.config.ENABLE_GUARDRAILS)
+        self.sessions = SessionStore(
+            db_path=self.config.SESSION_DB_PATH,
+            max_in_memory=self.config.MAX_SESSIONS_IN_MEMORY,
+            history_factory=self._new_history
+        )
         self.metrics_hooks = MetricsCollectionHooks() if self.config.ENABLE_METRICS else None
+        self.turn_latencies = deque(maxlen=1000)  # Streaming turn latencies (most recent)
+        self.tool_fanout_turns = deque(maxlen=1000)  # Per-turn tool timings (most recent)
+        self.response_cache = ResponseCache(
+            ttl=self.config.RESPONSE_CACHE_TTL,
+            max_entries=self.config.RESPONSE_CACHE_MAX_ENTRIES
+        ) if self.config.ENABLE_RESPONSE_CACHE else None
+        self.single_flight = SingleFlight()
+    
+    def _new_history(self) -> ConversationHistory:
+        """Create an empty conversation history using the configured token budget."""
+        return ConversationHistory(
+            token_budget=self.config.HISTORY_TOKEN_BUDGET,
+            min_recent_turns=self.config.HISTORY_MIN_RECENT_TURNS
+        )
+    
+    def get_history(self, session_id: Optional[str] = None) -> ConversationHistory:
+        """Get the conversation history for a session (the default session if None)."""
+        return self.sessions.get(session_id or self.config.DEFAULT_SESSION_ID)
+    
+    async def get_history_async(self, session_id: Optional[str] = None) -> ConversationHistory:
+        """get_history for coroutines: reloading or spilling sessions runs off the event loop."""
+        return await self.sessions.get_async(session_id or self.config.DEFAULT_SESSION_ID)
+    
+    @property
+    def history(self) -> ConversationHistory:
+        """Conversation history of the default session."""
+        return self.get_history()
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """Verbatim messages currently kept in the conversation history."""
+        return self.history.messages
     
     def get_hooks(self) -> Optional[GlobalMonitoringHooks]:
         """Get global hooks for workflow monitoring."""
@@ -88,6 +179,8 @@ class TravelAgentSystem:
         print("I can help with recommendations, research, bookings, safety advice, and more.")
         print("Type 'quit' or 'exit' to end the conversation.\n")
         
+        session_id = self.config.DEFAULT_SESSION_ID
+        
         while True:
             try:
                 user_input = input("\nYou: ").strip()
@@ -99,24 +192,36 @@ class TravelAgentSystem:
                 if not user_input:
                     continue
                 
-                # Run with triage agent (routes to appropriate specialist)
-                result = await self.process_request(
-                    user_input,
-                    starting_agent=self.agents["triage"],
-                    context=None
-                )
-                
-                print(f"\nAssistant: {result.final_output}")
+                # Run with triage agent (routes to appropriate specialist);
+                # the turn is recorded in the session history
+                if self.config.STREAM_RESPONSES:
+                    print("\nAssistant: ", end="", flush=True)
+                    await self.process_request_streamed(
+                        user_input,
+                        starting_agent=self.agents["triage"],
+                        context=None,
+                        session_id=session_id
+                    )
+                    if self.config.VERBOSE_OUTPUT:
+                        latency = self.turn_latencies[-1]
+                        ttft = latency["time_to_first_token"]
+                        ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+                        print(f"[LATENCY] First token: {ttft_text}, total: {latency['total_latency']:.2f}s")
+                else:
+                    result = await self.process_request(
+                        user_input,
+                        starting_agent=self.agents["triage"],
+                        context=None,
+                        session_id=session_id
+                    )
+                    
+                    print(f"\nAssistant: {result.final_output}")
                 
-                # Store conversation history
-                self.conversation_history.append({
-                    "role": "user",
-                    "content": user_input
-                })
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": result.final_output
-                })
+                history = await self.get_history_async(session_id)
+                if self.config.VERBOSE_OUTPUT and history.last_turn_stats:
+                    stats = history.last_turn_stats
+                    print(f"[HISTORY] Sent ~{stats['sent_tokens']} tokens "
+                          f"(saved ~{stats['saved_tokens']} of {stats['full_tokens']})")
                 
             except KeyboardInterrupt:
                 print("\n\nInterrupted. Goodbye!")
@@ -127,57 +232,295 @@ class TravelAgentSystem:
                     import traceback
                     traceback.print_exc()
     
+    def _build_run_hooks(self) -> Optional[CompositeRunHooks]:
+        """Combine all enabled run hooks so each receives every lifecycle event."""
+        hooks_list = []
+        
+        # Add global monitoring hooks
+        global_hooks = self.get_hooks()
+        if global_hooks:
+            hooks_list.append(global_hooks)
+        
+        # Add metrics hooks
+        if self.metrics_hooks:
+            hooks_list.append(self.metrics_hooks)
+            # Per-run tool timings, aggregated into self.tool_fanout_turns
+            hooks_list.append(ToolFanOutHooks(
+                self.tool_fanout_turns, enable_verbose=self.config.VERBOSE_OUTPUT
+            ))
+        
+        return CompositeRunHooks(*hooks_list) if hooks_list else None
+    
+    def _build_input(self, user_input: str, history: Optional[ConversationHistory]):
+        """
+        Build input with the conversation history, if any
+        (recent turns verbatim, older turns as a rolling summary within the token budget).
+        """
+        if history:
+            return history.build_input(user_input)
+        return user_input
+    
+    def _is_coalesced(self, agent: Agent) -> bool:
+        """Whether identical concurrent requests to this agent may share one run."""
+        if not self.config.ENABLE_REQUEST_COALESCING:
+            return False
+        return any(
+            self.agents.is_built(key) and self.agents[key] is agent
+            for key in self.config.COALESCED_AGENTS
+        )
+    
+    async def _run_agent(
+        self,
+        starting_agent: Agent,
+        input_data,
+        context: Optional[UserContext],
+        user_input: str,
+        cacheable: bool
+    ):
+        """Run the agent (all enabled hooks receive every lifecycle event) and cache the result."""
+        start_time = time.perf_counter()
+        # Guardrail agents run on the same model provider as the run they check
+        with use_guardrail_run_config(self.run_config):
+            result = await Runner.run(
+                starting_agent=starting_agent,
+                input=input_data,
+                context=context,
+                hooks=self._build_run_hooks(),
+                run_config=self.run_config
+            )
+        if cacheable:
+            self.response_cache.put(
+                starting_agent, user_input, result, time.perf_counter() - start_time
+            )
+        return result
+    
     async def process_request(
         self,
         user_input: str,
         starting_agent: Agent,
         context: Optional[UserContext] = None,
-        use_history: bool = True
+        use_history: bool = True,
+        session_id: Optional[str] = None
     ):
         """
         Process a single request through the agent system.
         
+        When session_id is given, the request uses that session's history and
+        the completed turn is recorded in it; otherwise the default session's
+        history is read but not updated.
+        
         Demonstrates:
         - Request processing with hooks
         - Guardrails
         - Context injection
         - Conversation history
+        - Response caching and request coalescing for stateless requests
         """
-        hooks_list = []
-        
-        # Add global monitoring hooks
-        global_hooks = self.get_hooks()
-        if global_hooks:
-            hooks_list.append(global_hooks)
+        # With ENABLE_GUARDRAILS, the starting agent carries content_input_guardrail and it
+        # and its handoff targets sensitive_output_guardrail (see travel_agents.with_guardrails);
+        # the runner checks them and raises InputGuardrailTripwireTriggered /
+        # OutputGuardrailTripwireTriggered
+        
+        history = await self.get_history_async(session_id) if use_history else None
+        input_data = self._build_input(user_input, history)
+        
+        # Only stateless requests are cacheable or coalescable: no prior turns and no
+        # user context (which personalizes answers and is visible to tools)
+        stateless = isinstance(input_data, str) and context is None
+        cacheable = self.response_cache is not None and stateless
+        result = self.response_cache.get(starting_agent, user_input) if cacheable else None
+        
+        if result is not None:
+            if self.config.VERBOSE_OUTPUT:
+                print(f"[CACHE] Response cache hit for {starting_agent.name} "
+                      f"(saved ~{result.latency_saved:.2f}s)")
+        elif stateless and self._is_coalesced(starting_agent):
+            # Identical concurrent requests share one in-flight run
+            result, shared = await self.single_flight.do(
+                request_key(starting_agent, user_input),
+                lambda: self._run_agent(starting_agent, input_data, context, user_input, cacheable)
+            )
+            if shared and self.config.VERBOSE_OUTPUT:
+                print(f"[COALESCE] Joined in-flight run for {starting_agent.name}")
+        else:
+            with use_guardrail_memory(history.guardrail_memory if history is not None else None):
+                result = await self._run_agent(starting_agent, input_data, context, user_input, cacheable)
+        
+        # Record the turn; re-fetch the history since the session may have been
+        # spilled to disk by other requests while this one was running
+        if use_history and session_id is not None:
+            (await self.get_history_async(session_id)).add_turn(user_input, result.final_output)
         
-        # Add metrics hooks
-        if self.metrics_hooks:
-            hooks_list.append(self.metrics_hooks)
+        return result
+    
+    async def process_request_streamed(
+        self,
+        user_input: str,
+        starting_agent: Agent,
+        context: Optional[UserContext] = None,
+        use_history: bool = True,
+        session_id: Optional[str] = None
+    ):
+        """
+        Process a request with Runner.run_streamed, rendering text deltas as they arrive.
         
-        # Note: Guardrails are applied via decorators on agents when ENABLE_GUARDRAILS is True
-        # The guardrails will be automatically checked during agent execution
+        Handoffs are announced inline, and time-to-first-token and total latency
+        are recorded in self.turn_latencies for every turn.
         
-        # Build input with conversation history if enabled
-        input_data = user_input
-        if use_history and self.conversation_history:
-            # Convert conversation history to input list format
-            input_list = self.conversation_history.copy()
-            input_list.append({"role": "user", "content": user_input})
-            input_data = input_list
+        With guardrails enabled, every delta is checked for leaked sensitive content
+        before it is rendered, and the last few characters are held back until they can
+        no longer be part of a match; on a match the run is cancelled (no further tokens
+        are generated), nothing of the phrase is shown and the turn is not recorded in
+        the history.
         
-        # Run the agent
-        result = await Runner.run(
-            starting_agent=starting_agent,
-            input=input_data,
-            context=context,
-            hooks=hooks_list[0] if len(hooks_list) == 1 else None
-        )
+        Demonstrates:
+        - Streaming agent responses (ResponseTextDeltaEvent)
+        - Observing handoffs through agent_updated_stream_event
+        - Cancelling a streamed run from a guardrail
+        """
+        history = await self.get_history_async(session_id) if use_history else None
+        input_data = self._build_input(user_input, history)
+        
+        start_time = time.perf_counter()
+        first_token_time = None
+        current_agent = starting_agent.name
+        output_guard = StreamingOutputGuard() if self.config.ENABLE_GUARDRAILS else None
+        
+        # The streamed run's task copies the context (the guardrail memory and run config) when it starts
+        with use_guardrail_memory(history.guardrail_memory if history is not None else None), \
+                use_guardrail_run_config(self.run_config):
+            result = Runner.run_streamed(
+                starting_agent=starting_agent,
+                input=input_data,
+                context=context,
+                hooks=self._build_run_hooks(),
+                run_config=self.run_config
+            )
         
-        # Output guardrails are applied via decorators on agents
-        # They will automatically be checked during agent execution
+        async for event in result.stream_events():
+            if output_guard and output_guard.tripped:
+                continue  # Drain the events left after cancelling
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                if first_token_time is None:
+                    first_token_time = time.perf_counter()
+                text = event.data.delta
+                if output_guard:
+                    if output_guard.feed(text):
+                        result.cancel()
+                        print(f"\n[GUARDRAIL] Response stopped: sensitive content "
+                              f"('{output_guard.match.phrase}') detected", flush=True)
+                        continue
+                    text = output_guard.release()  # Only text no longer part of a possible match
+                if text:
+                    print(text, end="", flush=True)
+            elif event.type == "agent_updated_stream_event" and event.new_agent.name != current_agent:
+                if output_guard:
+                    print(output_guard.flush(), end="")  # The previous agent's message is complete
+                current_agent = event.new_agent.name
+                print(f"\n[→ Handed off to {current_agent}]\n", flush=True)
+        if output_guard and not output_guard.tripped:
+            print(output_guard.flush(), end="")
+        print()
+        
+        end_time = time.perf_counter()
+        self.turn_latencies.append({
+            "agent": current_agent,
+            "time_to_first_token": (first_token_time - start_time) if first_token_time else None,
+            "total_latency": end_time - start_time,
+            "timestamp": time.time(),
+            "output_guard": output_guard.get_stats() if output_guard else None
+        })
+        
+        if use_history and session_id is not None and not (output_guard and output_guard.tripped):
+            (await self.get_history_async(session_id)).add_turn(user_input, result.final_output)
         
         return result
     
+    async def run_batch(
+        self,
+        input_path: str,
+        output_path: str,
+        concurrency: Optional[int] = None,
+        agent_key: str = "triage"
+    ) -> Dict[str, int]:
+        """
+        Process a JSONL file of requests with bounded concurrency.
+        
+        Each input line is a JSON object with an "input" field and optional
+        "id" and "agent" (agent system key) fields. Requests are streamed from
+        disk, run through process_request without conversation history, and
+        each result is appended to the output JSONL file as soon as it completes,
+        so output order follows completion order rather than input order.
+        """
+        concurrency = concurrency or self.config.BATCH_CONCURRENCY
+        if concurrency < 1:
+            raise ValueError("Batch concurrency must be at least 1")
+        
+        # Bounded queue keeps memory flat regardless of input file size
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        stats = {"processed": 0, "ok": 0, "blocked": 0, "error": 0}
+        
+        with open(input_path, "r", encoding="utf-8") as source, \
+                open(output_path, "w", encoding="utf-8") as sink:
+            
+            async def produce():
+                for line_number, line in enumerate(source, 1):
+                    line = line.strip()
+                    if line:
+                        await queue.put((line_number, line))
+                for _ in range(concurrency):
+                    await queue.put(None)
+            
+            async def work():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    record = await self._process_batch_line(*item, default_agent_key=agent_key)
+                    sink.write(json.dumps(record, default=str) + "\n")
+                    sink.flush()
+                    stats["processed"] += 1
+                    stats[record["status"]] += 1
+            
+            await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+        
+        return stats
+    
+    async def _process_batch_line(
+        self,
+        line_number: int,
+        line: str,
+        default_agent_key: str = "triage"
+    ) -> Dict[str, Any]:
+        """Run a single batch line and convert the outcome into an output record."""
+        record: Dict[str, Any] = {"id": line_number, "status": "ok"}
+        start_time = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if isinstance(request, str):
+                request = {"input": request}
+            record["id"] = request.get("id", line_number)
+            agent_key = request.get("agent", default_agent_key)
+            record["agent"] = agent_key
+            
+            result = await self.process_request(
+                request["input"],
+                starting_agent=self.agents[agent_key],
+                context=None,
+                use_history=False
+            )
+            output = result.final_output
+            record["last_agent"] = result.last_agent.name
+            record["final_output"] = output.model_dump() if hasattr(output, "model_dump") else output
+        except (InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered) as e:
+            record["status"] = "blocked"
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+        record["duration"] = round(time.perf_counter() - start_time, 3)
+        return record
+    
     async def demo_structured_output(self):
         """Demonstrate structured output with Pydantic models."""
         print("\n" + "="*70)
@@ -268,10 +611,17 @@ class TravelAgentSystem:
         
         booking_agent = self.agents["booking_agent"]
         
+        # A seeded hotel (data/hotels.json), with dates inside the inventory's calendar
+        check_in = datetime.now().date() + timedelta(days=30)
+        check_out = check_in + timedelta(days=4)
+        
         print("\nMaking a booking with secure context...")
         result = await Runner.run(
             starting_agent=booking_agent,
-            input="Book me a room at the Grand Plaza Hotel from 2024-06-01 to 2024-06-05 for 2 guests, deluxe room",
+            input=(
+                f"Book me a room at the Tokyo Grand Hotel from {check_in.isoformat()} to "
+                f"{check_out.isoformat()} for 2 guests, deluxe room"
+            ),
             context=user_context
         )
         
@@ -372,6 +722,48 @@ class TravelAgentSystem:
             print("="*70)
             metrics = self.metrics_hooks.get_metrics()
             print(json.dumps(metrics, indent=2, default=str))
+            
+            # Show tool fan-out: per-turn tool latency vs running the same calls serially
+            print("\n" + "="*70)
+            print("TOOL FAN-OUT")
+            print("="*70)
+            print(json.dumps(summarize_tool_fanout(self.tool_fanout_turns), indent=2))
+        
+        # Show agent construction times (agents are built lazily on first use)
+        print("\n" + "="*70)
+        print("AGENT CONSTRUCTION TIMES")
+        print("="*70)
+        for agent_key, build_time in self.agents.get_build_times().items():
+            print(f"  {agent_key}: {build_time * 1000:.2f} ms")
+        
+        # Show response cache effectiveness if enabled
+        if self.response_cache:
+            print("\n" + "="*70)
+            print("RESPONSE CACHE")
+            print("="*70)
+            print(json.dumps(self.response_cache.get_stats(), indent=2))
+        
+        # Show tool result cache counters
+        print("\n" + "="*70)
+        print("TOOL RESULT CACHE")
+        print("="*70)
+        for tool_name, stats in get_tool_cache_stats().items():
+            print(f"  {tool_name}: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['evictions']} evictions (TTL {stats['ttl']}s)")
+        
+        # Show repeated identical calls to pure tools answered within a run
+        print("\n" + "="*70)
+        print("PER-RUN TOOL MEMO")
+        print("="*70)
+        for tool_name, stats in get_run_memo_stats().items():
+            print(f"  {tool_name}: {stats['duplicates']} duplicate calls")
+        
+        # Show how far requests got in the guardrail cascades (LLM tier only when needed)
+        print("\n" + "="*70)
+        print("GUARDRAIL CASCADE")
+        print("="*70)
+        print(json.dumps(get_guardrail_cascade_stats(), indent=2))
+        print(f"  Verdict cache: {json.dumps(get_verdict_cache().get_stats())}")
 
 
 # ============================================================================
@@ -385,9 +777,33 @@ async def main():
     parser = argparse.ArgumentParser(description="Comprehensive Travel Agent System")
     parser.add_argument(
         "--mode",
-        choices=["interactive", "demo", "all-demos"],
+        choices=["interactive", "demo", "all-demos", "batch"],
         default="interactive",
-        help="Run mode: interactive, demo, or all-demos"
+        help="Run mode: interactive, demo, all-demos, or batch"
+    )
+    parser.add_argument(
+        "--input",
+        help="Batch mode: JSONL file of requests ({\"id\": ..., \"input\": ..., \"agent\": ...})"
+    )
+    parser.add_argument(
+        "--output",
+        help="Batch mode: JSONL file to write results to"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=Config.BATCH_CONCURRENCY,
+        help="Batch mode: maximum number of requests in flight"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Interactive mode: stream responses as they are generated"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache final responses to repeated stateless requests"
     )
     parser.add_argument(
         "--no-hooks",
@@ -395,9 +811,9 @@ async def main():
         help="Disable hooks"
     )
     parser.add_argument(
-        "--no-guardrails",
+        "--guardrails",
         action="store_true",
-        help="Disable guardrails"
+        help="Enable the input and output guardrails"
     )
     parser.add_argument(
         "--quiet",
@@ -406,12 +822,18 @@ async def main():
     )
     
     args = parser.parse_args()
+    if args.mode == "batch" and not (args.input and args.output):
+        parser.error("--mode batch requires --input and --output")
     
     # Configure
     config = Config()
     config.ENABLE_HOOKS = not args.no_hooks
-    config.ENABLE_GUARDRAILS = not args.no_guardrails
+    config.ENABLE_GUARDRAILS = args.guardrails
     config.VERBOSE_OUTPUT = not args.quiet
+    config.BATCH_CONCURRENCY = args.concurrency
+    config.STREAM_RESPONSES = args.stream
+    config.ENABLE_RESPONSE_CACHE = args.cache
+    configure_runtime(config)
     
     # Create system
     system = TravelAgentSystem(config)
@@ -423,6 +845,10 @@ async def main():
         await system.demo_structured_output()
     elif args.mode == "all-demos":
         await system.run_all_demos()
+    elif args.mode == "batch":
+        stats = await system.run_batch(args.input, args.output, concurrency=args.concurrency)
+        print(f"\nBatch complete: {stats['processed']} processed, {stats['ok']} ok, "
+              f"{stats['blocked']} blocked, {stats['error']} errors")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+Local stand-in for the travel backend HTTP services.
+This module serves the mock booking, availability, weather and restrictions backends
+from tools.py over HTTP/1.1 (with keep-alive), with optional simulated latency, so the
+async backend tools can be exercised and load tested without real services.
+
+Usage:
+    python mock_backend.py --port 8765 --latency 0.05
+    TRAVEL_BACKEND_URL=http://127.0.0.1:8765 python main.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from models import HotelBookingRequest
+from tools import (
+    mock_hotel_booking,
+    mock_hotel_availability,
+    mock_cheapest_stays,
+    mock_destination_weather,
+    mock_travel_restrictions
+)
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    """Routes backend requests to the mock service functions."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str):
+        server: "_MockHTTPServer" = self.server
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+
+        with server.stats_lock:
+            server.request_count += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        try:
+            if method == "GET" and url.path == "/hotels/availability":
+                result = mock_hotel_availability(
+                    params["destination"], params["check_in"], params["check_out"],
+                    int(params.get("guests", 1))
+                )
+            elif method == "GET" and url.path == "/hotels/cheapest-stays":
+                result = mock_cheapest_stays(
+                    params["destination"], params["earliest_check_in"], params["latest_check_out"],
+                    int(params["nights"]), int(params.get("guests", 1)), int(params.get("top_k", 5))
+                )
+            elif method == "POST" and url.path == "/hotels/bookings":
+                guest = body.get("guest", {})
+                result = mock_hotel_booking(
+                    HotelBookingRequest(**body["booking"]), guest.get("name"), guest.get("email")
+                )
+            elif method == "GET" and url.path == "/weather":
+                result = mock_destination_weather(params["destination"], params.get("month"))
+            elif method == "GET" and url.path == "/restrictions":
+                result = mock_travel_restrictions(params["destination"])
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint {method} {url.path}"})
+                return
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, result)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Accept bursts of new connections under load
+
+
+class MockBackendServer:
+    """
+    Mock backend running in a background thread.
+
+    Use as a context manager; port 0 picks a free port (see .url).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self._server = _MockHTTPServer((host, port), MockBackendHandler)
+        self._server.latency = latency
+        self._server.request_count = 0
+        self._server.stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self) -> int:
+        return self._server.request_count
+
+    def start(self) -> "MockBackendServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockBackendServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"url": self.url, "requests": self.request_count, "latency": self._server.latency}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock travel backend services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency per request (seconds)")
+    args = parser.parse_args()
+
+    server = MockBackendServer(args.host, args.port, args.latency)
+    print(f"Mock backend listening on {server.url} (latency {args.latency}s)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ This module demonstrates structured agent outputs and typed function tool inputs
 
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 
 # ============================================================================
@@ -71,6 +71,12 @@ class BookingConfirmation(BaseModel):
     cancellation_policy: Optional[str] = Field(None, description="Cancellation policy information")
 
 
+class GuardrailVerdict(BaseModel):
+    """Structured output of the LLM guardrail agents."""
+    is_violation: bool = Field(..., description="Whether the text violates the guardrail's policy")
+    reasoning: str = Field(..., description="Short explanation of the verdict")
+
+
 # ============================================================================
 # Structured Input Models (Function Tool Inputs)
 # ============================================================================
@@ -95,8 +101,8 @@ class BudgetEstimateRequest(BaseModel):
 class HotelBookingRequest(BaseModel):
     """Structured input for hotel booking requests."""
     hotel_name: str = Field(..., description="Name of the hotel")
-    check_in: str = Field(..., description="Check-in date (YYYY-MM-DD)")
-    check_out: str = Field(..., description="Check-out date (YYYY-MM-DD)")
+    check_in: date = Field(..., description="Check-in date (YYYY-MM-DD)")
+    check_out: date = Field(..., description="Check-out date (YYYY-MM-DD)")
     guests: int = Field(default=1, description="Number of guests", gt=0)
     room_type: str = Field(default="standard", description="Room type preference")
 
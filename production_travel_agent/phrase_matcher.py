@@ -0,0 +1,137 @@
+"""
+Compiled multi-phrase matcher for the keyword guardrails.
+This module compiles any number of named phrase lists into regular expressions and finds
+every occurrence of every phrase in a text with the re module's C engine, reporting which
+list and phrase matched. Guardrails sharing a matcher also share scan results, so a text
+checked by several guardrails is scanned once.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class PhraseMatch(NamedTuple):
+    """One occurrence of a phrase; start/end index the lowercased text."""
+    list_name: str
+    phrase: str
+    start: int
+    end: int
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    One regular expression matching any of the phrases, factored into a trie
+    ("tokyo|tonga" -> "to(?:kyo|nga)") so the engine tests each shared prefix once.
+    Optional tails are greedy, so the longest phrase at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}  # A phrase ends here
+
+    def pattern(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + pattern(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return pattern(trie)
+
+
+class PhraseMatcher:
+    """
+    Every occurrence of every phrase of named phrase lists (case-insensitive substring
+    matching, like `phrase in text.lower()`); a phrase in several lists is reported for each.
+
+    - A lookahead over one trie-shaped alternation of every phrase finds each position
+      where some phrase starts (overlapping occurrences included) in one C-level pass
+    - Only at those positions, one optional group per list gives the longest phrase of the
+      list starting there; the list's shorter phrases that are prefixes of it are
+      reported with it
+    - The most recent scans are kept in a small LRU keyed by the text, so guardrails
+      checking the same input reuse one scan
+    """
+
+    def __init__(self, phrase_lists: Mapping[str, Iterable[str]], cache_size: int = 64):
+        self.phrase_lists: Dict[str, Tuple[str, ...]] = {
+            list_name: tuple(dict.fromkeys(phrase.lower() for phrase in phrases if phrase))
+            for list_name, phrases in phrase_lists.items()
+        }
+        self.max_phrase_length = max(
+            (len(phrase) for phrases in self.phrase_lists.values() for phrase in phrases), default=0
+        )
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[PhraseMatch, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self._list_names = tuple(name for name, phrases in self.phrase_lists.items() if phrases)
+        all_phrases = dict.fromkeys(
+            phrase for name in self._list_names for phrase in self.phrase_lists[name]
+        )
+        self._starts = re.compile(_trie_pattern(all_phrases)) if all_phrases else None
+        # Group i holds the longest phrase of list i at the position (None if none starts there)
+        self._at = re.compile("".join(
+            f"(?=({_trie_pattern(self.phrase_lists[name])})?)" for name in self._list_names
+        ))
+        # (list, phrase) -> the list's shorter phrases that are prefixes of it, longest first
+        self._prefixes: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        for name in self._list_names:
+            phrases = set(self.phrase_lists[name])
+            for phrase in phrases:
+                prefixes = tuple(phrase[:size] for size in range(len(phrase) - 1, 0, -1) if phrase[:size] in phrases)
+                if prefixes:
+                    self._prefixes[name, phrase] = prefixes
+
+    def _scan(self, text: str) -> Tuple[PhraseMatch, ...]:
+        if self._starts is None:
+            return ()
+        matches = []
+        search, at, list_names, prefixes = self._starts.search, self._at.match, self._list_names, self._prefixes
+        candidate = search(text)
+        while candidate is not None:
+            start = candidate.start()
+            candidate = search(text, start + 1)  # Next start, so overlapping phrases are found
+            for list_name, phrase in zip(list_names, at(text, start).groups()):
+                if phrase:
+                    matches.append(PhraseMatch(list_name, phrase, start, start + len(phrase)))
+                    for prefix in prefixes.get((list_name, phrase), ()):
+                        matches.append(PhraseMatch(list_name, prefix, start, start + len(prefix)))
+        return tuple(matches)
+
+    def find_all(self, text: str, use_cache: bool = True) -> Tuple[PhraseMatch, ...]:
+        """
+        Every occurrence of every phrase, ordered by start position (then list order,
+        longest first). Pass use_cache=False for one-off texts (e.g. stream chunks) so they
+        do not evict shared scans.
+        """
+        text = text.lower()
+        if not use_cache:
+            return self._scan(text)
+        with self._cache_lock:
+            matches = self._cache.get(text)
+            if matches is not None:
+                self._cache.move_to_end(text)
+                return matches
+        matches = self._scan(text)
+        with self._cache_lock:
+            self._cache[text] = matches
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return matches
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """Distinct matched phrases per list, in order of first occurrence."""
+        matched: Dict[str, Dict[str, None]] = {}
+        for match in self.find_all(text):
+            matched.setdefault(match.list_name, {})[match.phrase] = None
+        return {list_name: list(phrases) for list_name, phrases in matched.items()}
+
+    def first(self, text: str, *list_names: str) -> Optional[PhraseMatch]:
+        """The earliest-starting match from any of the given lists (None if no match)."""
+        candidates = [match for match in self.find_all(text) if match.list_name in list_names]
+        return min(candidates, key=lambda match: (match.start, -match.end), default=None)
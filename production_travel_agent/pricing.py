@@ -0,0 +1,183 @@
+"""
+Shared, immutable pricing index for the budget tools.
+This module loads destination pricing, accommodation multipliers and breakdown costs once
+at import from data/pricing.json, and resolves free-form destinations (cities, countries,
+local names) to a pricing key through a normalization and alias table.
+"""
+
+import functools
+import json
+import os
+import re
+import unicodedata
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+
+PRICING_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pricing.json")
+
+BREAKDOWN_CATEGORIES = ("accommodation", "food", "activities", "local_transport")
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9,]+")
+
+
+def normalize_destination(destination: str) -> str:
+    """
+    Normalize a destination name for lookup: case-folded, accents stripped,
+    punctuation collapsed to single spaces ("Zürich " -> "zurich").
+    Commas are kept so "Tokyo, Japan" can be resolved part by part.
+    """
+    text = destination.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_ALPHANUMERIC.sub(" ", text)
+    return ", ".join(part.strip() for part in text.split(",") if part.strip())
+
+
+class DestinationPricing(NamedTuple):
+    """Pricing entry for one destination key."""
+    key: str
+    daily_cost: float      # Base daily cost per person (moderate accommodation)
+    flight_cost: float     # Round-trip flight estimate per traveler
+    high_cost: bool        # Applies the high-cost multiplier in detailed breakdowns
+
+
+class PricingIndex:
+    """
+    Read-only pricing index shared by all tools and runs.
+
+    Lookups resolve a destination by its normalized name, then through the alias table,
+    then part by part for comma-separated names ("Kyoto, Japan"), and fall back to the
+    default entry. All tables are exposed as read-only mappings; since the index never
+    changes, resolved names are memoized in a bounded LRU cache.
+    """
+
+    RESOLVE_CACHE_SIZE = 4096
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.version = data.get("version", 1)
+        default_key = data.get("default_destination", "default")
+        self.destinations: Mapping[str, DestinationPricing] = MappingProxyType({
+            key: DestinationPricing(
+                key=key,
+                daily_cost=entry["daily_cost"],
+                flight_cost=entry["flight_cost"],
+                high_cost=entry.get("high_cost", False)
+            )
+            for key, entry in data["destinations"].items()
+        })
+        if default_key not in self.destinations:
+            raise ValueError(f"Pricing data has no entry for default destination '{default_key}'")
+        self.default = self.destinations[default_key]
+
+        aliases = {}
+        for alias, key in data.get("aliases", {}).items():
+            if key not in self.destinations:
+                raise ValueError(f"Alias '{alias}' points to unknown destination '{key}'")
+            aliases[normalize_destination(alias)] = key
+        self.aliases: Mapping[str, str] = MappingProxyType(aliases)
+
+        self.accommodation_multipliers: Mapping[str, float] = MappingProxyType(
+            dict(data["accommodation_multipliers"])
+        )
+        self.default_accommodation_level = data.get("default_accommodation_level", "moderate")
+        self.breakdown_daily_costs: Mapping[str, Mapping[str, float]] = MappingProxyType({
+            level: MappingProxyType(dict(costs)) for level, costs in data["breakdown_daily_costs"].items()
+        })
+        self.high_cost_multiplier = data["high_cost_multiplier"]
+        self.breakdown_flight_cost = data["breakdown_flight_cost"]
+        self.travel_insurance_cost = data["travel_insurance_cost"]
+        self.miscellaneous_cost = data["miscellaneous_cost"]
+        self.resolve = functools.lru_cache(maxsize=self.RESOLVE_CACHE_SIZE)(self._resolve)
+
+    @classmethod
+    def from_file(cls, path: str = PRICING_DATA_PATH) -> "PricingIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.destinations)
+
+    def _match(self, name: str) -> Optional[str]:
+        if name in self.destinations:
+            return name
+        return self.aliases.get(name)
+
+    def _resolve(self, destination: str) -> str:
+        """Resolve a free-form destination to its pricing key (the default key if unknown)."""
+        normalized = normalize_destination(destination)
+        key = self._match(normalized)
+        if key is None and "," in normalized:
+            key = next(
+                (match for match in map(self._match, normalized.split(", ")) if match), None
+            )
+        return key or self.default.key
+
+    def lookup(self, destination: str) -> DestinationPricing:
+        """Pricing entry for a free-form destination."""
+        return self.destinations[self.resolve(destination)]
+
+    def accommodation_multiplier(self, level: str) -> float:
+        """Daily cost multiplier for an accommodation level (1.0 if unknown)."""
+        return self.accommodation_multipliers.get(level.lower(), 1.0)
+
+    def daily_costs(self, level: str) -> Mapping[str, float]:
+        """Per-person daily breakdown costs for an accommodation level (default level if unknown)."""
+        costs = self.breakdown_daily_costs.get(level.lower())
+        return costs if costs is not None else self.breakdown_daily_costs[self.default_accommodation_level]
+
+
+# ============================================================================
+# Budget Calculations
+# ============================================================================
+
+def quote_budget(
+    destination: str,
+    days: int,
+    travelers: int,
+    accommodation_level: str,
+    index: Optional[PricingIndex] = None
+) -> float:
+    """Estimated total trip budget in USD (daily costs plus flights)."""
+    index = index or PRICING
+    pricing = index.lookup(destination)
+    daily_cost = pricing.daily_cost * index.accommodation_multiplier(accommodation_level)
+    total_cost = daily_cost * days * travelers
+    flight_cost = pricing.flight_cost * travelers
+    return round(total_cost + flight_cost, 2)
+
+
+def quote_breakdown(
+    destination: str,
+    days: int,
+    travelers: int,
+    accommodation_level: str,
+    include_flights: bool = True,
+    index: Optional[PricingIndex] = None
+) -> Dict[str, Any]:
+    """Detailed budget breakdown by category, plus the total."""
+    index = index or PRICING
+    pricing = index.lookup(destination)
+    daily_costs = index.daily_costs(accommodation_level)
+    dest_mult = index.high_cost_multiplier if pricing.high_cost else 1.0
+
+    breakdown = {
+        category: round(daily_costs[category] * days * travelers * dest_mult, 2)
+        for category in BREAKDOWN_CATEGORIES
+    }
+    breakdown["flights"] = round(index.breakdown_flight_cost * travelers, 2) if include_flights else 0.0
+    breakdown["travel_insurance"] = round(index.travel_insurance_cost * travelers, 2)
+    breakdown["miscellaneous"] = round(index.miscellaneous_cost * travelers, 2)
+
+    breakdown["total"] = sum(breakdown.values())
+    return breakdown
+
+
+# Loaded once per process and shared by every tool call
+PRICING = PricingIndex.from_file()
+
+
+def get_pricing_index() -> PricingIndex:
+    """Get the process-wide pricing index."""
+    return PRICING
@@ -0,0 +1,235 @@
+"""
+Final-response cache for repeated travel questions.
+This module keys cached responses by a fingerprint of the starting agent (instructions,
+model, tools, handoffs, output type) plus the normalized user input, with TTL expiry and
+size-bounded LRU eviction.
+"""
+
+import hashlib
+import json
+import re
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from agents import Agent
+from pydantic import BaseModel
+
+try:
+    from .tool_cache import SIDE_EFFECTING_TOOLS
+except ImportError:
+    from tool_cache import SIDE_EFFECTING_TOOLS
+
+
+# ============================================================================
+# Cache Keys
+# ============================================================================
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!?]+$")
+
+
+def normalize_input(user_input: str) -> str:
+    """Normalize user input so trivially different phrasings share a cache key."""
+    text = _WHITESPACE.sub(" ", user_input.casefold()).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def _describe_tool(tool) -> Dict[str, Any]:
+    description = {"name": getattr(tool, "name", type(tool).__name__), "type": type(tool).__name__}
+    schema = getattr(tool, "params_json_schema", None)
+    if schema is not None:
+        description["params"] = schema
+        description["description"] = getattr(tool, "description", "")
+    return description
+
+
+def _describe_agent(agent: Agent, seen: set) -> Dict[str, Any]:
+    seen.add(id(agent))
+    instructions = agent.instructions
+    if callable(instructions):
+        instructions = f"{instructions.__module__}.{instructions.__qualname__}"
+    output_type = agent.output_type
+    if output_type is not None:
+        # AgentOutputSchema wraps the model class in .output_type
+        output_type = getattr(output_type, "output_type", output_type)
+        output_type = getattr(output_type, "__name__", str(output_type))
+    handoffs = []
+    for handoff in agent.handoffs:
+        target = handoff if isinstance(handoff, Agent) else None
+        if target is None:
+            handoffs.append({"handoff": getattr(handoff, "agent_name", str(handoff))})
+        elif id(target) in seen:
+            handoffs.append({"agent": target.name})  # Cycle guard
+        else:
+            handoffs.append(_describe_agent(target, seen))
+    return {
+        "name": agent.name,
+        "instructions": instructions,
+        "model": str(agent.model),
+        "output_type": output_type,
+        "tools": [_describe_tool(tool) for tool in agent.tools],
+        "handoffs": handoffs
+    }
+
+
+# id(agent) -> (weak reference to the agent, fingerprint). Agents are unhashable
+# dataclasses, so entries are keyed by id and removed when their agent is collected;
+# the weak reference guards against a reused id
+_fingerprints: Dict[int, tuple] = {}
+
+
+def agent_fingerprint(agent: Agent) -> str:
+    """
+    Stable hash of everything about an agent that can change its answers:
+    instructions, model, output type, tools (with schemas) and handoff agents (recursively).
+    Agent definitions are shared and immutable, so fingerprints are memoized per agent.
+    """
+    key = id(agent)
+    cached = _fingerprints.get(key)
+    if cached is not None and cached[0]() is agent:
+        return cached[1]
+    description = _describe_agent(agent, set())
+    fingerprint = hashlib.sha256(
+        json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    _fingerprints[key] = (weakref.ref(agent), fingerprint)
+    weakref.finalize(agent, _forget_fingerprint, key, _fingerprints[key][0])
+    return fingerprint
+
+
+def _forget_fingerprint(key: int, agent_ref: weakref.ref):
+    """Drop a collected agent's fingerprint (unless its id was already reused)."""
+    cached = _fingerprints.get(key)
+    if cached is not None and cached[0] is agent_ref:
+        del _fingerprints[key]
+
+
+def request_key(agent: Agent, user_input: str) -> str:
+    """Cache key for a stateless request: agent fingerprint + normalized input."""
+    return f"{agent_fingerprint(agent)}:{normalize_input(user_input)}"
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+@dataclass
+class CachedRunResult:
+    """
+    Result returned for a cache hit.
+    Mirrors the parts of RunResult the application uses (final_output, last_agent,
+    to_input_list) and reports the latency the original run took.
+    """
+    input: str
+    final_output: Any
+    last_agent: Agent
+    latency_saved: float
+    cached: bool = True
+
+    def to_input_list(self) -> List[Dict[str, str]]:
+        output = self.final_output
+        content = output.model_dump_json() if isinstance(output, BaseModel) else str(output)
+        return [
+            {"role": "user", "content": self.input},
+            {"role": "assistant", "content": content}
+        ]
+
+
+@dataclass
+class _CacheEntry:
+    output: Any                                   # Plain text, or model_dump() of a structured output
+    output_model: Optional[Type[BaseModel]]
+    last_agent: Agent
+    latency: float
+    expires_at: float = field(default=0.0)
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of final agent outputs.
+
+    Structured outputs (e.g. TravelRecommendation, SafetyAdvice) are stored as plain
+    data and re-validated into a fresh model instance on every hit, so callers never
+    share (or mutate) cached objects. Runs that called a side-effecting tool (such as
+    book_hotel) are never cached, since replaying them would skip the side effect.
+    """
+
+    DEFAULT_UNCACHEABLE_TOOLS = SIDE_EFFECTING_TOOLS
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_entries: int = 1000,
+        uncacheable_tools: Optional[Iterable[str]] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.uncacheable_tools = frozenset(
+            self.DEFAULT_UNCACHEABLE_TOOLS if uncacheable_tools is None else uncacheable_tools
+        )
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0,
+                      "skipped": 0, "latency_saved": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, agent: Agent, user_input: str) -> Optional[CachedRunResult]:
+        """Return a cached result for this agent and input, or None."""
+        key = request_key(agent, user_input)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        self.stats["latency_saved"] += entry.latency
+        output = entry.output_model.model_validate(entry.output) if entry.output_model else entry.output
+        return CachedRunResult(
+            input=user_input,
+            final_output=output,
+            last_agent=entry.last_agent,
+            latency_saved=entry.latency
+        )
+
+    def _called_uncacheable_tool(self, result) -> bool:
+        for item in getattr(result, "new_items", []):
+            if item.type == "tool_call_item" and getattr(item.raw_item, "name", None) in self.uncacheable_tools:
+                return True
+        return False
+
+    def put(self, agent: Agent, user_input: str, result, latency: float) -> bool:
+        """Store the final output of a completed run. Returns False if the run is not cacheable."""
+        if self._called_uncacheable_tool(result):
+            self.stats["skipped"] += 1
+            return False
+        output = result.final_output
+        is_model = isinstance(output, BaseModel)
+        key = request_key(agent, user_input)
+        self._entries[key] = _CacheEntry(
+            output=output.model_dump() if is_model else output,
+            output_model=type(output) if is_model else None,
+            last_agent=result.last_agent,
+            latency=latency,
+            expires_at=time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return True
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries)}
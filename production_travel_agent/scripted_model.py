@@ -0,0 +1,366 @@
+"""
+Offline, deterministic model provider for the Travel Agent system.
+This module replays scripted responses, tool calls and handoffs per agent, so the
+Runner loop, hooks, guardrails, handoffs and tool wrappers can be exercised and
+benchmarked without calling (or paying for) a real model.
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from agents import Agent, Usage
+from agents.items import ModelResponse
+from agents.models.interface import Model, ModelProvider
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+
+# ============================================================================
+# Script Steps
+# ============================================================================
+
+@dataclass
+class ScriptStep:
+    """
+    One scripted model response for an agent.
+
+    - tool_calls: (tool_name, arguments) pairs emitted together in one response
+    - handoff_to: name of the agent to hand off to
+    - output: final output (text, or a dict for agents with a structured output_type)
+    """
+    tool_calls: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    handoff_to: Optional[str] = None
+    output: Any = None
+
+
+def call_tools(*calls: Tuple[str, Dict[str, Any]]) -> ScriptStep:
+    """Script a response that calls one or more tools in parallel."""
+    return ScriptStep(tool_calls=list(calls))
+
+
+def handoff(agent_name: str) -> ScriptStep:
+    """Script a response that hands off to another agent."""
+    return ScriptStep(handoff_to=agent_name)
+
+
+def respond(output: Any) -> ScriptStep:
+    """Script a final response (text or structured output dict)."""
+    return ScriptStep(output=output)
+
+
+# A week-long stay a month out, inside the hotel inventory's calendar
+STAY_CHECK_IN = (date.today() + timedelta(days=30)).isoformat()
+STAY_CHECK_OUT = (date.today() + timedelta(days=37)).isoformat()
+
+# Scripts for the triage → Travel Genie → Booking Specialist paths, plus a structured
+# output for every agent with an output_type, so offline runs can start at any agent
+DEFAULT_SCRIPTS: Dict[str, List[ScriptStep]] = {
+    "Travel Triage": [
+        handoff("Travel Genie"),
+    ],
+    "Travel Genie": [
+        call_tools(
+            ("estimate_budget", {"trip": {
+                "destination": "Japan", "days": 7, "travelers": 2, "accommodation_level": "moderate"
+            }}),
+            ("get_destination_weather", {"destination": "Japan", "month": "April"}),
+            ("get_local_currency_info", {"destination": "Japan"}),
+        ),
+        handoff("Booking Specialist"),
+    ],
+    "Booking Specialist": [
+        call_tools(
+            ("check_hotel_availability", {
+                "destination": "Tokyo", "check_in": STAY_CHECK_IN, "check_out": STAY_CHECK_OUT, "guests": 2
+            }),
+        ),
+        call_tools(
+            ("book_hotel", {"booking": {
+                "hotel_name": "Tokyo Grand Hotel", "check_in": STAY_CHECK_IN, "check_out": STAY_CHECK_OUT,
+                "guests": 2, "room_type": "deluxe"
+            }}),
+        ),
+        respond({
+            "booking_type": "hotel",
+            "confirmation_id": "HTL-SCRIPTED",
+            "details": {"hotel_name": "Tokyo Grand Hotel", "nights": 7},
+            "status": "confirmed",
+            "total_cost": 3150.0,
+            "cancellation_policy": "Free cancellation up to 48 hours before check-in"
+        }),
+    ],
+    "Travel Recommender": [
+        respond({
+            "destination": "Kyoto",
+            "country": "Japan",
+            "reason": "Temples, gardens and food markets suit an interest in culture and food",
+            "best_season": "Spring (March-May)",
+            "top_tip": "Visit popular temples early in the morning to avoid crowds",
+            "estimated_cost_range": "Moderate"
+        }),
+    ],
+    "Itinerary Generator": [
+        respond({
+            "destination": "Japan",
+            "duration_days": 3,
+            "itinerary": [
+                {"day_number": 1, "activities": ["Arrive in Tokyo", "Explore Shinjuku"],
+                 "accommodations": "Tokyo Grand Hotel", "meals": ["Ramen dinner"]},
+                {"day_number": 2, "activities": ["Senso-ji Temple", "Ueno Park"],
+                 "accommodations": "Tokyo Grand Hotel", "meals": ["Sushi lunch"]},
+                {"day_number": 3, "activities": ["Day trip to Nikko"], "meals": ["Bento lunch"]},
+            ],
+            "total_estimated_budget": 1350.0,
+            "packing_suggestions": ["Comfortable walking shoes", "Rain jacket"]
+        }),
+    ],
+    "Packing List Generator": [
+        respond({
+            "destination": "Iceland",
+            "duration_days": 7,
+            "season": "Winter",
+            "essential_items": ["Passport", "Insulated jacket", "Waterproof boots"],
+            "optional_items": ["Swimsuit for hot springs"],
+            "climate_specific_items": ["Thermal layers", "Crampons"],
+            "weight_estimate": "15-18 kg"
+        }),
+    ],
+    "Travel Safety Expert": [
+        respond({
+            "destination": "Japan",
+            "safety_level": "Safe",
+            "health_precautions": ["Carry any prescription medication with documentation"],
+            "security_precautions": ["Keep valuables secure in crowded stations"],
+            "emergency_contacts": ["Police: 110", "Fire/Ambulance: 119"],
+            "travel_advisories": ["Check typhoon forecasts in late summer"]
+        }),
+    ],
+}
+
+
+# ============================================================================
+# Scripted Model
+# ============================================================================
+
+_AGENT_NAME_PATTERN = re.compile(r"^You are ([^,.]+)[,.]")
+
+
+def item_type(item) -> Optional[str]:
+    """Type of a run input item (dict or SDK model)."""
+    return item.get("type") if isinstance(item, dict) else getattr(item, "type", None)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+class ScriptedModel(Model):
+    """
+    Model that replays a per-agent script.
+
+    The calling agent is identified from its instructions, and the step to replay is
+    derived from the run input: every scripted tool call gets a call_id tagged with the
+    agent and step number, so the model is stateless and safe to share across
+    concurrent runs.
+    """
+
+    def __init__(
+        self,
+        scripts: Mapping[str, Sequence[ScriptStep]],
+        agent_names_by_instructions: Optional[Mapping[str, str]] = None,
+        latency: float = 0.0,
+        stream_chunk_size: int = 16
+    ):
+        self.scripts = scripts
+        self.agent_names_by_instructions = dict(agent_names_by_instructions or {})
+        self.latency = latency
+        self.stream_chunk_size = stream_chunk_size
+        self.calls = 0
+        self.time_in_model = 0.0
+
+    def _agent_name(self, system_instructions: Optional[str]) -> str:
+        if system_instructions in self.agent_names_by_instructions:
+            return self.agent_names_by_instructions[system_instructions]
+        match = _AGENT_NAME_PATTERN.match(system_instructions or "")
+        if match:
+            return match.group(1).strip()
+        raise ValueError("ScriptedModel could not identify the calling agent from its instructions")
+
+    @staticmethod
+    def _completed_steps(input, agent_slug: str) -> int:
+        """Number of this agent's scripted steps already present in the run input."""
+        if isinstance(input, str):
+            return 0
+        prefix = f"call_{agent_slug}_"
+        completed = 0
+        for item in input:
+            call_id = item.get("call_id") if isinstance(item, dict) else getattr(item, "call_id", None)
+            if item_type(item) == "function_call" and call_id and call_id.startswith(prefix):
+                step = int(call_id[len(prefix):].split("_")[0])
+                completed = max(completed, step + 1)
+        return completed
+
+    def _build_output(self, system_instructions, input, output_schema, handoffs) -> list:
+        agent_name = self._agent_name(system_instructions)
+        agent_slug = _slug(agent_name)
+        script = self.scripts.get(agent_name, [])
+        step_index = self._completed_steps(input, agent_slug)
+
+        if step_index < len(script):
+            step = script[step_index]
+        elif output_schema is not None and not output_schema.is_plain_text():
+            raise ValueError(f"No scripted structured output left for agent '{agent_name}'")
+        else:
+            step = respond(f"Scripted response from {agent_name}.")
+
+        if step.handoff_to:
+            tool_name = next(
+                (h.tool_name for h in handoffs if h.agent_name == step.handoff_to), None
+            )
+            if tool_name is None:
+                raise ValueError(f"Agent '{agent_name}' has no handoff to '{step.handoff_to}'")
+            calls = [(tool_name, {})]
+        else:
+            calls = step.tool_calls
+
+        if calls:
+            return [
+                ResponseFunctionToolCall(
+                    id=f"fc_{agent_slug}_{step_index}_{i}",
+                    call_id=f"call_{agent_slug}_{step_index}_{i}",
+                    name=name,
+                    arguments=json.dumps(arguments),
+                    type="function_call",
+                    status="completed"
+                )
+                for i, (name, arguments) in enumerate(calls)
+            ]
+
+        text = step.output if isinstance(step.output, str) else json.dumps(step.output)
+        return [
+            ResponseOutputMessage(
+                id=f"msg_{agent_slug}_{step_index}",
+                content=[ResponseOutputText(text=text, type="output_text", annotations=[])],
+                role="assistant",
+                status="completed",
+                type="message"
+            )
+        ]
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs
+    ) -> ModelResponse:
+        start_time = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        output = self._build_output(system_instructions, input, output_schema, handoffs)
+        self.calls += 1
+        self.time_in_model += time.perf_counter() - start_time
+        return ModelResponse(
+            output=output,
+            usage=Usage(requests=1),
+            response_id=f"resp_scripted_{self.calls}"
+        )
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        **kwargs
+    ) -> AsyncIterator:
+        start_time = time.perf_counter()
+        output = self._build_output(system_instructions, input, output_schema, handoffs)
+        self.calls += 1
+        response = Response(
+            id=f"resp_scripted_{self.calls}",
+            created_at=time.time(),
+            model="scripted",
+            object="response",
+            output=output,
+            parallel_tool_calls=True,
+            tool_choice="auto",
+            tools=[]
+        )
+        sequence_number = 0
+        yield ResponseCreatedEvent(response=response, sequence_number=sequence_number, type="response.created")
+
+        # Text is streamed as deltas; simulated latency is spread across the chunks
+        for output_index, item in enumerate(output):
+            if not isinstance(item, ResponseOutputMessage):
+                continue
+            text = item.content[0].text
+            chunks = [
+                text[i:i + self.stream_chunk_size] for i in range(0, len(text), self.stream_chunk_size)
+            ]
+            for chunk in chunks:
+                if self.latency:
+                    await asyncio.sleep(self.latency / len(chunks))
+                sequence_number += 1
+                yield ResponseTextDeltaEvent(
+                    content_index=0,
+                    delta=chunk,
+                    item_id=item.id,
+                    logprobs=[],
+                    output_index=output_index,
+                    sequence_number=sequence_number,
+                    type="response.output_text.delta"
+                )
+
+        self.time_in_model += time.perf_counter() - start_time
+        sequence_number += 1
+        yield ResponseCompletedEvent(response=response, sequence_number=sequence_number, type="response.completed")
+
+
+class ScriptedModelProvider(ModelProvider):
+    """
+    Model provider returning a single shared ScriptedModel for every model name.
+
+    Pass it through RunConfig(model_provider=...) to run any agent offline.
+    """
+
+    def __init__(
+        self,
+        scripts: Optional[Mapping[str, Sequence[ScriptStep]]] = None,
+        agents: Optional[Mapping[str, Agent]] = None,
+        latency: float = 0.0,
+        stream_chunk_size: int = 16
+    ):
+        agent_names_by_instructions = {
+            agent.instructions: agent.name
+            for agent in (agents or {}).values()
+            if isinstance(agent.instructions, str)
+        }
+        self.model = ScriptedModel(
+            scripts if scripts is not None else DEFAULT_SCRIPTS,
+            agent_names_by_instructions=agent_names_by_instructions,
+            latency=latency,
+            stream_chunk_size=stream_chunk_size
+        )
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return self.model
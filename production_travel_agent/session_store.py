@@ -0,0 +1,176 @@
+"""
+Multi-session conversation store for serving many users from one process.
+This module keeps hot sessions in memory under an LRU limit and spills cold sessions
+to a local SQLite file, reloading them lazily the next time they are used.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+try:
+    from .history import ConversationHistory
+except ImportError:
+    from history import ConversationHistory
+
+
+class SessionStore:
+    """
+    Session-keyed store of ConversationHistory objects with bounded memory.
+
+    - get() returns the in-memory history for a session, reloading it from disk
+      or creating a new one if needed, and marks it most recently used
+    - When more than max_in_memory sessions are held, the least recently used
+      sessions are serialized to SQLite and dropped from memory
+    - A reloaded session is removed from disk, so each session lives in exactly
+      one place at a time
+    - get_async() is get() for coroutines: in-memory hits are answered on the event loop,
+      while reloads and spills (SQLite I/O) run in a worker thread. The store is guarded
+      by a lock, so it can be used from both at once
+    """
+
+    def __init__(
+        self,
+        db_path: str = "sessions.db",
+        max_in_memory: int = 1000,
+        history_factory: Optional[Callable[[], ConversationHistory]] = None
+    ):
+        if max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1")
+        self.db_path = db_path
+        self.max_in_memory = max_in_memory
+        self.history_factory = history_factory or ConversationHistory
+        self._sessions: "OrderedDict[str, ConversationHistory]" = OrderedDict()
+        self.stats = {"hits": 0, "reloads": 0, "created": 0, "spills": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        """Open the database lazily, so processes that never spill never touch disk."""
+        if self._conn is None:
+            if not create and not os.path.exists(self.db_path):
+                return None
+            # Used from worker threads (get_async), always under the store's lock
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def __len__(self) -> int:
+        """Number of sessions currently held in memory."""
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions:
+                return True
+            conn = self._connection(create=False)
+            if conn is None:
+                return False
+            row = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            return row is not None
+
+    def get(self, session_id: str) -> ConversationHistory:
+        """Get (loading or creating if necessary) the history for a session."""
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is not None:
+                self._sessions.move_to_end(session_id)
+                self.stats["hits"] += 1
+                return history
+
+            history = self._load(session_id)
+            if history is not None:
+                self.stats["reloads"] += 1
+            else:
+                history = self.history_factory()
+                self.stats["created"] += 1
+
+            self._sessions[session_id] = history
+            self._evict_if_needed()
+            return history
+
+    async def get_async(self, session_id: str) -> ConversationHistory:
+        """get() without blocking the event loop on disk reads and writes."""
+        # Hit fast path, unless a worker thread holds the lock (never wait for it on the loop)
+        if self._lock.acquire(blocking=False):
+            try:
+                history = self._sessions.get(session_id)
+                if history is not None:
+                    self._sessions.move_to_end(session_id)
+                    self.stats["hits"] += 1
+                    return history
+            finally:
+                self._lock.release()
+        return await asyncio.to_thread(self.get, session_id)
+
+    def delete(self, session_id: str):
+        """Forget a session both in memory and on disk."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            conn = self._connection(create=False)
+            if conn is not None:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                conn.commit()
+
+    def flush(self):
+        """Write every in-memory session to disk (sessions stay in memory)."""
+        with self._lock:
+            if self._sessions:
+                self._write_many(self._sessions.items())
+
+    def close(self):
+        """Flush all sessions to disk and close the database."""
+        with self._lock:
+            self.flush()
+            self._sessions.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get store counters plus current memory/disk session counts."""
+        with self._lock:
+            conn = self._connection(create=False)
+            on_disk = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] if conn else 0
+            return {**self.stats, "in_memory": len(self._sessions), "on_disk": on_disk}
+
+    def _load(self, session_id: str) -> Optional[ConversationHistory]:
+        conn = self._connection(create=False)
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        conn.commit()
+        return ConversationHistory.from_dict(json.loads(row[0]))
+
+    def _evict_if_needed(self):
+        evicted = []
+        while len(self._sessions) > self.max_in_memory:
+            evicted.append(self._sessions.popitem(last=False))
+        if evicted:
+            self._write_many(evicted)
+            self.stats["spills"] += len(evicted)
+
+    def _write_many(self, items):
+        now = time.time()
+        conn = self._connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+            [(session_id, json.dumps(history.to_dict()), now) for session_id, history in items]
+        )
+        conn.commit()
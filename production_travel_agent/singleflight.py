@@ -0,0 +1,49 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+While a run for a key is in flight, further callers with the same key wait for that run
+and receive its result (or exception) instead of starting a run of their own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+
+    - The first caller for a key starts the call as a task; callers arriving while it
+      is in flight await the same task
+    - The key is released as soon as the call finishes, so later requests start a
+      fresh call (results are not cached here; see ResponseCache for that)
+    - The shared task is shielded, so one cancelled caller does not cancel the run
+      for everyone else waiting on it
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._in_flight)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run call() once per key among concurrent callers.
+        Returns (result, shared), where shared is True if this caller joined a run
+        started by another caller.
+        """
+        task = self._in_flight.get(key)
+        shared = task is not None
+        if shared:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            self.stats["leaders"] += 1
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "in_flight": len(self._in_flight)}
@@ -0,0 +1,17 @@
+"""
+Shared test setup.
+
+The application modules import each other by plain name (as when run from the
+production_travel_agent directory), so that directory goes on sys.path. Tests run
+agents offline on the ScriptedModelProvider; async code is driven with asyncio.run.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key-not-used")
+
+from agents import set_tracing_disabled  # noqa: E402
+
+set_tracing_disabled(True)
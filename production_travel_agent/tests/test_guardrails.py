@@ -0,0 +1,63 @@
+"""Tests for the streaming output guard (guardrails.py)."""
+
+from guardrails import StreamingOutputGuard
+from phrase_matcher import PhraseMatcher
+
+
+MATCHER = PhraseMatcher({"sensitive_patterns": ["secret code", "profit margin"]})
+
+
+def stream(deltas):
+    """Feed deltas, collecting what the guard releases; returns (shown text, guard)."""
+    guard = StreamingOutputGuard(matcher=MATCHER)
+    shown = []
+    for delta in deltas:
+        if guard.feed(delta):
+            return "".join(shown), guard
+        shown.append(guard.release())
+    shown.append(guard.flush())
+    return "".join(shown), guard
+
+
+def test_clean_stream_is_shown_in_full():
+    text = "Our rates include breakfast and free cancellation."
+    shown, guard = stream([text[i:i + 3] for i in range(0, len(text), 3)])
+
+    assert shown == text
+    assert not guard.tripped
+
+
+def test_phrase_split_across_deltas_is_caught_before_any_of_it_is_shown():
+    text = "Fine so far. The secret code is 1234"
+    for size in (1, 2, 5):
+        shown, guard = stream([text[i:i + size] for i in range(0, len(text), size)])
+
+        assert guard.tripped and guard.match.phrase == "secret code"
+        assert "secr" not in shown.lower()
+        assert text.startswith(shown)
+        assert guard.flush() == ""
+
+
+def test_match_offsets_index_the_whole_stream():
+    shown, guard = stream(["Our profit ", "margin is 40%"])
+
+    assert guard.match.phrase == "profit margin"
+    assert (guard.match.start, guard.match.end) == (4, 17)
+    assert shown == ""
+
+
+def test_deltas_are_held_back_until_the_boundary_passes():
+    guard = StreamingOutputGuard(matcher=MATCHER)
+    assert guard.boundary == len("profit margin") - 1
+
+    guard.feed("Hello ")
+    assert guard.release() == ""
+    guard.feed("x" * guard.boundary)
+    assert guard.release() == "Hello "
+
+
+def test_case_and_whitespace_runs_split_across_deltas_are_normalized():
+    shown, guard = stream(["The SECRET ", "  ", "\n Code"])
+
+    assert guard.tripped
+    assert shown == ""
@@ -0,0 +1,91 @@
+"""Tests for the token-budgeted conversation history (history.py)."""
+
+import json
+
+from history import ConversationHistory, estimate_tokens
+
+
+def long_turn(i):
+    return (f"Question {i}: " + "tell me more about the old town, the food and the trains " * 4,
+            f"Answer {i}: " + "here are the neighborhoods, restaurants and rail passes to consider " * 6)
+
+
+def test_first_turn_is_sent_bare():
+    history = ConversationHistory()
+    assert history.build_input("Hello") == "Hello"
+
+
+def test_older_turns_fold_into_summary_within_budget():
+    history = ConversationHistory(token_budget=1000, min_recent_turns=2)
+    for i in range(12):
+        history.add_turn(*long_turn(i))
+
+    assert history.total_turns == 12
+    assert history.folded_turns > 0
+    assert len(history.recent_turns) >= 2
+    assert history.history_tokens <= history.token_budget
+    assert history.summary.startswith(ConversationHistory.SUMMARY_HEADER)
+    # Token counts are tracked incrementally; they match a recount
+    assert history.recent_tokens == sum(tokens for _, _, tokens in history.recent_turns)
+    assert history.summary_tokens == sum(tokens for _, tokens in history.summary_lines)
+
+    input_list = history.build_input("And the beaches?")
+    assert input_list[0] == {"role": "system", "content": history.summary}
+    assert input_list[-1] == {"role": "user", "content": "And the beaches?"}
+    assert input_list[-3]["content"] == long_turn(11)[0]
+    assert history.last_turn_stats["saved_tokens"] > 0
+
+
+def test_summary_keeps_to_its_own_budget():
+    history = ConversationHistory(token_budget=1000, min_recent_turns=1, summary_token_budget=250)
+    for i in range(30):
+        history.add_turn(*long_turn(i))
+
+    assert len(history.summary_lines) > 1
+    assert history.summary_tokens <= 250
+    assert "Question 0" not in history.summary  # Oldest lines aged out
+    newest_folded = history.total_turns - len(history.recent_turns) - 1
+    assert history.summary_lines[-1][0].startswith(f"- User: Question {newest_folded}:")
+
+
+def test_short_turns_are_dropped_not_summarized():
+    history = ConversationHistory(token_budget=4, min_recent_turns=1)
+    for i in range(5):
+        history.add_turn(f"hi {i}", "hello")
+
+    assert history.folded_turns == 0
+    assert history.dropped_turns > 0
+    assert history.dropped_turns + len(history.recent_turns) == 5
+    assert history.summary == ""
+    assert history.recent_turns[-1][0] == "hi 4"
+
+
+def test_round_trip_through_json():
+    history = ConversationHistory(token_budget=400, min_recent_turns=2)
+    for i in range(8):
+        history.add_turn(*long_turn(i))
+
+    restored = ConversationHistory.from_dict(json.loads(json.dumps(history.to_dict())))
+
+    assert restored.to_dict() == history.to_dict()
+    assert restored.messages == history.messages
+    assert restored.summary == history.summary
+    assert restored.history_tokens == history.history_tokens
+    # Both keep evolving identically
+    history.add_turn(*long_turn(8))
+    restored.add_turn(*long_turn(8))
+    assert restored.to_dict() == history.to_dict()
+
+
+def test_structured_output_is_recorded_as_json():
+    from models import SafetyAdvice
+
+    advice = SafetyAdvice(
+        destination="Japan", safety_level="Safe", health_precautions=[], security_precautions=[],
+        emergency_contacts=["Police: 110"], travel_advisories=[]
+    )
+    history = ConversationHistory()
+    history.add_turn("Is Japan safe?", advice)
+
+    assert json.loads(history.messages[1]["content"])["destination"] == "Japan"
+    assert history.full_history_tokens == estimate_tokens("Is Japan safe?") + estimate_tokens(advice.model_dump_json())
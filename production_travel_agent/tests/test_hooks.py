@@ -0,0 +1,51 @@
+"""Tests for the composite run hooks (hooks.py)."""
+
+import asyncio
+import logging
+
+from agents.lifecycle import RunHooks
+
+from hooks import CompositeRunHooks
+
+
+class FailingHooks(RunHooks):
+    async def on_agent_start(self, context, agent):
+        raise RuntimeError("monitor down")
+
+
+class SlowHooks(RunHooks):
+    async def on_agent_end(self, context, agent, output):
+        await asyncio.sleep(1)
+
+
+class RecordingHooks(RunHooks):
+    def __init__(self):
+        self.events = []
+
+    async def on_agent_start(self, context, agent):
+        self.events.append("on_agent_start")
+
+
+def test_failing_child_is_logged_with_traceback_and_others_still_run(caplog):
+    recording = RecordingHooks()
+    composite = CompositeRunHooks(FailingHooks(), recording)
+
+    with caplog.at_level(logging.WARNING, logger="openai.agents"):
+        asyncio.run(composite.on_agent_start(None, None))
+
+    assert recording.events == ["on_agent_start"]
+    assert composite.errors[0]["hook"] == "FailingHooks"
+    record = caplog.records[-1]
+    assert record.levelno == logging.ERROR
+    assert "FailingHooks.on_agent_start" in record.getMessage()
+    assert record.exc_info is not None
+
+
+def test_timed_out_child_is_logged_as_warning(caplog):
+    composite = CompositeRunHooks(SlowHooks(), child_timeout=0.01)
+
+    with caplog.at_level(logging.WARNING, logger="openai.agents"):
+        asyncio.run(composite.on_agent_end(None, None, "done"))
+
+    assert composite.errors[0]["error_type"] == "TimeoutError"
+    assert caplog.records[-1].levelno == logging.WARNING
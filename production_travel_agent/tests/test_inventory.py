@@ -0,0 +1,104 @@
+"""Tests for the columnar hotel inventory (inventory.py)."""
+
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from inventory import HotelInventory
+
+
+START = date(2030, 1, 1)
+
+
+def make_inventory(hotels=6, nights=60, max_rooms=3, seed=7):
+    rng = np.random.default_rng(seed)
+    return HotelInventory(
+        names=[f"Harbor Hotel {i}" for i in range(hotels)],
+        cities=["Lisbon"] * hotels,
+        ratings=[4.0] * hotels,
+        amenities=[("WiFi",)] * hotels,
+        rooms=rng.integers(0, max_rooms + 1, size=(hotels, nights)),
+        # Few distinct prices, so many windows tie on total cost
+        prices=rng.choice([9000, 10000, 12000], size=(hotels, nights)),
+        start_date=START,
+    )
+
+
+def day(offset):
+    return START + timedelta(days=offset)
+
+
+def test_concurrent_reservations_never_oversell():
+    inventory = make_inventory(hotels=2, nights=20, max_rooms=0)
+    inventory.rooms[:] = 3
+    reservations, barrier = [], threading.Barrier(16)
+    rng = np.random.default_rng(1)
+    stays = [sorted(rng.choice(21, size=2, replace=False).tolist()) for _ in range(16 * 10)]
+
+    def book(worker):
+        barrier.wait()
+        for check_in, check_out in stays[worker::16]:
+            reservation = inventory.reserve("Harbor Hotel 0", day(check_in), day(check_out))
+            if reservation is not None:
+                reservations.append(reservation)
+
+    threads = [threading.Thread(target=book, args=(worker,)) for worker in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sold = np.zeros(20, dtype=int)
+    for reservation in reservations:
+        sold[reservation.start_night:reservation.end_night] += reservation.rooms
+    assert sold.max() <= 3
+    assert (inventory.rooms[0] == 3 - sold).all()
+    assert (inventory.rooms[1] == 3).all()
+
+
+def test_reservation_fails_without_rooms_on_every_night():
+    inventory = make_inventory(hotels=1, nights=10, max_rooms=0)
+    inventory.rooms[0, :] = 1
+    inventory.rooms[0, 5] = 0
+
+    assert inventory.reserve("Harbor Hotel 0", day(3), day(7)) is None
+    assert (inventory.rooms[0, :5] == 1).all()  # Nothing held by the failed attempt
+    reservation = inventory.reserve("Harbor Hotel 0", day(0), day(5))
+    assert reservation.nights == 5
+    assert inventory.cancel(reservation.reservation_id)
+    assert (inventory.rooms[0, :5] == 1).all()
+
+
+def per_date_scan(inventory, destination, first, last, nights, rooms, top_k):
+    """The cheapest stays found by asking availability() for every check-in date."""
+    stays = []
+    for offset in range(first, last - nights + 1):
+        for hotel in inventory.availability(destination, day(offset), day(offset + nights), rooms=rooms, limit=None):
+            stays.append((hotel["total_cost"], offset, inventory.hotel_id(hotel["name"]), hotel["name"]))
+    stays.sort()
+    return [(name, day(offset).isoformat(), total) for total, offset, _, name in stays[:top_k]]
+
+
+def test_cheapest_windows_match_a_per_date_scan():
+    inventory = make_inventory()
+    for first, last, nights, rooms, top_k in [(0, 60, 3, 1, 5), (10, 30, 7, 1, 20),
+                                              (0, 60, 1, 2, 50), (5, 12, 7, 1, 3), (0, 60, 4, 3, 10)]:
+        windows = inventory.cheapest_windows("Lisbon", day(first), day(last), nights, rooms=rooms, top_k=top_k)
+
+        assert [(w["name"], w["check_in"], w["total_cost"]) for w in windows] == \
+            per_date_scan(inventory, "Lisbon", first, last, nights, rooms, top_k)
+
+
+def test_cheapest_windows_skip_sold_out_nights():
+    inventory = make_inventory(hotels=2, nights=10)
+    inventory.rooms[:] = 1
+    inventory.prices[0] = 5000
+    inventory.prices[1] = 20000
+    inventory.rooms[0, 4] = 0
+
+    windows = inventory.cheapest_windows("Lisbon", day(0), day(10), 3, top_k=10)
+
+    assert {w["check_in"] for w in windows if w["name"] == "Harbor Hotel 0"} == \
+        {day(offset).isoformat() for offset in (0, 1, 5, 6, 7)}
+    assert windows[0]["total_cost"] == 150.0
@@ -0,0 +1,56 @@
+"""Tests for TravelAgentSystem request processing (main.py), run offline."""
+
+import asyncio
+
+import pytest
+from agents import InputGuardrailTripwireTriggered, RunConfig
+
+from guardrails import input_guardrail_agent, sensitive_info_guardrail_agent
+from main import Config, TravelAgentSystem
+from scripted_model import DEFAULT_SCRIPTS, ScriptedModelProvider, respond
+from verdict_cache import bypass_verdict_cache
+
+
+def scripted_system(tmp_path, input_violation=False, **config_overrides):
+    """A TravelAgentSystem on the default scripts, with scripted guardrail agents."""
+    config = Config()
+    config.VERBOSE_OUTPUT = False
+    config.SESSION_DB_PATH = str(tmp_path / "sessions.db")
+    for name, value in config_overrides.items():
+        setattr(config, name, value)
+    provider = ScriptedModelProvider(
+        scripts={
+            **DEFAULT_SCRIPTS,
+            input_guardrail_agent.name: [respond({"is_violation": input_violation, "reasoning": "Scripted"})],
+            sensitive_info_guardrail_agent.name: [respond({"is_violation": False, "reasoning": "Scripted"})],
+        },
+        agents={"input": input_guardrail_agent, "output": sensitive_info_guardrail_agent},
+    )
+    system = TravelAgentSystem(config, run_config=RunConfig(model_provider=provider, tracing_disabled=True))
+    return system, provider
+
+
+def test_guardrail_agents_run_on_the_systems_model_provider(tmp_path):
+    system, provider = scripted_system(tmp_path, ENABLE_GUARDRAILS=True)
+
+    async def run():
+        with bypass_verdict_cache():
+            return await system.process_request("Plan a quiet week in the Azores", system.agents["triage"])
+
+    result = asyncio.run(run())
+
+    assert result.final_output
+    guardrail_results = result.input_guardrail_results + result.output_guardrail_results
+    assert len(guardrail_results) == 2
+    assert not any(r.output.tripwire_triggered for r in guardrail_results)
+
+
+def test_input_guardrail_verdict_from_scripted_agent_blocks_request(tmp_path):
+    system, _ = scripted_system(tmp_path, input_violation=True, ENABLE_GUARDRAILS=True)
+
+    async def run():
+        with bypass_verdict_cache():
+            await system.process_request("Plan a quiet week in the Azores", system.agents["triage"])
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        asyncio.run(run())
@@ -0,0 +1,76 @@
+"""Tests for the compiled multi-phrase matcher (phrase_matcher.py)."""
+
+import random
+
+from phrase_matcher import PhraseMatch, PhraseMatcher
+
+
+def naive_matches(phrase_lists, text):
+    """Every (list, phrase, start) found with str.find, as the matcher should report them."""
+    text = text.lower()
+    found = set()
+    for list_name, phrases in phrase_lists.items():
+        for phrase in phrases:
+            start = text.find(phrase)
+            while start != -1:
+                found.add((list_name, phrase, start))
+                start = text.find(phrase, start + 1)
+    return found
+
+
+def test_prefixes_of_a_longer_phrase_are_reported():
+    matcher = PhraseMatcher({"sensitive": ["card", "card number", "card number:"]})
+
+    matches = matcher.find_all("Your card number: 4111")
+
+    assert [m.phrase for m in matches] == ["card number:", "card number", "card"]
+    assert all(m.start == 5 for m in matches)
+
+
+def test_overlapping_phrases_and_lists_are_all_found():
+    matcher = PhraseMatcher({"a": ["abc", "bcd"], "b": ["bc", "abc"]})
+
+    found = {(m.list_name, m.phrase, m.start) for m in matcher.find_all("xabcdx")}
+
+    assert found == {("a", "abc", 1), ("b", "abc", 1), ("a", "bcd", 2), ("b", "bc", 2)}
+
+
+def test_phrases_at_text_boundaries():
+    matcher = PhraseMatcher({"blocked": ["hack into", "scam"]})
+
+    assert matcher.find_all("hack into") == (PhraseMatch("blocked", "hack into", 0, 9),)
+    assert matcher.first("run a scam", "blocked") == PhraseMatch("blocked", "scam", 6, 10)
+    assert matcher.find_all("hack int") == ()
+    assert matcher.find_all("") == ()
+
+
+def test_matching_is_case_insensitive_and_literal():
+    matcher = PhraseMatcher({"patterns": ["C++", "a.b", "(x)"]})
+
+    assert matcher.matches("I write C++ and (X)") == {"patterns": ["c++", "(x)"]}
+    assert matcher.matches("axb") == {}
+
+
+def test_matches_agree_with_a_naive_scan():
+    rng = random.Random(3)
+    alphabet = "ab c"
+    phrase_lists = {
+        name: ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(8)]
+        for name in ("first", "second")
+    }
+    matcher = PhraseMatcher(phrase_lists)
+
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 30)))
+        found = [(m.list_name, m.phrase, m.start) for m in matcher.find_all(text)]
+        assert len(found) == len(set(found))
+        assert set(found) == naive_matches(matcher.phrase_lists, text)
+
+
+def test_cached_and_uncached_scans_agree():
+    matcher = PhraseMatcher({"blocked": ["buy drugs"]}, cache_size=1)
+    text = "Where can I buy drugs?"
+
+    assert matcher.find_all(text) == matcher.find_all(text, use_cache=False) == matcher.find_all(text)
+    matcher.find_all("another text")
+    assert len(matcher._cache) == 1
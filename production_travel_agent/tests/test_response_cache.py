@@ -0,0 +1,50 @@
+"""Tests for the agent response cache (response_cache.py), run offline."""
+
+import asyncio
+
+from agents import RunConfig, Runner
+
+from models import TravelRecommendation
+from response_cache import ResponseCache
+from scripted_model import ScriptedModelProvider
+from travel_agents import AgentRegistry
+
+
+def run_offline(agent, user_input):
+    run_config = RunConfig(model_provider=ScriptedModelProvider(), tracing_disabled=True)
+    return asyncio.run(Runner.run(agent, user_input, run_config=run_config))
+
+
+def test_runs_that_book_a_hotel_are_not_cached():
+    triage = AgentRegistry()["triage"]
+    cache = ResponseCache()
+    result = run_offline(triage, "Book me a week in Tokyo")
+
+    assert any(getattr(item.raw_item, "name", None) == "book_hotel"
+               for item in result.new_items if item.type == "tool_call_item")
+    assert cache.put(triage, "Book me a week in Tokyo", result, latency=1.0) is False
+    assert cache.get(triage, "Book me a week in Tokyo") is None
+    assert cache.get_stats()["skipped"] == 1
+
+
+def test_runs_without_side_effects_are_cached_as_fresh_models():
+    recommender = AgentRegistry()["recommender"]
+    cache = ResponseCache()
+    result = run_offline(recommender, "Where should I go for food and culture?")
+
+    assert cache.put(recommender, "Where should I go for food and culture?", result, latency=1.0)
+    first = cache.get(recommender, "  where should I go for FOOD and culture?")
+    second = cache.get(recommender, "Where should I go for food and culture?")
+
+    assert isinstance(first.final_output, TravelRecommendation)
+    assert first.final_output == result.final_output
+    assert first.final_output is not second.final_output
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_uncacheable_tools_are_configurable():
+    triage = AgentRegistry()["triage"]
+    cache = ResponseCache(uncacheable_tools=())
+    result = run_offline(triage, "Book me a week in Tokyo")
+
+    assert cache.put(triage, "Book me a week in Tokyo", result, latency=1.0)
@@ -0,0 +1,111 @@
+"""Tests for the multi-session store (session_store.py)."""
+
+import asyncio
+import threading
+
+from history import ConversationHistory
+from session_store import SessionStore
+
+
+def test_get_async_reloads_and_spills_off_the_event_loop(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"), max_in_memory=1)
+    store.get("alice").add_turn("Plan a trip to Lisbon", "Here is a plan.")
+    store.get("bob")  # Spills alice
+
+    io_threads = []
+    load, write_many = store._load, store._write_many
+    store._load = lambda session_id: io_threads.append(threading.get_ident()) or load(session_id)
+    store._write_many = lambda items: io_threads.append(threading.get_ident()) or write_many(items)
+
+    async def reload():
+        loop_thread = threading.get_ident()
+        history = await store.get_async("alice")
+        return loop_thread, history
+
+    loop_thread, history = asyncio.run(reload())
+
+    assert history.messages[0]["content"] == "Plan a trip to Lisbon"
+    assert len(io_threads) == 2  # Reloading alice, spilling bob
+    assert loop_thread not in io_threads
+
+
+def test_get_async_answers_hits_in_memory(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"))
+    history = store.get("alice")
+
+    assert asyncio.run(store.get_async("alice")) is history
+    assert store.stats["hits"] == 1
+    assert not (tmp_path / "sessions.db").exists()
+
+
+def test_concurrent_get_async_never_loses_a_session(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"), max_in_memory=2)
+
+    async def get_all():
+        return await asyncio.gather(*(store.get_async(f"user-{i % 4}") for i in range(40)))
+
+    histories = asyncio.run(get_all())
+
+    assert all(isinstance(history, ConversationHistory) for history in histories)
+    stats = store.get_stats()
+    # Each session was created once; later gets found it in memory or reloaded it
+    assert stats["created"] == 4
+    assert stats["in_memory"] == 2
+    assert stats["on_disk"] == 2
+
+
+def test_guardrail_memory_resets_on_reload(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"), max_in_memory=1)
+    alice = store.get("alice")
+    alice.add_turn("Plan a trip to Lisbon", "Here is a plan.")
+    alice.guardrail_memory["simple_content_filter"] = {"plan a trip to lisbon"}
+    store.get("bob")
+
+    reloaded = store.get("alice")
+
+    assert reloaded is not alice
+    assert reloaded.total_turns == 1
+    assert reloaded.guardrail_memory == {}
+
+
+def test_least_recently_used_sessions_spill_and_reload(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"), max_in_memory=2)
+    store.get("alice").add_turn("Plan a trip to Lisbon", "Here is a plan.")
+    store.get("bob")
+    store.get("alice")  # Touch: bob is now the least recently used
+    store.get("carol")
+
+    stats = store.get_stats()
+    assert stats["in_memory"] == 2 and stats["on_disk"] == 1 and stats["spills"] == 1
+    assert "bob" in store and "alice" in store
+
+    store.get("bob")  # Reload spills alice
+    alice = store.get("alice")
+
+    assert alice.messages == [{"role": "user", "content": "Plan a trip to Lisbon"},
+                              {"role": "assistant", "content": "Here is a plan."}]
+    assert store.stats["reloads"] == 2
+    assert store.stats["created"] == 3
+    assert store.get_stats()["on_disk"] == 1  # Reloaded sessions leave the disk
+
+
+def test_sessions_survive_close_and_reopen(tmp_path):
+    db_path = str(tmp_path / "sessions.db")
+    store = SessionStore(db_path=db_path)
+    store.get("alice").add_turn("Plan a trip to Lisbon", "Here is a plan.")
+    store.close()
+
+    reopened = SessionStore(db_path=db_path)
+    assert reopened.get("alice").total_turns == 1
+    assert reopened.stats["reloads"] == 1
+
+
+def test_delete_forgets_memory_and_disk(tmp_path):
+    store = SessionStore(db_path=str(tmp_path / "sessions.db"), max_in_memory=1)
+    store.get("alice")
+    store.get("bob")  # alice on disk
+    store.delete("alice")
+    store.delete("bob")
+
+    assert "alice" not in store and "bob" not in store
+    assert store.get_stats()["on_disk"] == 0
@@ -0,0 +1,69 @@
+"""Tests for per-run tool memoization (tool_cache.py)."""
+
+import asyncio
+import gc
+from typing import Any, Dict
+
+from agents import Agent, RunConfig, Runner
+
+from scripted_model import ScriptedModelProvider, call_tools, respond
+from tool_cache import _RUN_STATES, get_run_memo, pure_tool
+from tool_execution import fast_function_tool
+
+
+EXECUTIONS = []
+
+
+@fast_function_tool(inline=True)
+@pure_tool
+def lookup_city(city: str) -> Dict[str, Any]:
+    """Look up a city."""
+    EXECUTIONS.append(city)
+    return {"city": city, "population": 500000}
+
+
+MEMO_AGENT = Agent(
+    name="Memo Tester",
+    instructions="You are Memo Tester, an agent used in tests.",
+    tools=[lookup_city],
+)
+
+
+def run_memo_agent():
+    provider = ScriptedModelProvider(scripts={
+        "Memo Tester": [
+            call_tools(("lookup_city", {"city": "Lisbon"}), ("lookup_city", {"city": "Lisbon"})),
+            respond("Lisbon it is."),
+        ]
+    })
+    return asyncio.run(Runner.run(
+        MEMO_AGENT, "Tell me about Lisbon",
+        run_config=RunConfig(model_provider=provider, tracing_disabled=True)
+    ))
+
+
+def test_duplicate_call_is_answered_from_run_memo():
+    EXECUTIONS.clear()
+    result = run_memo_agent()
+
+    assert result.final_output == "Lisbon it is."
+    assert EXECUTIONS == ["Lisbon"]
+    assert len(get_run_memo(result.context_wrapper).duplicates) == 1
+
+
+def test_run_with_memoized_tool_can_be_snapshotted():
+    result = run_memo_agent()
+
+    # The memo holds a lock; it must not live on anything the SDK deep-copies
+    state = result.to_state()
+    assert state.to_json()["current_turn"] >= 1
+
+
+def test_run_state_is_released_with_the_run():
+    result = run_memo_agent()
+    usage_id = id(result.context_wrapper.usage)
+    assert usage_id in _RUN_STATES
+
+    del result
+    gc.collect()
+    assert usage_id not in _RUN_STATES
@@ -0,0 +1,43 @@
+"""Tests for the agent registry (travel_agents.py)."""
+
+from agents.tool import FunctionTool
+
+from guardrails import content_input_guardrail, sensitive_output_guardrail
+from travel_agents import AgentRegistry
+
+
+def test_registry_without_guardrails_attaches_none():
+    registry = AgentRegistry()
+    triage = registry["triage"]
+    assert triage is registry.unguarded("triage")
+    assert not triage.input_guardrails and not triage.output_guardrails
+
+
+def test_guardrails_on_entry_agent_and_handoff_targets_only():
+    registry = AgentRegistry(enable_guardrails=True)
+    triage = registry["triage"]
+
+    assert triage.input_guardrails == [content_input_guardrail]
+    assert triage.output_guardrails == [sensitive_output_guardrail]
+    for target in triage.handoffs:
+        # Input guardrails only run for the starting agent; any handoff target may produce the output
+        assert target.input_guardrails == []
+        assert target.output_guardrails == [sensitive_output_guardrail]
+        for nested in target.handoffs:
+            assert nested.output_guardrails == [sensitive_output_guardrail]
+
+    # The registry's agents are left untouched
+    assert registry.unguarded("travel_genie").output_guardrails == []
+
+
+def test_agents_wrapped_as_tools_run_without_guardrails():
+    registry = AgentRegistry(enable_guardrails=True)
+    comprehensive = registry["comprehensive_agent"]
+    assert comprehensive.input_guardrails == [content_input_guardrail]
+
+    agent_tools = [tool for tool in comprehensive.tools
+                   if isinstance(tool, FunctionTool) and tool.name in ("research_travel_info", "get_safety_advice")]
+    assert len(agent_tools) == 2
+    for key in ("researcher", "safety_expert"):
+        wrapped = registry.unguarded(key)
+        assert not wrapped.input_guardrails and not wrapped.output_guardrails
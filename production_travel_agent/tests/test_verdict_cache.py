@@ -0,0 +1,73 @@
+"""Tests for the guardrail verdict cache (verdict_cache.py)."""
+
+import time
+
+from guardrails import input_guardrail_agent
+from models import GuardrailVerdict
+from verdict_cache import VerdictCache, bypass_verdict_cache, verdict_key
+
+
+KEY = verdict_key(input_guardrail_agent, "plan a quiet week in the azores")
+VERDICT = GuardrailVerdict(is_violation=False, reasoning="Travel planning")
+
+
+def test_hit_returns_a_fresh_model():
+    cache = VerdictCache()
+    cache.put(KEY, VERDICT)
+
+    first = cache.get(KEY, GuardrailVerdict)
+    assert first == VERDICT and first is not VERDICT
+    assert cache.get(KEY, GuardrailVerdict) is not first
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_verdicts_expire_after_ttl():
+    cache = VerdictCache(ttl=0.05)
+    cache.put(KEY, VERDICT)
+    assert cache.get(KEY, GuardrailVerdict) == VERDICT
+
+    time.sleep(0.06)
+
+    assert cache.get(KEY, GuardrailVerdict) is None
+    assert cache.stats["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_bypass_skips_lookups_but_stores_fresh_verdicts():
+    cache = VerdictCache()
+    cache.put(KEY, VERDICT)
+    fresh = GuardrailVerdict(is_violation=True, reasoning="Policy changed")
+
+    with bypass_verdict_cache():
+        assert cache.get(KEY, GuardrailVerdict) is None
+        cache.put(KEY, fresh)
+
+    assert cache.get(KEY, GuardrailVerdict) == fresh
+    assert cache.stats["bypassed"] == 1
+
+
+def test_bypass_is_scoped_to_the_block():
+    cache = VerdictCache()
+    cache.put(KEY, VERDICT)
+
+    with bypass_verdict_cache():
+        with bypass_verdict_cache(False):
+            assert cache.get(KEY, GuardrailVerdict) == VERDICT
+    assert cache.get(KEY, GuardrailVerdict) == VERDICT
+
+
+def test_shared_file_serves_other_workers_until_expiry(tmp_path):
+    db_path = str(tmp_path / "verdicts.db")
+    writer = VerdictCache(ttl=0.2, db_path=db_path)
+    reader = VerdictCache(ttl=0.2, db_path=db_path)
+    writer.put(KEY, VERDICT)
+
+    assert reader.get(KEY, GuardrailVerdict) == VERDICT
+    assert reader.stats["disk_hits"] == 1
+
+    time.sleep(0.25)
+    late_reader = VerdictCache(ttl=0.2, db_path=db_path)
+    assert late_reader.get(KEY, GuardrailVerdict) is None
+    assert reader.get(KEY, GuardrailVerdict) is None
+    for cache in (writer, reader, late_reader):
+        cache.close()
@@ -0,0 +1,391 @@
+"""
+TTL result cache for idempotent function tools.
+This module lets individual tools opt into result caching by declaration. Results are
+keyed by the tool's normalized arguments, expire after a per-tool TTL, and are held in a
+bounded LRU per tool, shared across runs and users in the process.
+
+Usage (beneath @function_tool, so the SDK still sees the original signature):
+
+    @function_tool
+    @cached_tool(ttl=1800)
+    def get_destination_weather(destination: str, month: str = None) -> Dict[str, Any]:
+        ...
+
+Tools declared @pure_tool are also memoized within a run: a repeated call with identical
+arguments in the same run returns the earlier result and is recorded as a duplicate.
+"""
+
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from agents import RunContextWrapper
+from pydantic import BaseModel
+
+
+# Tools with side effects; caching them would skip the side effect on a hit
+SIDE_EFFECTING_TOOLS = frozenset({"book_hotel"})
+
+
+# ============================================================================
+# Argument Normalization
+# ============================================================================
+
+def normalize_argument(value: Any, case_sensitive: bool = False) -> Any:
+    """
+    Normalize a tool argument for use in a cache key: whitespace collapsed in strings
+    (and case folded unless case_sensitive), models converted to data, dict keys sorted.
+    """
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value if case_sensitive else value.casefold()
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return {str(k): normalize_argument(v, case_sensitive) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [normalize_argument(v, case_sensitive) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    return value
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ToolResultCache:
+    """Bounded, thread-safe TTL + LRU cache of one tool's results."""
+
+    def __init__(self, tool_name: str, ttl: float, max_entries: int = 1024):
+        self.tool_name = tool_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple:
+        """Return (True, result) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            result = entry[1]
+        return True, copy.deepcopy(result)
+
+    def put(self, key: Hashable, result: Any):
+        result = copy.deepcopy(result)  # Callers may mutate what they were given
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "ttl": self.ttl}
+
+
+# Tool name -> cache, for every tool declared with @cached_tool
+_TOOL_CACHES: Dict[str, ToolResultCache] = {}
+
+
+def get_tool_cache(tool_name: str) -> Optional[ToolResultCache]:
+    """The result cache of a cached tool (None if the tool is not cached)."""
+    return _TOOL_CACHES.get(tool_name)
+
+
+def get_tool_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss/eviction counters for every cached tool."""
+    return {name: cache.get_stats() for name, cache in _TOOL_CACHES.items()}
+
+
+def clear_tool_caches():
+    """Drop every cached tool result."""
+    for cache in _TOOL_CACHES.values():
+        cache.clear()
+
+
+# ============================================================================
+# Declaration
+# ============================================================================
+
+def _takes_run_context(signature: inspect.Signature) -> bool:
+    """Whether a tool function's first parameter is the run context (as function_tool detects it)."""
+    params = list(signature.parameters.values())
+    if not params:
+        return False
+    annotation = params[0].annotation
+    origin = getattr(annotation, "__origin__", annotation)
+    return isinstance(origin, type) and issubclass(origin, RunContextWrapper)
+
+
+def cached_tool(
+    ttl: float,
+    max_entries: int = 1024,
+    case_sensitive: bool = False,
+    name: Optional[str] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Declare a tool function's results cacheable for ttl seconds.
+
+    Apply beneath @function_tool. Only pure lookups may be cached: side-effecting tools
+    (SIDE_EFFECTING_TOOLS) and tools that read the run context (whose results may be
+    user-specific) are rejected. Exceptions are never cached. Tools sharing a name
+    (e.g. sync and async variants of the same lookup) share one cache.
+    """
+    def decorator(func: Callable) -> Callable:
+        tool_name = name or func.__name__
+        if tool_name in SIDE_EFFECTING_TOOLS:
+            raise ValueError(f"Tool '{tool_name}' has side effects and must not be cached")
+
+        signature = inspect.signature(func)
+        if _takes_run_context(signature):
+            raise ValueError(f"Tool '{tool_name}' reads the run context and must not be cached")
+
+        cache = _TOOL_CACHES.get(tool_name)
+        if cache is None:
+            cache = _TOOL_CACHES[tool_name] = ToolResultCache(tool_name, ttl, max_entries)
+
+        def make_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return json.dumps(
+                normalize_argument(dict(bound.arguments), case_sensitive),
+                sort_keys=True, default=str
+            )
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                hit, result = cache.get(key)
+                if hit:
+                    return result
+                result = await func(*args, **kwargs)
+                cache.put(key, result)
+                return result
+            async_wrapper.tool_cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            hit, result = cache.get(key)
+            if hit:
+                return result
+            result = func(*args, **kwargs)
+            cache.put(key, result)
+            return result
+        wrapper.tool_cache = cache
+        return wrapper
+
+    return decorator
+
+
+# ============================================================================
+# Per-run Memo
+# ============================================================================
+
+class RunMemo:
+    """
+    Results of one run's pure tool calls, keyed by tool name and canonical JSON arguments.
+
+    Entries hold the completed result, or the task computing it, so identical calls made
+    concurrently in the same turn share one execution. Failed calls are not memoized.
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, Any] = {}  # (tool name, arguments) -> result or asyncio.Task
+        self._lock = threading.Lock()
+        self.duplicates: List[Dict[str, Any]] = []
+        self._duplicate_call_ids = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record_duplicate(self, tool_name: str, arguments: str, call_id: Optional[str]):
+        with self._lock:
+            self.duplicates.append({
+                "tool": tool_name,
+                "arguments": arguments,
+                "tool_call_id": call_id,
+                "timestamp": time.time()
+            })
+            if call_id is not None:
+                self._duplicate_call_ids.add(call_id)
+        with _RUN_MEMO_STATS_LOCK:
+            stats = _RUN_MEMO_STATS.setdefault(tool_name, {"duplicates": 0})
+            stats["duplicates"] += 1
+
+    def is_duplicate(self, call_id: Optional[str]) -> bool:
+        """Whether a tool call (by tool_call_id) was answered from the memo."""
+        return call_id in self._duplicate_call_ids
+
+
+# Tool name -> duplicate calls answered from run memos, across all runs
+_RUN_MEMO_STATS: Dict[str, Dict[str, int]] = {}
+_RUN_MEMO_STATS_LOCK = threading.Lock()
+
+
+# Per-run state, by the identity of the run's Usage object (an unhashable dataclass, so no
+# WeakKeyDictionary): id -> (weak reference to the Usage, state). The reference's callback
+# drops the entry when the run's contexts are gone; comparing the referent guards against
+# a reused id. Nothing is stored on the Usage itself, which the SDK deep-copies when it
+# snapshots a run (RunResult.to_state)
+_RUN_STATES: Dict[int, Tuple[weakref.ref, Dict[str, Any]]] = {}
+_RUN_STATES_LOCK = threading.Lock()
+
+
+def _drop_run_state(key: int, ref: weakref.ref):
+    with _RUN_STATES_LOCK:
+        entry = _RUN_STATES.get(key)
+        if entry is not None and entry[0] is ref:
+            del _RUN_STATES[key]
+
+
+def run_state(context: RunContextWrapper) -> Dict[str, Any]:
+    """
+    Per-run state, reachable from any context of the run (RunContextWrapper or ToolContext).
+
+    Keyed by the context's Usage object: the runner creates it with the run's
+    RunContextWrapper and hands the same object to every ToolContext it derives, so the
+    state lives exactly as long as the run's contexts.
+    """
+    usage = context.usage
+    key = id(usage)
+    entry = _RUN_STATES.get(key)
+    if entry is None or entry[0]() is not usage:
+        with _RUN_STATES_LOCK:
+            entry = _RUN_STATES.get(key)
+            if entry is None or entry[0]() is not usage:
+                entry = _RUN_STATES[key] = (weakref.ref(usage, functools.partial(_drop_run_state, key)), {})
+    return entry[1]
+
+
+def get_run_memo(context: RunContextWrapper, create: bool = True) -> Optional[RunMemo]:
+    """The memo of the run a context (RunContextWrapper or ToolContext) belongs to."""
+    state = run_state(context)
+    memo = state.get("tool_memo")
+    if memo is None and create:
+        memo = state.setdefault("tool_memo", RunMemo())
+    return memo
+
+
+def is_duplicate_tool_call(context: RunContextWrapper) -> bool:
+    """Whether the tool call of a ToolContext was answered from its run's memo."""
+    memo = get_run_memo(context, create=False)
+    return memo is not None and memo.is_duplicate(getattr(context, "tool_call_id", None))
+
+
+def get_run_memo_stats() -> Dict[str, Dict[str, int]]:
+    """Duplicate calls answered from run memos, per tool."""
+    with _RUN_MEMO_STATS_LOCK:
+        return {name: dict(stats) for name, stats in _RUN_MEMO_STATS.items()}
+
+
+def pure_tool(func: Callable) -> Callable:
+    """
+    Declare a tool function pure (same arguments, same result) and memoize it per run.
+
+    Apply beneath @function_tool (above @threaded_tool and @cached_tool). The wrapper
+    receives the run context from the SDK (added as a first parameter when the function
+    does not already take one; it never appears in the tool's schema) and keys results by
+    tool name and canonical JSON arguments, with defaults applied. Side-effecting tools
+    (SIDE_EFFECTING_TOOLS) are rejected.
+    """
+    tool_name = func.__name__
+    if tool_name in SIDE_EFFECTING_TOOLS:
+        raise ValueError(f"Tool '{tool_name}' has side effects and must not be memoized")
+
+    signature = inspect.signature(func)
+    takes_context = _takes_run_context(signature)
+    arg_signature = signature
+    if takes_context:
+        arg_signature = signature.replace(parameters=list(signature.parameters.values())[1:])
+
+    def make_key(args, kwargs) -> str:
+        bound = arg_signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return json.dumps(
+            normalize_argument(dict(bound.arguments), case_sensitive=True),
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+
+    def call(context, args, kwargs):
+        return func(context, *args, **kwargs) if takes_context else func(*args, **kwargs)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(context: RunContextWrapper, *args, **kwargs):
+            memo = get_run_memo(context)
+            arguments = make_key(args, kwargs)
+            key = (tool_name, arguments)
+            entry = memo._entries.get(key)
+            if entry is None:
+                entry = memo._entries[key] = asyncio.ensure_future(call(context, args, kwargs))
+            else:
+                memo.record_duplicate(tool_name, arguments, getattr(context, "tool_call_id", None))
+            try:
+                # Shielded, so a caller timing out does not cancel a call another caller awaits
+                result = await asyncio.shield(entry) if isinstance(entry, asyncio.Future) else entry
+            except Exception:
+                if memo._entries.get(key) is entry:
+                    del memo._entries[key]
+                raise
+            if memo._entries.get(key) is entry:
+                memo._entries[key] = result
+            return copy.deepcopy(result)
+        wrapper = async_wrapper
+    else:
+        @functools.wraps(func)
+        def sync_wrapper(context: RunContextWrapper, *args, **kwargs):
+            memo = get_run_memo(context)
+            arguments = make_key(args, kwargs)
+            key = (tool_name, arguments)
+            with memo._lock:
+                hit = key in memo._entries
+                result = memo._entries.get(key)
+            if hit:
+                memo.record_duplicate(tool_name, arguments, getattr(context, "tool_call_id", None))
+            else:
+                result = call(context, args, kwargs)
+                with memo._lock:
+                    memo._entries[key] = result
+            return copy.deepcopy(result)
+        wrapper = sync_wrapper
+
+    # Expose the run context parameter to function_tool, which passes the context to
+    # a first parameter annotated RunContextWrapper and leaves it out of the schema
+    if not takes_context:
+        context_param = inspect.Parameter(
+            "context", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=RunContextWrapper
+        )
+        wrapper.__signature__ = signature.replace(
+            parameters=[context_param, *signature.parameters.values()]
+        )
+        wrapper.__annotations__ = {"context": RunContextWrapper, **func.__annotations__}
+    wrapper.pure = True
+    return wrapper
@@ -0,0 +1,202 @@
+"""
+Tool declaration and execution for the Travel Agent system.
+The SDK already runs all tool calls from one model response concurrently; this module
+decides where the blocking ones run and how cheaply each call is invoked.
+
+- @threaded_tool turns a sync tool into an async one that executes on a process-wide,
+  bounded thread pool, which also lets the tool declare its own timeout (the SDK only
+  times out async tools)
+- @fast_function_tool declares a tool like @function_tool (same schema, timeouts and
+  error handling), but parses and validates the arguments in one pass with a cached
+  TypeAdapter and returns results serialized as compact JSON (orjson if installed)
+
+Usage (@threaded_tool directly beneath the tool decorator, above any @cached_tool;
+pure in-memory tools that return in microseconds are declared inline instead):
+
+    @fast_function_tool(timeout=10)
+    @threaded_tool
+    @cached_tool(ttl=1800)
+    def get_destination_weather(destination: str, month: str = None) -> Dict[str, Any]:
+        ...
+
+    @fast_function_tool(inline=True)
+    def convert_currency(amount: float, from_currency: str, to_currency: str) -> Dict[str, Any]:
+        ...
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Optional
+
+from agents import FunctionTool, RunContextWrapper, _debug, default_tool_error_function
+from agents.function_schema import function_schema
+from agents.logger import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard json module
+    orjson = None
+
+
+DEFAULT_TOOL_WORKERS = 16
+
+
+# ============================================================================
+# Worker Pool
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Get the shared tool worker pool (created with DEFAULT_TOOL_WORKERS on first use)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_TOOL_WORKERS, thread_name_prefix="travel-tool"
+                )
+    return _executor
+
+
+def configure_tool_executor(max_workers: int = DEFAULT_TOOL_WORKERS) -> ThreadPoolExecutor:
+    """
+    Replace the shared tool worker pool (e.g. to size it from Config). Calls already
+    running on the previous pool finish there.
+    """
+    global _executor
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    with _executor_lock:
+        previous = _executor
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="travel-tool")
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return _executor
+
+
+# ============================================================================
+# Decorator
+# ============================================================================
+
+def threaded_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Run a synchronous tool function on the shared worker pool.
+
+    The wrapper is a coroutine function with the original signature, so the SDK schedules
+    it on the event loop alongside the turn's other tool calls and can apply a per-tool
+    timeout. Context variables of the calling task are visible inside the tool.
+
+    A timed-out call returns an error to the model, but its thread runs to completion
+    (threads cannot be cancelled), so tools with side effects should not declare a timeout.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(get_tool_executor(), call)
+
+    return wrapper
+
+
+# ============================================================================
+# Fast-path Tool Declaration
+# ============================================================================
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for values the encoder does not handle natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def serialize_tool_result(result: Any) -> str:
+    """The text sent to the model for a tool result: strings as-is, anything else as compact JSON."""
+    if isinstance(result, str):
+        return result
+    if orjson is not None:
+        return orjson.dumps(result, default=_json_default).decode("utf-8")
+    return json.dumps(result, default=_json_default, separators=(",", ":"), ensure_ascii=False)
+
+
+def fast_function_tool(
+    func: Optional[Callable[..., Any]] = None,
+    *,
+    name_override: Optional[str] = None,
+    timeout: Optional[float] = None,
+    inline: bool = False
+):
+    """
+    Declare a function tool with a lean invocation path.
+
+    The tool's name, description and strict JSON schema are generated exactly as by
+    @function_tool. Per call, the raw JSON arguments are validated straight into the
+    argument model by a TypeAdapter built once at declaration (no intermediate dict,
+    native date fields parsed by pydantic-core), and the result is serialized once to
+    JSON instead of being stringified with str(). Invalid arguments are reported back to
+    the model with the validation errors; exceptions raised by the tool are reported
+    with the SDK's default tool error message and logged to the SDK's logger, as
+    @function_tool does.
+
+    Sync functions run on the shared worker pool, as with @threaded_tool, unless declared
+    inline=True: pure in-memory tools then run directly on the event loop, where they cost
+    less than the hand-off to a worker thread would (and cannot usefully time out).
+    """
+    def decorator(func: Callable[..., Any]) -> FunctionTool:
+        schema = function_schema(func, name_override=name_override)
+        arguments_adapter = TypeAdapter(schema.params_pydantic_model)
+        is_async = inspect.iscoroutinefunction(func)
+        if not is_async and not inline:
+            func, is_async = threaded_tool(func), True
+
+        async def on_invoke_tool(context: RunContextWrapper, input: str) -> str:
+            try:
+                parsed = arguments_adapter.validate_json(input or "{}")
+            except ValidationError as e:
+                problems = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'arguments'}: {error['msg']}"
+                    for error in e.errors(include_url=False, include_input=False)
+                )
+                return f"Invalid arguments for tool {schema.name}: {problems}"
+
+            args, kwargs = schema.to_call_args(parsed)
+            try:
+                if schema.takes_context:
+                    result = func(context, *args, **kwargs)
+                else:
+                    result = func(*args, **kwargs)
+                if is_async:
+                    result = await result
+            except Exception as e:
+                if _debug.DONT_LOG_TOOL_DATA:
+                    logger.debug("Tool %s failed", schema.name)
+                else:
+                    logger.error("Tool %s failed: %s", schema.name, e, exc_info=e)
+                return default_tool_error_function(context, e)
+            return serialize_tool_result(result)
+
+        on_invoke_tool.__wrapped__ = func
+        return FunctionTool(
+            name=schema.name,
+            description=schema.description or "",
+            params_json_schema=schema.params_json_schema,
+            on_invoke_tool=on_invoke_tool,
+            strict_json_schema=True,
+            timeout_seconds=timeout
+        )
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -3,7 +3,13 @@ Agent definitions for the comprehensive Travel Agent system.
 This module demonstrates various agent patterns: standalone agents, chaining, handoffs, and agents as tools.
 """
 
-from agents import Agent, WebSearchTool
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator
+
+from agents import Agent, AgentOutputSchema, WebSearchTool
 from agents.lifecycle import AgentHooks, RunHooks
 
 try:
@@ -17,10 +23,13 @@ try:
     from .tools import (
         estimate_budget,
         get_detailed_budget_breakdown,
+        get_budget_breakdown_in_currency,
         book_hotel,
         check_hotel_availability,
+        find_cheapest_stays,
         get_destination_weather,
         get_local_currency_info,
+        convert_currency,
         get_travel_restrictions,
         suggest_activities
     )
@@ -30,6 +39,7 @@ try:
         ResearchAgentHooks,
         ItineraryAgentHooks
     )
+    from .guardrails import content_input_guardrail, sensitive_output_guardrail
 except ImportError:
     from models import (
         TravelRecommendation,
@@ -41,10 +51,13 @@ except ImportError:
     from tools import (
         estimate_budget,
         get_detailed_budget_breakdown,
+        get_budget_breakdown_in_currency,
         book_hotel,
         check_hotel_availability,
+        find_cheapest_stays,
         get_destination_weather,
         get_local_currency_info,
+        convert_currency,
         get_travel_restrictions,
         suggest_activities
     )
@@ -54,6 +67,27 @@ except ImportError:
         ResearchAgentHooks,
         ItineraryAgentHooks
     )
+    from guardrails import content_input_guardrail, sensitive_output_guardrail
+
+# With a backend configured, booking and lookup tools call it through the async,
+# connection-pooled HTTP tools instead of the in-process mocks
+if os.getenv("TRAVEL_BACKEND_URL"):
+    try:
+        from .backend_tools import (
+            book_hotel,
+            check_hotel_availability,
+            find_cheapest_stays,
+            get_destination_weather,
+            get_travel_restrictions
+        )
+    except ImportError:
+        from backend_tools import (
+            book_hotel,
+            check_hotel_availability,
+            find_cheapest_stays,
+            get_destination_weather,
+            get_travel_restrictions
+        )
 
 
 # ============================================================================
@@ -113,7 +147,7 @@ def create_itinerary_agent(hooks: AgentHooks = None) -> Agent:
             "Use the budget estimation tools to provide accurate cost estimates. "
             "Consider practical factors like travel time, opening hours, and logical activity sequencing."
         ),
-        tools=[estimate_budget, get_detailed_budget_breakdown, suggest_activities],
+        tools=[estimate_budget, get_detailed_budget_breakdown, get_budget_breakdown_in_currency, suggest_activities],
         model="gpt-4o",
         output_type=TravelItinerary,  # Structured output
         hooks=hooks or ItineraryAgentHooks()
@@ -169,13 +203,16 @@ def create_booking_agent(hooks: AgentHooks = None) -> Agent:
         instructions=(
             "You are Booking Specialist, an expert in handling travel bookings. "
             "You can book hotels, check availability, and provide booking confirmations. "
+            "When the traveler's dates are flexible, find the cheapest stays in one search "
+            "instead of checking availability date by date. "
             "Always verify booking details before confirming. "
             "Use secure user information from context when making bookings. "
             "Provide clear booking confirmations with all relevant details."
         ),
-        tools=[book_hotel, check_hotel_availability],
+        tools=[book_hotel, check_hotel_availability, find_cheapest_stays],
         model="gpt-4o",
-        output_type=BookingConfirmation,  # Structured output
+        # Structured output; `details` is a free-form dict, so the schema can't be strict
+        output_type=AgentOutputSchema(BookingConfirmation, strict_json_schema=False),
         hooks=hooks or BookingAgentHooks()
     )
 
@@ -206,7 +243,7 @@ def create_travel_genie_agent(
             "- For general travel questions: Answer directly using your knowledge\n\n"
             "Always provide friendly, helpful service and ensure users get complete answers to their questions."
         ),
-        tools=[estimate_budget, get_destination_weather, get_local_currency_info],
+        tools=[estimate_budget, get_destination_weather, get_local_currency_info, convert_currency],
         handoffs=[recommender, researcher, booking_agent],
         model="gpt-4o",
         hooks=hooks or TravelGenieHooks()
@@ -274,9 +311,11 @@ def create_comprehensive_agent_with_tools(
         tools=[
             estimate_budget,
             get_detailed_budget_breakdown,
+            get_budget_breakdown_in_currency,
             suggest_activities,
             get_destination_weather,
             get_local_currency_info,
+            convert_currency,
             researcher_tool,  # Agent as tool
             safety_tool       # Agent as tool
         ],
@@ -285,39 +324,147 @@ def create_comprehensive_agent_with_tools(
     )
 
 
+# ============================================================================
+# Guardrails
+# ============================================================================
+
+def with_guardrails(agent: Agent, entry: bool = True) -> Agent:
+    """
+    A copy of the agent with the guardrail cascades attached where the runner checks them:
+    the content input guardrail on the entry agent (input guardrails only run for the
+    agent starting a run), the sensitive output guardrail on it and on every agent it can
+    hand off to (whichever produces the final output). Agents wrapped as tools keep no
+    guardrails: their runs are internal to the calling agent's turn.
+    """
+    handoffs = [
+        with_guardrails(target, entry=False) if isinstance(target, Agent) else target
+        for target in agent.handoffs
+    ]
+    return agent.clone(
+        input_guardrails=[*agent.input_guardrails, content_input_guardrail] if entry else agent.input_guardrails,
+        output_guardrails=[*agent.output_guardrails, sensitive_output_guardrail],
+        handoffs=handoffs
+    )
+
+
 # ============================================================================
 # Agent Factory Functions
 # ============================================================================
 
-def create_agent_system(enable_hooks: bool = True) -> dict:
+class AgentRegistry(Mapping):
     """
-    Factory function to create the complete agent system.
-    Returns all agents configured and ready to use.
+    Lazily-built, memoized registry of the agent system.
+
+    Each agent is constructed on first access (together with the agents it hands off
+    to or wraps as tools) and then reused, so callers only pay for the agents they use.
+    Construction time per agent is recorded, excluding time spent building dependencies.
+    With enable_guardrails, each agent is returned ready to start a run, with the
+    guardrail cascades attached to it and its handoff targets (see with_guardrails);
+    dependencies are resolved without guardrails (unguarded()). Behaves like the
+    read-only dict previously returned by create_agent_system.
     """
-    # Create specialized agents
-    recommender = create_travel_recommender_agent()
-    researcher = create_research_agent()
-    itinerary_agent = create_itinerary_agent()
-    packing_agent = create_packing_list_agent()
-    safety_expert = create_safety_expert_agent()
-    booking_agent = create_booking_agent()
     
-    # Create multi-purpose agents
-    travel_genie = create_travel_genie_agent(recommender, researcher, booking_agent)
-    triage = create_triage_agent(travel_genie, safety_expert, itinerary_agent)
+    # Registry key -> builder taking the registry (to resolve dependencies)
+    _BUILDERS: Dict[str, Callable[["AgentRegistry"], Agent]] = {
+        "triage": lambda r: create_triage_agent(
+            r.unguarded("travel_genie"), r.unguarded("safety_expert"), r.unguarded("itinerary_agent")
+        ),
+        "travel_genie": lambda r: create_travel_genie_agent(
+            r.unguarded("recommender"), r.unguarded("researcher"), r.unguarded("booking_agent")
+        ),
+        "recommender": lambda r: create_travel_recommender_agent(),
+        "researcher": lambda r: create_research_agent(),
+        "itinerary_agent": lambda r: create_itinerary_agent(),
+        "packing_agent": lambda r: create_packing_list_agent(),
+        "safety_expert": lambda r: create_safety_expert_agent(),
+        "booking_agent": lambda r: create_booking_agent(),
+        "comprehensive_agent": lambda r: create_comprehensive_agent_with_tools(
+            r.unguarded("researcher"), r.unguarded("safety_expert")
+        ),
+    }
+    
+    def __init__(self, enable_guardrails: bool = False):
+        self.enable_guardrails = enable_guardrails
+        self._agents: Dict[str, Agent] = {}
+        self._guarded_agents: Dict[str, Agent] = {}
+        self._build_times: Dict[str, float] = {}
+        self._dependency_time = [0.0]  # Stack of time spent in nested builds
+        self._lock = threading.RLock()
     
-    # Create comprehensive agent with tools
-    comprehensive_agent = create_comprehensive_agent_with_tools(researcher, safety_expert)
+    def __getitem__(self, key: str) -> Agent:
+        if not self.enable_guardrails:
+            return self.unguarded(key)
+        agent = self._guarded_agents.get(key)
+        if agent is not None:
+            return agent
+        unguarded = self.unguarded(key)
+        with self._lock:
+            if key not in self._guarded_agents:
+                self._guarded_agents[key] = with_guardrails(unguarded)
+            return self._guarded_agents[key]
     
-    return {
-        "triage": triage,
-        "travel_genie": travel_genie,
-        "recommender": recommender,
-        "researcher": researcher,
-        "itinerary_agent": itinerary_agent,
-        "packing_agent": packing_agent,
-        "safety_expert": safety_expert,
-        "booking_agent": booking_agent,
-        "comprehensive_agent": comprehensive_agent
-    }
+    def unguarded(self, key: str) -> Agent:
+        """The agent as built, without guardrails (how agents reference each other)."""
+        agent = self._agents.get(key)
+        if agent is not None:
+            return agent
+        if key not in self._BUILDERS:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._agents:
+                self._agents[key] = self._build(key)
+            return self._agents[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._BUILDERS)
+    
+    def __len__(self) -> int:
+        return len(self._BUILDERS)
+    
+    def _build(self, key: str) -> Agent:
+        self._dependency_time.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            agent = self._BUILDERS[key](self)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            dependency_time = self._dependency_time.pop()
+            self._dependency_time[-1] += elapsed
+        self._build_times[key] = elapsed - dependency_time
+        return agent
+    
+    def is_built(self, key: str) -> bool:
+        """Whether the agent has already been constructed."""
+        return key in self._agents
+    
+    def get_build_times(self) -> Dict[str, float]:
+        """Construction time in seconds for each agent built so far (excluding dependencies)."""
+        return dict(self._build_times)
 
+
+# Shared registries, one with and one without guardrails
+_shared_registries: Dict[bool, AgentRegistry] = {}
+_shared_registry_lock = threading.Lock()
+
+
+def get_agent_registry(enable_guardrails: bool = False) -> AgentRegistry:
+    """Get the process-wide agent registry shared by all TravelAgentSystem instances."""
+    registry = _shared_registries.get(enable_guardrails)
+    if registry is None:
+        with _shared_registry_lock:
+            registry = _shared_registries.get(enable_guardrails)
+            if registry is None:
+                registry = _shared_registries[enable_guardrails] = AgentRegistry(enable_guardrails)
+    return registry
+
+
+def create_agent_system(enable_hooks: bool = True, enable_guardrails: bool = False) -> AgentRegistry:
+    """
+    Factory function for the complete agent system.
+    Returns the shared, lazily-built agent registry; agents are constructed on first access,
+    with the guardrail cascades attached when enable_guardrails is set (see with_guardrails).
+
+    enable_hooks is deprecated and ignored: the registry's agents carry no lifecycle hooks,
+    and run hooks are chosen per run (TravelAgentSystem, Config.ENABLE_HOOKS).
+    """
+    return get_agent_registry(enable_guardrails)
@@ -0,0 +1,202 @@
+"""
+Verdict cache for LLM-backed guardrail agents.
+This module keys guardrail verdicts by a hash of the guardrail agent's fingerprint
+(instructions, model, output type) and the normalized text, with TTL expiry and LRU
+eviction. An optional SQLite file shares verdicts between worker processes on one host.
+
+Lookups can be bypassed for a request (the fresh verdict still replaces the cached one):
+
+    with bypass_verdict_cache():
+        result = await system.process_request(user_input, starting_agent=agent)
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Type
+
+from agents import Agent
+from pydantic import BaseModel
+
+try:
+    from .response_cache import agent_fingerprint
+except ImportError:
+    from response_cache import agent_fingerprint
+
+
+# Set for the duration of a request whose guardrails must not reuse cached verdicts
+_BYPASS: contextvars.ContextVar[bool] = contextvars.ContextVar("guardrail_verdict_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def bypass_verdict_cache(bypass: bool = True):
+    """Skip verdict cache lookups for guardrails run inside this block (task-local)."""
+    token = _BYPASS.set(bypass)
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+def verdict_key(guardrail_agent: Agent, normalized_text: str) -> str:
+    """Cache key: hash of the guardrail agent's fingerprint and the normalized text."""
+    return hashlib.sha256(
+        f"{agent_fingerprint(guardrail_agent)}\0{normalized_text}".encode("utf-8")
+    ).hexdigest()
+
+
+class VerdictCache:
+    """
+    TTL + LRU cache of guardrail verdicts (structured outputs of guardrail agents).
+
+    - Verdicts are held in memory as JSON and re-validated into a fresh model on every
+      hit, so callers never share cached objects
+    - With db_path, verdicts are also written to a SQLite file (WAL mode) that every
+      process on the host can open; a memory miss falls back to the file, and the file
+      is trimmed to max_entries by last use. Expiry there uses wall-clock time
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 10_000, db_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, verdict JSON)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_trim = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0,
+                      "expirations": 0, "evictions": 0, "stores": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the shared verdict file lazily (called with the lock held)."""
+        if self._conn is None and self.db_path is not None:
+            self._conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # A lost verdict is only a cache miss
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, verdict TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str, verdict_type: Type[BaseModel]) -> Optional[BaseModel]:
+        """Return the cached verdict for a key, or None (always None while bypassed)."""
+        if _BYPASS.get():
+            with self._lock:
+                self.stats["bypassed"] += 1
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return verdict_type.model_validate_json(entry[1])
+
+            conn = self._connection()
+            row = None
+            if conn is not None:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT verdict, expires_at FROM verdicts WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            verdict_json, expires_at = row
+            self._remember(key, verdict_json, time.monotonic() + (expires_at - time.time()))
+            self.stats["disk_hits"] += 1
+            return verdict_type.model_validate_json(verdict_json)
+
+    def put(self, key: str, verdict: BaseModel):
+        """Store a verdict (in memory, and in the shared file if configured)."""
+        verdict_json = verdict.model_dump_json()
+        with self._lock:
+            self._remember(key, verdict_json, time.monotonic() + self.ttl)
+            self.stats["stores"] += 1
+            conn = self._connection()
+            if conn is not None:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, verdict, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                    (key, verdict_json, now + self.ttl, now)
+                )
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim(conn, now)
+                conn.commit()
+
+    def _remember(self, key: str, verdict_json: str, expires_at: float):
+        self._entries[key] = (expires_at, verdict_json)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _trim(self, conn: sqlite3.Connection, now: float):
+        """Drop expired verdicts from the file, then the least recently used beyond max_entries."""
+        self._writes_since_trim = 0
+        conn.execute("DELETE FROM verdicts WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM verdicts WHERE key IN ("
+            "SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        """Drop all verdicts (including the shared file's)."""
+        with self._lock:
+            self._entries.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM verdicts")
+                conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+# Process-wide cache used by the LLM guardrail tiers; memory-only until configured
+_verdict_cache = VerdictCache(db_path=os.getenv("GUARDRAIL_VERDICT_DB"))
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Get the process-wide guardrail verdict cache."""
+    return _verdict_cache
+
+
+def configure_verdict_cache(
+    ttl: float = 3600.0,
+    max_entries: int = 10_000,
+    db_path: Optional[str] = None
+) -> VerdictCache:
+    """Replace the process-wide verdict cache (e.g. to share it through a file from Config)."""
+    global _verdict_cache
+    previous = _verdict_cache
+    _verdict_cache = VerdictCache(ttl=ttl, max_entries=max_entries, db_path=db_path)
+    previous.close()
+    return _verdict_cache